@@ -6,6 +6,8 @@ const fsSync = require('fs');
 const { initDatabase, getDatabase, closeDatabase } = require('./database.cjs');
 
 let mainWindow;
+let solverProcess = null; // Processus main.py en cours (arrêt via stdin "stop")
+let pythonWorker = null; // Processus worker.py persistant (modules et fichiers Excel gardés en mémoire)
 const isDev = process.env.NODE_ENV === 'development';
 
 // ✅ Fonctions de chemin
@@ -87,6 +89,12 @@ app.whenReady().then(async () => {
 });
 
 app.on('window-all-closed', () => {
+  // Laisser le solveur s'arrêter proprement (meilleure solution + checkpoint)
+  if (solverProcess) {
+    solverProcess.stdin.write('stop\n');
+  }
+  // Le worker termine le calcul en cours (solution exportée) puis s'arrête
+  stopPythonWorker();
   closeDatabase();
   if (process.platform !== 'darwin') {
     app.quit();
@@ -124,6 +132,111 @@ const getPythonDir = () => {
   } else {
     return path.join(process.resourcesPath, 'python', 'dist');
   }
+};
+
+// ============================================================================
+// WORKER PYTHON PERSISTANT (worker.py, protocole JSON ligne par ligne)
+// ============================================================================
+// Un seul processus Python garde pandas, OR-Tools et les fichiers Excel déjà lus
+// en mémoire entre les appels. Si worker.py / worker.exe est absent, les
+// handlers retombent sur un processus par appel.
+
+const pythonWorkerRequests = new Map(); // id -> { resolve, reject, onLog, onSolution }
+let pythonWorkerNextId = 1;
+let pythonWorkerSolverId = null; // requête run_scheduler en cours (arrêt via "cancel")
+
+const hasPythonWorker = () => {
+  const workerExec = getPythonExecutable('worker');
+  return fsSync.existsSync(workerExec.command) && workerExec.args.every((arg) => fsSync.existsSync(arg));
+};
+
+const handlePythonWorkerMessage = (message) => {
+  if (message.method === 'ready') {
+    console.log('✅ Python worker ready:', message.params);
+    return;
+  }
+  if (message.method === 'log' || message.method === 'solution') {
+    const request = pythonWorkerRequests.get(message.params.id);
+    if (message.method === 'log') {
+      console.log('Python:', message.params.text);
+      if (request && request.onLog) request.onLog(message.params.text);
+    } else if (request && request.onSolution) {
+      request.onSolution(message.params.event);
+    }
+    return;
+  }
+
+  const request = pythonWorkerRequests.get(message.id);
+  if (!request) return;
+  pythonWorkerRequests.delete(message.id);
+  if (message.error) {
+    if (message.error.traceback) console.error('Python worker error:', message.error.traceback);
+    request.reject(new Error(message.error.message));
+  } else {
+    request.resolve(message.result);
+  }
+};
+
+const startPythonWorker = () => {
+  const workerExec = getPythonExecutable('worker');
+  const workerProcess = spawn(workerExec.command, workerExec.args, {
+    cwd: appDirs.pythonWorkspaceDir,
+  });
+
+  let pendingLine = '';
+  workerProcess.stdout.on('data', (data) => {
+    const lines = (pendingLine + data.toString()).split('\n');
+    pendingLine = lines.pop();
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      try {
+        handlePythonWorkerMessage(JSON.parse(line));
+      } catch (e) {
+        console.error('Python worker: invalid message', line);
+      }
+    }
+  });
+
+  workerProcess.stderr.on('data', (data) => {
+    console.error('Python Worker Error:', data.toString());
+  });
+
+  workerProcess.on('close', (code) => {
+    console.log(`Python worker exited with code ${code}`);
+    if (pythonWorker === workerProcess) {
+      pythonWorker = null;
+    }
+    for (const request of pythonWorkerRequests.values()) {
+      request.reject(new Error(`Python worker exited with code ${code}`));
+    }
+    pythonWorkerRequests.clear();
+    pythonWorkerSolverId = null;
+  });
+
+  workerProcess.on('error', (error) => {
+    console.error('Failed to start Python worker:', error.message);
+  });
+
+  return workerProcess;
+};
+
+// Envoie une requête au worker (démarré au premier appel) et attend sa réponse
+const callPythonWorker = (method, params = {}, { onLog, onSolution } = {}) => {
+  if (!pythonWorker) {
+    pythonWorker = startPythonWorker();
+  }
+  const id = pythonWorkerNextId++;
+  return new Promise((resolve, reject) => {
+    pythonWorkerRequests.set(id, { resolve, reject, onLog, onSolution });
+    pythonWorker.stdin.write(JSON.stringify({ id, method, params }) + '\n');
+  });
+};
+
+const stopPythonWorker = () => {
+  if (pythonWorker) {
+    pythonWorker.stdin.write(JSON.stringify({ id: 0, method: 'shutdown' }) + '\n');
+    pythonWorker.stdin.end();
+  }
 };// ============================================================================
 // GESTION DES FICHIERS
 // ============================================================================
@@ -214,20 +327,126 @@ ipcMain.handle('run-python-algorithm', async (event, { teachersFile, wishesFile,
         args.push('--grade-hours');
         args.push(JSON.stringify(gradeHours));
       }
+      // Chaque solution améliorante est écrite sur stdout en une ligne JSON
+      args.push('--stream');
+      // Meilleure solution conservée dans solver_checkpoint.json (reprise avec --resume-from)
+      args.push('--checkpoint');
+      // Si l'instance est infaisable : contraintes en conflit dans infeasibility_core.json
+      args.push('--explain');
+
+      // Rapports écrits par main.py uniquement en cas d'infaisabilité : on retire ceux d'un run précédent
+      const reportFiles = {
+        feasibilityReport: path.join(appDirs.pythonWorkspaceDir, 'feasibility_report.json'),
+        infeasibilityCore: path.join(appDirs.pythonWorkspaceDir, 'infeasibility_core.json'),
+      };
+      await Promise.all(Object.values(reportFiles).map((file) => fs.rm(file, { force: true })));
+
+      // Échec : les rapports présents sont joints à l'erreur (seul le message traverse l'IPC)
+      const rejectWithReports = async (message) => {
+        const reports = {};
+        for (const [key, file] of Object.entries(reportFiles)) {
+          if (fsSync.existsSync(file)) {
+            try {
+              reports[key] = JSON.parse(await fs.readFile(file, 'utf-8'));
+            } catch (e) {
+              console.error(`Invalid report ${file}:`, e);
+            }
+          }
+        }
+        if (Object.keys(reports).length === 0) {
+          reject(new Error(message));
+          return;
+        }
+        const error = new Error(`${message}\nInfeasibility reports: ${JSON.stringify(reports)}`);
+        error.reports = reports;
+        reject(error);
+      };
+
+      const copyOutputFile = async (logs) => {
+        const outputFile = path.join(appDirs.pythonWorkspaceDir, 'schedule_solution.xlsx');
+
+        if (fsSync.existsSync(outputFile)) {
+          const destPath = path.join(app.getPath('userData'), 'schedule_solution.xlsx');
+          await fs.copyFile(outputFile, destPath);
+
+          resolve({
+            success: true,
+            outputFile: destPath,
+            logs
+          });
+        } else {
+          reject(new Error('Output file not generated.'));
+        }
+      };
+
+      if (hasPythonWorker()) {
+        const logLines = [];
+        const requestId = pythonWorkerNextId;
+        pythonWorkerSolverId = requestId;
+        try {
+          const result = await callPythonWorker('run_scheduler', { args: args.slice(pythonExec.args.length) }, {
+            onLog: (text) => {
+              logLines.push(text);
+              if (mainWindow) mainWindow.webContents.send('python-log', text);
+            },
+            onSolution: (solutionEvent) => {
+              if (mainWindow) mainWindow.webContents.send('python-solution', solutionEvent);
+            },
+          });
+          if (result.exit_code === 0) {
+            await copyOutputFile(logLines.join('\n'));
+          } else {
+            await rejectWithReports(`Python script failed (exit code ${result.exit_code}): ${logLines.slice(-5).join('\n')}`);
+          }
+        } catch (error) {
+          reject(new Error(`Python script failed: ${error.message}`));
+        } finally {
+          if (pythonWorkerSolverId === requestId) pythonWorkerSolverId = null;
+        }
+        return;
+      }
 
       const pythonProcess = spawn(pythonExec.command, args, {
         cwd: appDirs.pythonWorkspaceDir,
       });
+      solverProcess = pythonProcess;
 
       let output = '';
       let errorOutput = '';
+      let pendingLine = '';
+
+      // Lignes JSON ({"type": ...}) -> 'python-solution', le reste -> 'python-log'
+      const forwardStdout = (text) => {
+        const logLines = [];
+        for (const line of text.split('\n')) {
+          if (line.startsWith('{"type"')) {
+            try {
+              const event = JSON.parse(line);
+              if (mainWindow) {
+                mainWindow.webContents.send('python-solution', event);
+              }
+              continue;
+            } catch (e) {
+              // Pas du JSON valide : on le traite comme un log
+            }
+          }
+          logLines.push(line);
+        }
+        const logText = logLines.join('\n');
+        console.log('Python:', logText);
+        if (mainWindow && logText.trim()) {
+          mainWindow.webContents.send('python-log', logText);
+        }
+      };
 
       pythonProcess.stdout.on('data', (data) => {
-        const text = data.toString();
-        output += text;
-        console.log('Python:', text);
-        if (mainWindow) {
-          mainWindow.webContents.send('python-log', text);
+        const text = pendingLine + data.toString();
+        output += data.toString();
+        // Garder la dernière ligne incomplète pour le prochain bloc
+        const lastNewline = text.lastIndexOf('\n');
+        pendingLine = text.slice(lastNewline + 1);
+        if (lastNewline >= 0) {
+          forwardStdout(text.slice(0, lastNewline));
         }
       });
 
@@ -242,24 +461,16 @@ ipcMain.handle('run-python-algorithm', async (event, { teachersFile, wishesFile,
 
       pythonProcess.on('close', async (code) => {
         console.log(`Python process exited with code ${code}`);
+        solverProcess = null;
+        if (pendingLine) {
+          forwardStdout(pendingLine);
+          pendingLine = '';
+        }
 
         if (code === 0) {
-          const outputFile = path.join(appDirs.pythonWorkspaceDir, 'schedule_solution.xlsx');
-
-          if (fsSync.existsSync(outputFile)) {
-            const destPath = path.join(app.getPath('userData'), 'schedule_solution.xlsx');
-            await fs.copyFile(outputFile, destPath);
-
-            resolve({
-              success: true,
-              outputFile: destPath,
-              logs: output
-            });
-          } else {
-            reject(new Error('Output file not generated.'));
-          }
+          await copyOutputFile(output);
         } else {
-          reject(new Error(`Python script failed: ${errorOutput}`));
+          await rejectWithReports(`Python script failed: ${errorOutput}`);
         }
       });
 
@@ -272,6 +483,18 @@ ipcMain.handle('run-python-algorithm', async (event, { teachersFile, wishesFile,
     }
   });
 });
+// Arrêt anticipé : le solveur garde la meilleure solution trouvée et l'exporte
+ipcMain.handle('stop-python-algorithm', async () => {
+  if (pythonWorker && pythonWorkerSolverId !== null) {
+    return { success: (await callPythonWorker('cancel')).cancelled };
+  }
+  if (!solverProcess) {
+    return { success: false, error: 'Aucun calcul en cours' };
+  }
+  solverProcess.stdin.write('stop\n');
+  return { success: true };
+});
+
 ipcMain.handle('read-excel-results', async (event, filePath) => {
   try {
     const XLSX = require('xlsx');
@@ -315,7 +538,7 @@ ipcMain.handle('save-results-file', async (event) => {
 // ANALYSE DES SURVEILLANCES
 // ============================================================================
 
-ipcMain.handle('analyze-surveillance-data', async (event, { professorsFile, planningFile, ecart_1_2, ecart_2_3, ecart_3_4 }) => {
+ipcMain.handle('analyze-surveillance-data', async (event, { professorsFile, planningFile, ecart_1_2, ecart_2_3, ecart_3_4, grille }) => {
   return new Promise(async (resolve, reject) => {
     try {
       const pythonExec = getPythonExecutable('analyze_surveillance');
@@ -357,8 +580,25 @@ ipcMain.handle('analyze-surveillance-data', async (event, { professorsFile, plan
         args.push('null');
       }
 
+      // Grille d'écarts optionnelle ("min:max:pas" ou liste de triplets, passée en JSON), évaluée en une passe
+      if (grille) {
+        args.push('--grille', typeof grille === 'string' ? grille : JSON.stringify(grille));
+      }
+
       console.log('🔧 Python command args:', args);
 
+      if (hasPythonWorker()) {
+        callPythonWorker('analyze_surveillance', {
+          enseignants_file: professorsFile,
+          planning_file: planningFile,
+          ecart_1_2: ecart_1_2 ?? null,
+          ecart_2_3: ecart_2_3 ?? null,
+          ecart_3_4: ecart_3_4 ?? null,
+          grille: grille ?? null,
+        }).then(resolve, (error) => reject(new Error(`Python analysis failed: ${error.message}`)));
+        return;
+      }
+
       const pythonProcess = spawn(pythonExec.command, args, {
         cwd: appDirs.pythonWorkspaceDir,
       });
@@ -667,6 +907,12 @@ ipcMain.handle('generate-global-documents', async (event) => {
         }
       }
 
+      if (hasPythonWorker()) {
+        callPythonWorker('generate_global_documents', { excel_file: workspaceExcelPath })
+          .then(resolve, (error) => reject(new Error(`Process failed: ${error.message}`)));
+        return;
+      }
+
       const args = [...pythonExec.args, 'global', workspaceExcelPath];
 
       const pythonProcess = spawn(pythonExec.command, args, {
@@ -771,6 +1017,12 @@ ipcMain.handle('generate-teacher-document', async (event, teacherId) => {
         return;
       }
 
+      if (hasPythonWorker()) {
+        callPythonWorker('generate_teacher_document', { excel_file: workspaceExcelPath, teacher_id: teacherId })
+          .then(resolve, (error) => reject(new Error(`Process failed: ${error.message}`)));
+        return;
+      }
+
       const args = [...pythonExec.args, 'teacher', workspaceExcelPath, teacherId];
 
       const pythonProcess = spawn(pythonExec.command, args, {
@@ -11,6 +11,9 @@ contextBridge.exposeInMainWorld('electronAPI', {
   // Exécution de l'algorithme Python
   runPythonAlgorithm: (files) => ipcRenderer.invoke('run-python-algorithm', files),
 
+  // Arrêt anticipé du solveur (garde la meilleure solution trouvée)
+  stopPythonAlgorithm: () => ipcRenderer.invoke('stop-python-algorithm'),
+
   // Lecture des résultats
   readExcelResults: (filePath) => ipcRenderer.invoke('read-excel-results', filePath),
 
@@ -28,6 +31,11 @@ contextBridge.exposeInMainWorld('electronAPI', {
   onPythonError: (callback) => {
     ipcRenderer.on('python-error', (event, data) => callback(data));
   },
+
+  // Solutions améliorantes du solveur (une par ligne JSON, --stream)
+  onPythonSolution: (callback) => {
+    ipcRenderer.on('python-solution', (event, data) => callback(data));
+  },
   generateGlobalDocuments: () => ipcRenderer.invoke('generate-global-documents'),
   generateTeacherDocument: (teacherId) => ipcRenderer.invoke('generate-teacher-document', teacherId),
   openFile: (filePath) => ipcRenderer.invoke('open-file', filePath),
@@ -1,9 +1,22 @@
-import pandas as pd
 import sys
 import json
-from typing import Dict, Tuple
+import os
+from collections import Counter
+from contextlib import redirect_stdout
+from typing import TYPE_CHECKING, Dict, Tuple
 import math
 
+from input_model import InputCache, load_exams, load_teachers
+from startup import LazyModule, PROFILE_STARTUP_FLAG, profile_startup
+
+if TYPE_CHECKING:  # import réel, vu aussi par l'analyse de PyInstaller
+    import numpy as np
+else:
+    np = LazyModule("numpy")
+
+# Option de la ligne de commande: grille d'écarts "min:max:pas" évaluée en un seul appel
+GRILLE_FLAG = "--grille"
+
 
 class CalculateurSurveillances:
     """
@@ -170,8 +183,112 @@ class CalculateurSurveillances:
 
         return indisponibilites
 
+    def calculer_grille(self, ecarts) -> Dict:
+        """
+        Évalue d'un coup un tableau d'écarts (K lignes ecart_1_2, ecart_2_3, ecart_3_4).
+
+        Mêmes règles que calculer(), vectorisées avec NumPy sur les K
+        configurations: chaque ligne donne exactement les heures et les
+        indisponibilités que calculer() donnerait pour ces écarts. Un écart
+        NaN est calculé automatiquement, comme un écart None.
+
+        Retourne {'grades': colonnes, 'ecarts': (K, 3) écarts utilisés,
+        'heures': (K, G) heures par enseignant, 'indisponibilites': (K, G),
+        'couverture': (K,) surveillances assurées (somme effectif × heures / 1.5),
+        'besoin': surveillances nécessaires}.
+        """
+        ecarts = np.array(ecarts, dtype=float).reshape(-1, 3)
+        besoin = self.nb_salles * self.nb_enseignants_par_salle
+        nb_experts = self.profs_par_grade.get('EX', 0)
+        surveillances_restantes = besoin - nb_experts * (self.SURVEILLANCES_EXPERTS / 1.5)
+
+        effectifs = [sum(self.profs_par_grade.get(grade, 0) for grade in grades)
+                     for grades in self.niveaux.values()]
+        total_enseignants = sum(effectifs)
+        N1, N2, N3, N4 = effectifs
+
+        # Colonnes: EX d'abord, puis les grades présents dans l'ordre des niveaux (comme calculer())
+        grades, colonnes = [], []
+        if 'EX' in self.profs_par_grade:
+            grades.append('EX')
+            colonnes.append(np.full(len(ecarts), self.SURVEILLANCES_EXPERTS))
+
+        if total_enseignants == 0:
+            ecarts = np.zeros_like(ecarts)
+        else:
+            # Écarts automatiques (10% de la moyenne, au moins 1) pour les valeurs manquantes
+            ecart_unitaire = max(1, surveillances_restantes / total_enseignants * 0.10)
+            ecarts = np.where(np.isnan(ecarts), ecart_unitaire, ecarts)
+            ecart_1_2, ecart_2_3, ecart_3_4 = ecarts.T
+
+            total_ecarts = ecart_1_2 * (N2 + N3 + N4) + ecart_2_3 * (N3 + N4) + ecart_3_4 * N4
+            surveillance_base = np.maximum(1, (surveillances_restantes - total_ecarts) / total_enseignants)
+            par_niveau = {
+                1: surveillance_base,
+                2: surveillance_base + ecart_1_2,
+                3: surveillance_base + ecart_1_2 + ecart_2_3,
+                4: surveillance_base + ecart_1_2 + ecart_2_3 + ecart_3_4,
+            }
+            for niveau, grades_niveau in self.niveaux.items():
+                # Heures arrondies au multiple de 1.5 le plus proche
+                heures = np.round(par_niveau[niveau] * 1.5 / 1.5) * 1.5
+                for grade in grades_niveau:
+                    if grade in self.profs_par_grade:
+                        grades.append(grade)
+                        colonnes.append(heures)
+
+        heures = np.column_stack(colonnes) if colonnes else np.zeros((len(ecarts), 0))
+        return {
+            'grades': grades,
+            'ecarts': ecarts,
+            'heures': heures,
+            'indisponibilites': self._calculer_indisponibilites_grille(heures),
+            'couverture': heures @ np.array([self.profs_par_grade[grade] for grade in grades], dtype=float) / 1.5,
+            'besoin': besoin,
+        }
+
+    def _calculer_indisponibilites_grille(self, heures) -> "np.ndarray":
+        """_calculer_indisponibilites() sur chaque ligne d'un tableau (K, G) d'heures."""
+        if heures.shape[1] == 0:
+            return np.zeros(heures.shape, dtype=int)
+
+        min_indispo = max(2, math.floor(self.nb_creneaux_total * 0.10))
+        max_indispo = math.floor(self.nb_creneaux_total * 0.40)
+
+        min_heures = heures.min(axis=1, keepdims=True)
+        max_heures = heures.max(axis=1, keepdims=True)
+        egales = max_heures == min_heures
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = (heures - min_heures) / (max_heures - min_heures)
+        nb_indispo = np.where(egales, (min_indispo + max_indispo) // 2,
+                              np.round(max_indispo - ratio * (max_indispo - min_indispo)))
+
+        indispo_max_possible = self.nb_creneaux_total - np.ceil(heures * 1.5)
+        nb_indispo = np.maximum(min_indispo, np.minimum(nb_indispo, indispo_max_possible))
+        return np.round(nb_indispo).astype(int)
+
+
+def grille_ecarts(minimum: float, maximum: float, pas: float) -> "np.ndarray":
+    """Toutes les combinaisons (ecart_1_2, ecart_2_3, ecart_3_4) de minimum à maximum (inclus) par pas."""
+    valeurs = np.arange(minimum, maximum + pas / 2, pas)
+    return np.stack(np.meshgrid(valeurs, valeurs, valeurs, indexing='ij'), axis=-1).reshape(-1, 3)
+
 
-def analyze_surveillance_data(enseignants_file, planning_file, ecart_1_2=None, ecart_2_3=None, ecart_3_4=None):
+def parse_grille(spec) -> "np.ndarray":
+    """Grille d'écarts: "min:max:pas", liste de triplets, ou cette liste en JSON (ligne de commande)."""
+    if isinstance(spec, str) and spec.lstrip().startswith('['):
+        spec = json.loads(spec)
+    if isinstance(spec, str):
+        minimum, maximum, pas = (float(valeur) for valeur in spec.split(':'))
+        if pas <= 0:
+            raise ValueError(f"Pas de grille invalide: {pas}")
+        return grille_ecarts(minimum, maximum, pas)
+    return np.array([[np.nan if ecart is None else ecart for ecart in triplet] for triplet in spec],
+                    dtype=float).reshape(-1, 3)
+
+
+def analyze_surveillance_data(enseignants_file, planning_file, ecart_1_2=None, ecart_2_3=None, ecart_3_4=None,
+                              grille=None):
     """
     Analyse les données de surveillance à partir des fichiers Excel
     
@@ -181,6 +298,8 @@ def analyze_surveillance_data(enseignants_file, planning_file, ecart_1_2=None, e
         ecart_1_2: Écart personnalisé entre niveau 1 et 2 (optionnel)
         ecart_2_3: Écart personnalisé entre niveau 2 et 3 (optionnel)
         ecart_3_4: Écart personnalisé entre niveau 3 et 4 (optionnel)
+        grille: Écarts à évaluer en plus, "min:max:pas" ou liste de triplets
+            (optionnel, voir parse_grille); résultat dans data['grille']
     
     Returns:
         dict: Résultats de l'analyse
@@ -190,31 +309,27 @@ def analyze_surveillance_data(enseignants_file, planning_file, ecart_1_2=None, e
     grades = ['PR', 'MC', 'V', 'MA', 'AS', 'AC', 'PES', 'PTC', 'EX']
     
     try:
-        # Charger les données des enseignants
-        df_enseignants = pd.read_excel(enseignants_file)
+        # Enseignants et planning lus par le modèle commun (input_model), mis
+        # en cache sur disque : l'ordonnancement qui suit réutilise le même
+        # parsing, avec les mêmes filtres et donc les mêmes effectifs.
+        # stdout est réservé au JSON : les messages du parsing vont sur stderr
+        with redirect_stdout(sys.stderr):
+            input_cache = InputCache()
+            enseignants = load_teachers(enseignants_file, input_cache)
+            planning = load_exams(planning_file, input_cache)
         
-        # Charger les données du planning (repartition_salle)
-        df_planning = pd.read_excel(planning_file)
-        
-        # Filtrer les profs qui ont participé à la surveillance
-        profs_surveillance = df_enseignants[df_enseignants['participe_surveillance'] == True]
+        # Profs qui participent à la surveillance
+        profs_surveillance = enseignants['teachers']
         
         # Compter le nombre de profs par grade
-        comptage_par_grade = profs_surveillance['grade_code_ens'].value_counts()
+        comptage_par_grade = Counter(prof['grade'] for prof in profs_surveillance)
         
-        # Calculer le nombre total de créneaux uniques
-        # Un créneau = combinaison unique de (dateExam, h_debut, h_fin, session)
-        df_planning['creneau'] = (
-            df_planning['dateExam'].astype(str) + '_' + 
-            df_planning['h_debut'].astype(str) + '_' + 
-            df_planning['h_fin'].astype(str) + '_' + 
-            df_planning['session'].astype(str)
-        )
-        nbr_creneau_total = df_planning['creneau'].nunique()
+        # Un créneau = (jour, séance) du planning, comme pour l'ordonnancement
+        nbr_creneau_total = len(planning['time_slots'])
         
-        # IMPORTANT: Calculer le nombre TOTAL de salles (pas seulement les uniques)
-        # C'est le nombre de lignes dans le planning = nombre de salles à surveiller
-        nbr_salle_total = len(df_planning)
+        # IMPORTANT: nombre TOTAL de salles (pas seulement les uniques)
+        # = nombre d'examens du planning (lignes en double ignorées) = salles à surveiller
+        nbr_salle_total = sum(creneau['num_exams'] for creneau in planning['time_slots'])
         
         # Calculer le nombre d'enseignants nécessaires
         # Règle: 2 profs par salle + 1 prof supplémentaire pour chaque 2 salles (pour absences)
@@ -275,13 +390,25 @@ def analyze_surveillance_data(enseignants_file, planning_file, ecart_1_2=None, e
                 }
             },
             'details': {
-                'nbr_enseignants_total': int(len(df_enseignants)),
-                'nbr_sessions_planning': int(len(df_planning)),
+                'nbr_enseignants_total': int(enseignants['total']),
+                'nbr_sessions_planning': int(nbr_salle_total),
                 'total_surveillances_necessaires': int(nb_enseignants_total_necessaire),
                 'formule': f'2 profs/salle × {nbr_salle_total} + {nb_enseignants_supplementaires} supplémentaires = {nb_enseignants_total_necessaire} enseignants'
             }
         }
         
+        if grille is not None:
+            # Surface de compromis: toutes les configurations d'écarts en une passe
+            evaluation = calculateur.calculer_grille(parse_grille(grille))
+            result['data']['grille'] = {
+                'grades': evaluation['grades'],
+                'ecarts': evaluation['ecarts'].round(3).tolist(),
+                'heures': evaluation['heures'].tolist(),
+                'indisponibilites': evaluation['indisponibilites'].tolist(),
+                'couverture': evaluation['couverture'].round(2).tolist(),
+                'besoin': round(float(evaluation['besoin']), 2),
+            }
+        
         return result
         
     except FileNotFoundError as e:
@@ -305,7 +432,26 @@ def main():
     """
     Point d'entrée principal du script
     Usage: python analyze_surveillance.py <enseignants_file> <planning_file> [ecart_1_2] [ecart_2_3] [ecart_3_4]
+    Options: --profile-startup (coût des imports, affiché sur stderr)
+             --grille min:max:pas (toutes les combinaisons d'écarts, dans data.grille)
+                      ou --grille '[[e12, e23, e34], ...]' (triplets en JSON, null = auto)
     """
+    if PROFILE_STARTUP_FLAG in sys.argv:
+        argv = [arg for arg in sys.argv[1:] if arg != PROFILE_STARTUP_FLAG]
+        exit_code = profile_startup(os.path.abspath(__file__), argv, ("pandas", "openpyxl"))
+        if exit_code is not None:
+            sys.exit(exit_code)
+        sys.argv = [sys.argv[0]] + argv
+    
+    grille = None
+    if GRILLE_FLAG in sys.argv:
+        position = sys.argv.index(GRILLE_FLAG)
+        grille = sys.argv[position + 1] if position + 1 < len(sys.argv) else None
+        if grille is None:
+            print(json.dumps({'success': False, 'error': f'{GRILLE_FLAG} attend min:max:pas ou une liste JSON de triplets'}))
+            sys.exit(1)
+        sys.argv = sys.argv[:position] + sys.argv[position + 2:]
+    
     print(f"DEBUG: sys.argv = {sys.argv}", file=sys.stderr)
     
     if len(sys.argv) < 3:
@@ -330,7 +476,8 @@ def main():
     
     print(f"DEBUG: Parsed ecarts - ecart_1_2: {ecart_1_2}, ecart_2_3: {ecart_2_3}, ecart_3_4: {ecart_3_4}", file=sys.stderr)
     
-    result = analyze_surveillance_data(enseignants_file, planning_file, ecart_1_2, ecart_2_3, ecart_3_4)
+    result = analyze_surveillance_data(enseignants_file, planning_file, ecart_1_2, ecart_2_3, ecart_3_4,
+                                       grille=grille)
     
     # Afficher le résultat en JSON
     print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -0,0 +1,80 @@
+"""
+Benchmark: monolithic vs decomposed solve
+=========================================
+
+Solves the bundled instance (Enseignants_participants.xlsx,
+Souhaits_avec_ids.xlsx, Répartition_SE_dedup.xlsx) with the monolithic
+SlotBasedScheduler and with DecomposedScheduler (split by day and by week)
+under the same time limits, and compares wall time and the objective
+recomputed from the assignments (evaluate_penalties), term by term.
+
+Usage: python bench_decomposition.py [--time-limits 10 30] [--processes 4]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from main import (DataImporter, SlotBasedScheduler, DecomposedScheduler, SolverProfile,
+                  DEFAULT_GRADE_HOURS, DECOMPOSITION_SPLITS)
+
+TEACHERS_FILE = "Enseignants_participants.xlsx"
+UNAVAILABILITY_FILE = "Souhaits_avec_ids.xlsx"
+EXAMS_FILE = "Répartition_SE_dedup.xlsx"
+
+
+def load_instance():
+    """Load the bundled instance without the importer banners."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        teachers = DataImporter.import_teachers(TEACHERS_FILE, DEFAULT_GRADE_HOURS)
+        time_slots = DataImporter.import_exams_as_slots(EXAMS_FILE)
+        DataImporter.import_unavailability(UNAVAILABILITY_FILE, teachers, TEACHERS_FILE)
+    return teachers, time_slots
+
+
+def run(teachers, time_slots, mode, time_limit, processes):
+    """Solve with one mode ('monolithic', 'day' or 'week'), return a result row."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "monolithic":
+            scheduler = SlotBasedScheduler(teachers, time_slots)
+        else:
+            scheduler = DecomposedScheduler(teachers, time_slots, split=mode, max_workers=processes)
+        start = time.perf_counter()
+        solved = scheduler.solve(profile=SolverProfile(time_limit=time_limit))
+        wall_time = time.perf_counter() - start
+
+    return {
+        'mode': mode,
+        'time_limit': time_limit,
+        'wall_time': wall_time,
+        'status': scheduler.status_name,
+        'penalties': scheduler.evaluate_penalties() if solved else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark monolithic vs decomposed solve')
+    parser.add_argument('--time-limits', type=int, nargs='+', default=[10, 30],
+                        help='Solver time limits to test (seconds)')
+    parser.add_argument('--processes', type=int, help='Processes for the decomposed solve (default: all cores)')
+    args = parser.parse_args()
+
+    teachers, time_slots = load_instance()
+    print(f"Instance: {len(teachers)} teachers, {len(time_slots)} time slots, "
+          f"{len(set(ts.day for ts in time_slots))} days")
+
+    terms = ['responsible', 'buffer', 'time_gaps', 'day_gaps', 'total']
+    print(f"\n{'Mode':<12}{'Limit':>7}{'Wall (s)':>10}{'Status':>12}"
+          + "".join(f"{term:>13}" for term in terms))
+    print("-" * (41 + 13 * len(terms)))
+    for time_limit in args.time_limits:
+        for mode in ("monolithic",) + DECOMPOSITION_SPLITS:
+            row = run(teachers, time_slots, mode, time_limit, args.processes)
+            penalties = row['penalties'] or {}
+            print(f"{row['mode']:<12}{row['time_limit']:>7}{row['wall_time']:>10.2f}{row['status']:>12}"
+                  + "".join(f"{penalties.get(term, '-'):>13}" for term in terms))
+
+
+if __name__ == "__main__":
+    main()
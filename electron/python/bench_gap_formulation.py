@@ -0,0 +1,84 @@
+"""
+Benchmark: reified vs linear gap penalty formulation
+====================================================
+
+Solves the bundled instance (Enseignants_participants.xlsx,
+Souhaits_avec_ids.xlsx, Répartition_SE_dedup.xlsx) with both gap
+formulations of SlotBasedScheduler for several time limits and compares the
+objective value reached (recomputed from the assignments, so both
+formulations are scored the same way) against wall time.
+
+Usage: python bench_gap_formulation.py [--time-limits 5 10 30] [--sparse]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from main import DataImporter, SlotBasedScheduler, DEFAULT_GRADE_HOURS, GAP_FORMULATIONS
+
+TEACHERS_FILE = "Enseignants_participants.xlsx"
+UNAVAILABILITY_FILE = "Souhaits_avec_ids.xlsx"
+EXAMS_FILE = "Répartition_SE_dedup.xlsx"
+
+
+def load_instance():
+    """Load the bundled instance without the importer banners."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        teachers = DataImporter.import_teachers(TEACHERS_FILE, DEFAULT_GRADE_HOURS)
+        time_slots = DataImporter.import_exams_as_slots(EXAMS_FILE)
+        DataImporter.import_unavailability(UNAVAILABILITY_FILE, teachers, TEACHERS_FILE)
+    return teachers, time_slots
+
+
+def run(teachers, time_slots, gap_formulation, time_limit, sparse):
+    """Build and solve one configuration, return a result row."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduler = SlotBasedScheduler(teachers, time_slots, sparse=sparse,
+                                       gap_formulation=gap_formulation)
+        start = time.perf_counter()
+        scheduler.build_model()
+        build_time = time.perf_counter() - start
+        stats = scheduler.get_model_stats(measure_presolve=False)
+
+        start = time.perf_counter()
+        solved = scheduler.solve(time_limit=time_limit)
+        solve_time = time.perf_counter() - start
+
+    objective = scheduler.evaluate_penalties()['total'] if solved else None
+    return {
+        'formulation': gap_formulation,
+        'time_limit': time_limit,
+        'variables': stats['variables'],
+        'constraints': stats['constraints'],
+        'build_time': build_time,
+        'solve_time': solve_time,
+        'objective': objective,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark gap penalty formulations')
+    parser.add_argument('--time-limits', type=int, nargs='+', default=[5, 10, 30],
+                        help='Solver time limits to test (seconds)')
+    parser.add_argument('--sparse', action='store_true', help='Use the sparse model')
+    args = parser.parse_args()
+
+    teachers, time_slots = load_instance()
+    print(f"Instance: {len(teachers)} teachers, {len(time_slots)} time slots")
+
+    print(f"\n{'Formulation':<12}{'Limit':>7}{'Vars':>8}{'Cons':>8}"
+          f"{'Build (s)':>11}{'Solve (s)':>11}{'Objective':>11}")
+    print("-" * 68)
+    for time_limit in args.time_limits:
+        for gap_formulation in GAP_FORMULATIONS:
+            row = run(teachers, time_slots, gap_formulation, time_limit, args.sparse)
+            objective = row['objective'] if row['objective'] is not None else "-"
+            print(f"{row['formulation']:<12}{row['time_limit']:>7}{row['variables']:>8}"
+                  f"{row['constraints']:>8}{row['build_time']:>11.2f}{row['solve_time']:>11.2f}"
+                  f"{objective:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: greedy engine vs CP-SAT
+==================================
+
+Solves the bundled instance (Enseignants_participants.xlsx,
+Souhaits_avec_ids.xlsx, Répartition_SE_dedup.xlsx) with GreedyScheduler for
+several local search budgets, with CP-SAT (SlotBasedScheduler) for several
+time limits, and with CP-SAT seeded by the greedy schedule. Quality is the
+objective recomputed from the assignments (evaluate_penalties), term by term.
+
+Usage: python bench_greedy.py [--greedy-limits 0.2 1 3] [--cpsat-limits 10 30]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from main import (DataImporter, SlotBasedScheduler, GreedyScheduler, SolverProfile,
+                  DEFAULT_GRADE_HOURS)
+
+TEACHERS_FILE = "Enseignants_participants.xlsx"
+UNAVAILABILITY_FILE = "Souhaits_avec_ids.xlsx"
+EXAMS_FILE = "Répartition_SE_dedup.xlsx"
+
+TERMS = ['hours_deviation', 'responsible', 'buffer', 'time_gaps', 'day_gaps', 'total']
+
+
+def load_instance():
+    """Load the bundled instance without the importer banners."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        teachers = DataImporter.import_teachers(TEACHERS_FILE, DEFAULT_GRADE_HOURS)
+        time_slots = DataImporter.import_exams_as_slots(EXAMS_FILE)
+        DataImporter.import_unavailability(UNAVAILABILITY_FILE, teachers, TEACHERS_FILE)
+    return teachers, time_slots
+
+
+def run(teachers, time_slots, engine, time_limit, greedy_limit=None):
+    """Solve with 'greedy', 'cpsat' or 'cpsat+greedy' (seeded), return a result row."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if engine == "greedy":
+            scheduler = GreedyScheduler(teachers, time_slots)
+            solved = scheduler.solve(time_limit=time_limit)
+        else:
+            scheduler = SlotBasedScheduler(teachers, time_slots)
+            if engine == "cpsat+greedy":
+                greedy = GreedyScheduler(teachers, time_slots)
+                greedy.solve(time_limit=greedy_limit)
+                scheduler.set_solution_hint(greedy.get_assignment_set(), repair=bool(greedy.violations))
+            solved = scheduler.solve(profile=SolverProfile(time_limit=time_limit))
+        wall_time = time.perf_counter() - start
+
+    return {
+        'engine': engine,
+        'time_limit': time_limit,
+        'wall_time': wall_time,
+        'status': scheduler.status_name,
+        'penalties': scheduler.evaluate_penalties() if solved else None,
+    }
+
+
+def print_row(row):
+    penalties = row['penalties'] or {}
+    print(f"{row['engine']:<14}{row['time_limit']:>7}{row['wall_time']:>10.2f}{row['status']:>15}"
+          + "".join(f"{penalties.get(term, '-'):>17}" for term in TERMS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the greedy engine against CP-SAT')
+    parser.add_argument('--greedy-limits', type=float, nargs='+', default=[0.2, 1, 3],
+                        help='Local search budgets to test (seconds)')
+    parser.add_argument('--cpsat-limits', type=float, nargs='+', default=[10, 30],
+                        help='CP-SAT time limits to test (seconds)')
+    args = parser.parse_args()
+
+    teachers, time_slots = load_instance()
+    print(f"Instance: {len(teachers)} teachers, {len(time_slots)} time slots")
+
+    print(f"\n{'Engine':<14}{'Limit':>7}{'Wall (s)':>10}{'Status':>15}"
+          + "".join(f"{term:>17}" for term in TERMS))
+    print("-" * (46 + 17 * len(TERMS)))
+    for time_limit in args.greedy_limits:
+        print_row(run(teachers, time_slots, "greedy", time_limit))
+    for time_limit in args.cpsat_limits:
+        print_row(run(teachers, time_slots, "cpsat", time_limit))
+        print_row(run(teachers, time_slots, "cpsat+greedy", time_limit, greedy_limit=1.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""
+Benchmark: vectorized vs row-by-row DataImporter
+================================================
+
+Builds a synthetic workbook set SCALE times the size of the bundled instance
+(Enseignants_participants.xlsx, Souhaits_avec_ids.xlsx,
+Répartition_SE_dedup.xlsx): teachers are copied with new codes and names,
+their wishes follow them, exams are copied onto later weeks. Both the
+vectorized importers of DataImporter (and generate_docs.load_enseignants_mapping)
+and the previous row-by-row versions (iterrows, kept below as a reference)
+run on the 1x and SCALEx inputs; the teacher and wish workbooks are parsed
+once beforehand (DataImporter.read_excel cache) so only the import logic is
+timed. import_exams_as_slots streams its workbook (xlsx_stream, see
+bench_repartition.py): on both sides the exams time includes reading the
+repartition. Outputs (objects and printed log) are checked to be identical.
+
+Usage: python bench_importer.py [--scale 10] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict
+from typing import Dict, List, Set, Tuple
+
+import pandas as pd
+
+import generate_docs
+from main import DataImporter, Teacher, TimeSlotInfo, TIME_SLOTS, DEFAULT_GRADE_HOURS
+
+TEACHERS_FILE = "Enseignants_participants.xlsx"
+UNAVAILABILITY_FILE = "Souhaits_avec_ids.xlsx"
+EXAMS_FILE = "Répartition_SE_dedup.xlsx"
+
+
+class RowwiseImporter:
+    """The iterrows() importers as they were before vectorization (reference)."""
+    
+    @staticmethod
+    def import_teachers(filepath: str, grade_hours: Dict[str, float]) -> List[Teacher]:
+        """Import teachers from Enseignants avec code ensiegant responsable.xlsx"""
+        df = DataImporter.read_excel(filepath)
+        
+        # Only keep teachers who participate in surveillance
+        df = df[df['participe_surveillance'].astype(str).str.strip().str.upper() == 'TRUE']
+        
+        # Find maximum existing ID to generate new ones for missing IDs
+        max_id = 0
+        for idx, row in df.iterrows():
+            try:
+                if pd.notna(row['code_smartex_ens']) and row['code_smartex_ens'] != '':
+                    current_id = int(row['code_smartex_ens'])
+                    max_id = max(max_id, current_id)
+            except (ValueError, TypeError):
+                continue
+        
+        print(f"  - Maximum existing teacher ID: {max_id}")
+        
+        # Track generated IDs
+        next_id = max_id + 1
+        generated_ids = 0
+        
+        teachers = []
+        for idx, row in df.iterrows():
+            try:
+                grade = str(row['grade_code_ens']).strip().upper()
+                
+                # Handle missing or empty code_smartex_ens
+                if pd.isna(row['code_smartex_ens']) or row['code_smartex_ens'] == '':
+                    teacher_id = str(next_id).zfill(3)
+                    next_id += 1
+                    generated_ids += 1
+                else:
+                    teacher_id = str(int(row['code_smartex_ens'])).zfill(3)
+                
+                # Get required hours for this grade
+                required_hours = grade_hours.get(grade, 9.0)
+                
+                teacher = Teacher(
+                    id=teacher_id,
+                    grade=grade,
+                    required_hours=required_hours,
+                    first_name=str(row['prenom_ens']).strip(),
+                    last_name=str(row['nom_ens']).strip(),
+                    email=str(row['email_ens']).strip()
+                )
+                teachers.append(teacher)
+            except (ValueError, TypeError) as e:
+                continue
+        
+        print(f"✓ Imported {len(teachers)} teachers from {filepath}")
+        if generated_ids > 0:
+            print(f"  - Generated {generated_ids} new IDs for teachers with missing codes (starting from {max_id + 1})")
+        
+        grade_counts = defaultdict(int)
+        for t in teachers:
+            grade_counts[t.grade] += 1
+        
+        print("\nTeacher distribution by grade:")
+        for grade in sorted(grade_counts.keys()):
+            target_hours = grade_hours.get(grade, 9.0)
+            print(f"  - {grade}: {grade_counts[grade]} teachers ({target_hours}h target each)")
+        
+        return teachers
+    
+    @staticmethod
+    def import_unavailability(filepath: str, teachers: List[Teacher], 
+                            teacher_details_filepath: str) -> Dict[str, Set[Tuple[int, int]]]:
+        """Import teacher unavailability from Souhaits Enseignants.xlsx by matching names
+        
+        Fills Teacher.unavailable_slots in place and returns the unavailable
+        (day, slot) pairs per teacher id (what InputCache stores).
+        
+        Expected format:
+        - Column 'Enseignant': Teacher name (e.g., "N.BEN HARIZ")
+        - Column 'Jour': Day name (Lundi, Mardi, Mercredi, Jeudi, Vendredi, Samedi, Dimanche)
+        - Column 'Séances': Comma-separated sessions (e.g., "S1,S2,S3,S4")
+        """
+        df = DataImporter.read_excel(filepath)
+        
+        # Load teacher details to create name-to-id mapping
+        teacher_details_df = DataImporter.read_excel(teacher_details_filepath)
+        teacher_details_df = teacher_details_df.dropna(subset=['code_smartex_ens'])
+        teacher_details_df = teacher_details_df[teacher_details_df['code_smartex_ens'] != '']
+        
+        # Create name-to-id mapping (case-insensitive, handle various formats)
+        name_to_id = {}
+        for idx, row in teacher_details_df.iterrows():
+            try:
+                teacher_id = str(int(row['code_smartex_ens'])).zfill(3)
+                first_name = str(row['prenom_ens']).strip().lower()
+                last_name = str(row['nom_ens']).strip().lower()
+                
+                # Store multiple formats
+                full_name = f"{first_name} {last_name}"
+                name_to_id[full_name] = teacher_id
+                
+                # Also store with first initial
+                if first_name:
+                    initial_format = f"{first_name[0]}.{last_name}"
+                    name_to_id[initial_format] = teacher_id
+            except (ValueError, TypeError):
+                continue
+        
+        # Day name to number mapping (French)
+        day_mapping = {
+            'lundi': 1,
+            'mardi': 2,
+            'mercredi': 3,
+            'jeudi': 4,
+            'vendredi': 5,
+            'samedi': 6,
+            'dimanche': 7
+        }
+        
+        teacher_dict = {t.id: t for t in teachers}
+        constraints_added = 0
+        unmatched_teachers = set()
+        
+        for idx, row in df.iterrows():
+            try:
+                # Get teacher name (can be in format "N.BEN HARIZ" or "First Last")
+                teacher_name = str(row['Enseignant']).strip().lower()
+                
+                # Get day name and convert to number
+                day_name = str(row['Jour']).strip().lower()
+                if day_name not in day_mapping:
+                    print(f"Warning: Unknown day name '{day_name}', skipping")
+                    continue
+                day = day_mapping[day_name]
+                
+                # Get sessions (can be "S1,S2,S3,S4" or "S1,S2" etc.)
+                seances_str = str(row['Séances']).strip()
+                seances = [s.strip().upper() for s in seances_str.split(',')]
+                
+                # Find teacher ID by name
+                teacher_id = name_to_id.get(teacher_name)
+                
+                if teacher_id is None:
+                    unmatched_teachers.add(teacher_name)
+                    continue
+                
+                if teacher_id not in teacher_dict:
+                    continue
+                
+                teacher = teacher_dict[teacher_id]
+                
+                # Add unavailability for each session
+                for seance in seances:
+                    slot = DataImporter.parse_seance_to_slot(seance)
+                    teacher.unavailable_slots.add((day, slot))
+                    constraints_added += 1
+                    
+            except (ValueError, TypeError, KeyError) as e:
+                print(f"Warning: Error processing row {idx}: {e}")
+                continue
+        
+        num_constrained = sum(1 for t in teachers if t.unavailable_slots or t.unavailable_days)
+        
+        print(f"✓ Imported {constraints_added} unavailability constraints from {filepath}")
+        print(f"  - Teachers with constraints: {num_constrained}/{len(teachers)}")
+        if unmatched_teachers:
+            print(f"  - Unmatched teachers: {len(unmatched_teachers)} (not in participating teachers list)")
+            print(f"    Examples: {', '.join(list(unmatched_teachers)[:5])}")
+        
+        return {t.id: set(t.unavailable_slots) for t in teachers if t.unavailable_slots}
+    
+    @staticmethod
+    def import_exams_as_slots(filepath: str) -> List[TimeSlotInfo]:
+        """Import exams and group them by time slots."""
+        df = pd.read_excel(filepath)
+        
+        # Remove duplicate rows
+        df = df.drop_duplicates()
+        
+        # Convert dates and assign day numbers
+        df['dateExam'] = pd.to_datetime(df['dateExam'], format='%d/%m/%Y')
+        unique_dates = sorted(df['dateExam'].unique())
+        date_to_day = {date: idx + 1 for idx, date in enumerate(unique_dates)}
+        
+        # Group exams by time slot
+        slot_data = defaultdict(lambda: {
+            'exam_ids': [],
+            'responsible_teachers': set(),
+            'exam_rooms': [],
+            'exam_responsibles': [],
+            'date': None
+        })
+        
+        for idx, row in df.iterrows():
+            try:
+                date_str = row['dateExam'].strftime('%Y-%m-%d')
+                slot = DataImporter.parse_time_slot(row['h_debut'])
+                day_number = date_to_day[row['dateExam']]
+                teacher_id = str(int(row['enseignant'])).zfill(3)
+                exam_id = f"E{idx+1:03d}"
+                
+                key = (day_number, slot)
+                slot_data[key]['exam_ids'].append(exam_id)
+                slot_data[key]['responsible_teachers'].add(teacher_id)
+                slot_data[key]['exam_rooms'].append(str(row['cod_salle']).strip() or exam_id)
+                slot_data[key]['exam_responsibles'].append(teacher_id)
+                slot_data[key]['date'] = date_str
+            except (ValueError, TypeError, KeyError) as e:
+                continue
+        
+        # Create TimeSlotInfo objects
+        time_slots = []
+        for (day, slot), data in sorted(slot_data.items()):
+            time_slot_info = TimeSlotInfo(
+                day=day,
+                slot=slot,
+                date=data['date'],
+                num_exams=len(data['exam_ids']),
+                exam_ids=data['exam_ids'],
+                responsible_teachers=data['responsible_teachers'],
+                exam_rooms=data['exam_rooms'],
+                exam_responsibles=data['exam_responsibles']
+            )
+            time_slots.append(time_slot_info)
+        
+        print(f"✓ Imported and grouped exams into {len(time_slots)} time slots")
+        print(f"  - Total exams: {sum(ts.num_exams for ts in time_slots)}")
+        print(f"  - Days: {len(unique_dates)} ({unique_dates[0].strftime('%d/%m/%Y')} to {unique_dates[-1].strftime('%d/%m/%Y')})")
+        
+        print("\n  Time slot requirements:")
+        for ts in time_slots:
+            slot_info = TIME_SLOTS[ts.slot]
+            print(f"    Day {ts.day}, {slot_info['name']}: {ts.num_exams} exams → "
+                  f"{ts.get_min_teachers()} min + {ts.get_buffer()} buffer = "
+                  f"{ts.get_target_teachers()} teachers needed")
+        
+        return time_slots
+
+
+def rowwise_enseignants_mapping(excel_dir):
+    """generate_docs.load_enseignants_mapping before vectorization (reference)."""
+    df = pd.read_excel(os.path.join(excel_dir, TEACHERS_FILE))
+    enseignants_dict = {}
+
+    for _, row in df.iterrows():
+        try:
+            id_prof = int(row["code_smartex_ens"])
+            nom = str(row["nom_ens"]).strip().title()
+            prenom = str(row["prenom_ens"]).strip().title()
+            grade = str(row["grade_code_ens"]).strip().upper()
+            enseignants_dict[id_prof] = f"{nom} {prenom} ({grade})"
+        except Exception:
+            continue
+
+    return enseignants_dict
+
+
+def make_scaled_inputs(directory, scale):
+    """Write the bundled workbooks scaled by `scale` into directory."""
+    teachers = pd.read_excel(TEACHERS_FILE)
+    wishes = pd.read_excel(UNAVAILABILITY_FILE)
+    exams = pd.read_excel(EXAMS_FILE)
+
+    codes = pd.to_numeric(teachers['code_smartex_ens'], errors='coerce')
+    code_step = int(codes.max()) + 1
+    teacher_copies, wish_copies, exam_copies = [], [], []
+    exam_dates = pd.to_datetime(exams['dateExam'], format='%d/%m/%Y')
+    for copy in range(scale):
+        suffix = f" {copy}" if copy else ""
+        teacher_copy = teachers.copy()
+        teacher_copy['code_smartex_ens'] = codes + copy * code_step
+        teacher_copy['nom_ens'] = teachers['nom_ens'].astype(str) + suffix
+        teacher_copies.append(teacher_copy)
+
+        # Wishes use "first last" or "f.last": renaming the last name keeps them matched
+        wish_copy = wishes.copy()
+        wish_copy['Enseignant'] = wishes['Enseignant'].astype(str) + suffix
+        wish_copies.append(wish_copy)
+
+        exam_copy = exams.copy()
+        exam_copy['dateExam'] = (exam_dates + pd.Timedelta(weeks=4 * copy)).dt.strftime('%d/%m/%Y')
+        exam_copy['enseignant'] = pd.to_numeric(exams['enseignant'], errors='coerce') + copy * code_step
+        exam_copies.append(exam_copy)
+
+    pd.concat(teacher_copies, ignore_index=True).to_excel(os.path.join(directory, TEACHERS_FILE), index=False)
+    pd.concat(wish_copies, ignore_index=True).to_excel(os.path.join(directory, UNAVAILABILITY_FILE), index=False)
+    pd.concat(exam_copies, ignore_index=True).to_excel(os.path.join(directory, EXAMS_FILE), index=False)
+
+
+def import_all(importer, directory):
+    """Run the three imports, return (objects, printed log)."""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        teachers = importer.import_teachers(os.path.join(directory, TEACHERS_FILE), DEFAULT_GRADE_HOURS)
+        time_slots = importer.import_exams_as_slots(os.path.join(directory, EXAMS_FILE))
+        importer.import_unavailability(os.path.join(directory, UNAVAILABILITY_FILE), teachers,
+                                       os.path.join(directory, TEACHERS_FILE))
+    objects = ([asdict(t) for t in teachers], [asdict(ts) for ts in time_slots])
+    # File paths differ between runs of different directories only
+    return objects, log.getvalue().replace(directory, "<dir>")
+
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the vectorized importers against iterrows')
+    parser.add_argument('--scale', type=int, default=10, help='Size of the synthetic instance (x bundled)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is kept)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_importer_")
+    try:
+        print(f"{'Instance':<10}{'Teachers':>10}{'Exams':>8}{'  Step':<28}{'Row-wise (s)':>14}"
+              f"{'Vectorized (s)':>16}{'Speedup':>9}  Identical")
+        print("-" * 106)
+        for scale in (1, args.scale):
+            directory = os.path.join(workdir, f"x{scale}")
+            os.makedirs(directory)
+            make_scaled_inputs(directory, scale)
+            # Parse the workbooks once so that only the import logic is timed
+            for filename in (TEACHERS_FILE, UNAVAILABILITY_FILE):
+                DataImporter.read_excel(os.path.join(directory, filename))
+
+            rowwise_time, rowwise = best_time(lambda: import_all(RowwiseImporter, directory), args.repeat)
+            vectorized_time, vectorized = best_time(lambda: import_all(DataImporter, directory), args.repeat)
+            teachers, time_slots = vectorized[0]
+            print(f"{f'{scale}x':<10}{len(teachers):>10}{sum(ts['num_exams'] for ts in time_slots):>8}"
+                  f"{'  DataImporter (3 imports)':<28}{rowwise_time:>14.3f}{vectorized_time:>16.3f}"
+                  f"{rowwise_time / vectorized_time:>8.1f}x  {rowwise == vectorized}")
+
+            # load_enseignants_mapping reads the workbook itself: the parse is included
+            rowwise_time, rowwise = best_time(lambda: rowwise_enseignants_mapping(directory), args.repeat)
+            vectorized_time, vectorized = best_time(lambda: generate_docs.load_enseignants_mapping(directory),
+                                                    args.repeat)
+            print(f"{'':<10}{'':>10}{'':>8}{'  load_enseignants_mapping':<28}{rowwise_time:>14.3f}"
+                  f"{vectorized_time:>16.3f}{rowwise_time / vectorized_time:>8.1f}x  {rowwise == vectorized}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
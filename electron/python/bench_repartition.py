@@ -0,0 +1,194 @@
+"""
+Benchmark: streaming vs DataFrame repartition reader
+====================================================
+
+Builds a synthetic repartition SCALE times the size of the bundled one
+(Répartition_SE_dedup.xlsx): rows are copied onto later weeks and a few
+descriptive columns are added, like the full multi-department exports
+(module, filière, niveau...). DataImporter.import_exams_as_slots, which
+streams the workbook (input_model.parse_exams over xlsx_stream.iter_rows,
+read_only openpyxl), then runs on the 1x and SCALEx workbooks against the
+previous pd.read_excel + drop_duplicates version (kept below as a
+reference). analyze_surveillance_data reads the repartition through the
+same parse_exams.
+
+Time is the best of REPEAT runs; peak memory is the tracemalloc peak of one
+run (Python and NumPy allocations). Outputs (objects and printed log) are
+checked to be identical.
+
+Usage: python bench_repartition.py [--scale 20] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from main import DataImporter, TimeSlotInfo, TIME_SLOTS
+from xlsx_stream import iter_rows
+
+EXAMS_FILE = "Répartition_SE_dedup.xlsx"
+
+# Columns of the full exports that none of the readers use
+EXTRA_COLUMNS = {
+    'module': "Module {}",
+    'filiere': "Filière {}",
+    'niveau': "Niveau {}",
+    'responsable': "Responsable {}",
+}
+
+
+def dataframe_import_exams_as_slots(filepath: str) -> List[TimeSlotInfo]:
+    """DataImporter.import_exams_as_slots before streaming (reference)."""
+    df = pd.read_excel(filepath)
+
+    # Remove duplicate rows
+    df = df.drop_duplicates()
+
+    # Convert dates and assign day numbers
+    df['dateExam'] = pd.to_datetime(df['dateExam'], format='%d/%m/%Y')
+    unique_dates = sorted(df['dateExam'].unique())
+    date_to_day = {date: idx + 1 for idx, date in enumerate(unique_dates)}
+
+    exams = pd.DataFrame({
+        'date': df['dateExam'].dt.strftime('%Y-%m-%d'),
+        'day': df['dateExam'].map(date_to_day),
+        'exam_id': 'E' + pd.Series(df.index + 1, index=df.index).astype(str).str.zfill(3),
+    })
+    valid = exams['date'].notna()
+
+    codes, start_times = pd.factorize(df['h_debut'], use_na_sentinel=False)
+    slot_of, warning_of = [], []
+    for start_time in start_times:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            slot_of.append(DataImporter.parse_time_slot(start_time))
+        warning_of.append(output.getvalue())
+    exams['slot'] = np.asarray(slot_of, dtype=int)[codes] if len(codes) else 0
+    for code in codes[valid.to_numpy()]:
+        if warning_of[code]:
+            sys.stdout.write(warning_of[code])
+
+    teacher_codes = DataImporter.int_column(df['enseignant'])
+    valid &= teacher_codes.notna()
+    exams['teacher_id'] = teacher_codes.astype(str).str.zfill(3)
+    exams['room'] = df['cod_salle'].astype(str).str.strip()
+
+    exams = exams[valid]
+    dates = exams['date'].to_numpy()
+    exam_ids = exams['exam_id'].to_numpy()
+    teacher_ids = exams['teacher_id'].to_numpy()
+    rooms = exams['room'].to_numpy()
+    time_slots = []
+    for (day, slot), rows in sorted(exams.groupby(['day', 'slot']).indices.items()):
+        time_slots.append(TimeSlotInfo(
+            day=int(day),
+            slot=int(slot),
+            date=dates[rows[-1]],
+            num_exams=len(rows),
+            exam_ids=exam_ids[rows].tolist(),
+            responsible_teachers=set(teacher_ids[rows]),
+            exam_rooms=rooms[rows].tolist(),
+            exam_responsibles=teacher_ids[rows].tolist()
+        ))
+
+    print(f"✓ Imported and grouped exams into {len(time_slots)} time slots")
+    print(f"  - Total exams: {sum(ts.num_exams for ts in time_slots)}")
+    print(f"  - Days: {len(unique_dates)} ({unique_dates[0].strftime('%d/%m/%Y')} to {unique_dates[-1].strftime('%d/%m/%Y')})")
+
+    print("\n  Time slot requirements:")
+    for ts in time_slots:
+        slot_info = TIME_SLOTS[ts.slot]
+        print(f"    Day {ts.day}, {slot_info['name']}: {ts.num_exams} exams → "
+              f"{ts.get_min_teachers()} min + {ts.get_buffer()} buffer = "
+              f"{ts.get_target_teachers()} teachers needed")
+
+    return time_slots
+
+
+def make_scaled_repartition(path, scale):
+    """Write the bundled repartition scaled by `scale`, with the extra columns, to path."""
+    exams = pd.read_excel(EXAMS_FILE, dtype={'enseignant': str})
+    exam_dates = pd.to_datetime(exams['dateExam'], format='%d/%m/%Y')
+    copies = []
+    for copy in range(scale):
+        exam_copy = exams.copy()
+        exam_copy['dateExam'] = (exam_dates + pd.Timedelta(weeks=4 * copy)).dt.strftime('%d/%m/%Y')
+        for column, template in EXTRA_COLUMNS.items():
+            exam_copy[column] = [template.format(i % 97) for i in range(len(exams))]
+        copies.append(exam_copy)
+    pd.concat(copies, ignore_index=True).to_excel(path, index=False)
+
+
+def slots_and_log(reader, path):
+    """Run an exams reader, return (objects, printed log)."""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        time_slots = reader(path)
+    return [asdict(ts) for ts in time_slots], log.getvalue()
+
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def peak_memory(function):
+    """tracemalloc peak (MB) of one call."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the streaming repartition reader against pandas')
+    parser.add_argument('--scale', type=int, default=20, help='Size of the synthetic repartition (x bundled)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per time measurement (best is kept)')
+    args = parser.parse_args()
+
+    steps = (
+        ("import_exams_as_slots",
+         lambda path: slots_and_log(dataframe_import_exams_as_slots, path),
+         lambda path: slots_and_log(DataImporter.import_exams_as_slots, path)),
+    )
+
+    workdir = tempfile.mkdtemp(prefix="bench_repartition_")
+    try:
+        print(f"{'Instance':<10}{'Rows':>8}{'  Step':<30}{'Time df/stream (s)':>22}"
+              f"{'Peak df/stream (MB)':>23}  Identical")
+        print("-" * 104)
+        for scale in (1, args.scale):
+            path = os.path.join(workdir, f"x{scale}.xlsx")
+            make_scaled_repartition(path, scale)
+            rows = sum(1 for _ in iter_rows(path, ()))
+            for name, dataframe_reader, streaming_reader in steps:
+                dataframe_time, reference = best_time(lambda: dataframe_reader(path), args.repeat)
+                streaming_time, result = best_time(lambda: streaming_reader(path), args.repeat)
+                dataframe_peak = peak_memory(lambda: dataframe_reader(path))
+                streaming_peak = peak_memory(lambda: streaming_reader(path))
+                print(f"{f'{scale}x':<10}{rows:>8}{'  ' + name:<30}"
+                      f"{f'{dataframe_time:.3f} / {streaming_time:.3f}':>22}"
+                      f"{f'{dataframe_peak:.1f} / {streaming_peak:.1f}':>23}  {reference == result}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
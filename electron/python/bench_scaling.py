@@ -0,0 +1,165 @@
+"""
+Benchmark: scheduler scaling on synthetic instances
+===================================================
+
+Generates synthetic instances (synthetic_instance.py) of growing size, the
+bundled grade mix and number of days multiplied by each --sizes factor, and
+solves each one with SlotBasedScheduler in a fresh process. Per instance it
+records the import time, the model build time, the model size, the time to
+the first feasible solution, the time to a proven optimum (empty when the
+time limit is reached first), the final status, objective and bound, and the
+peak resident memory of the process (empty where the resource module is not
+available, e.g. on Windows).
+
+Rows are appended to the CSV with the current git commit, so runs of
+different commits can be compared in the same file.
+
+Usage: python bench_scaling.py [--sizes 1 2 4] [--days 6] [--time-limit 60]
+           [--workers 8] [--unavailability 0.05] [--responsible-ratio 0.6]
+           [--seed 0] [--output bench_scaling.csv]
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from main import DataImporter, SlotBasedScheduler, SolverProfile, DEFAULT_GRADE_HOURS
+from synthetic_instance import (InstanceSpec, generate_instance,
+                                TEACHERS_FILE, UNAVAILABILITY_FILE, EXAMS_FILE)
+
+COLUMNS = ['date', 'commit', 'size', 'teachers', 'days', 'time_slots', 'exams', 'unavailability',
+           'responsible_ratio', 'seed', 'time_limit', 'workers', 'assignment_variables', 'variables',
+           'constraints', 'import_time', 'build_time', 'presolve_time', 'first_feasible_time',
+           'optimal_time', 'status', 'objective', 'best_bound', 'peak_rss_mb']
+
+
+def git_commit() -> str:
+    """Short hash of the checked out commit, empty outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process (MB), None without the resource module."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1e6 if os.uname().sysname == "Darwin" else peak / 1e3
+
+
+def show(value, digits=2):
+    """Table cell of an optional number."""
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def run_case(directory, time_limit, workers):
+    """Import, build and solve one instance (run in its own process), return the measured fields."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        teachers = DataImporter.import_teachers(os.path.join(directory, TEACHERS_FILE), DEFAULT_GRADE_HOURS)
+        time_slots = DataImporter.import_exams_as_slots(os.path.join(directory, EXAMS_FILE))
+        DataImporter.import_unavailability(os.path.join(directory, UNAVAILABILITY_FILE), teachers,
+                                           os.path.join(directory, TEACHERS_FILE))
+        import_time = time.perf_counter() - start
+
+        scheduler = SlotBasedScheduler(teachers, time_slots)
+        scheduler.capture_presolve_time = True
+        scheduler.build_model()
+        scheduler.solve(profile=SolverProfile(time_limit=time_limit, num_workers=workers))
+
+    report = scheduler.get_instrumentation_report()
+    solve = report['solves'][-1]
+    return {
+        'assignment_variables': report['model']['assignment_variables'],
+        'variables': report['model']['variables'],
+        'constraints': report['model']['constraints'],
+        'import_time': round(import_time, 3),
+        'build_time': round(report['build_time'], 3),
+        'presolve_time': solve['presolve_time'],
+        'first_feasible_time': (round(solve['first_solution_time'], 3)
+                                if solve['first_solution_time'] is not None else None),
+        'optimal_time': round(solve['wall_time'], 3) if solve['status'] == 'OPTIMAL' else None,
+        'status': solve['status'],
+        'objective': solve['objective'],
+        'best_bound': solve['best_bound'],
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scheduler on synthetic instances of growing size')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 2, 4],
+                        help='Size factors (teachers per grade and days multiplied)')
+    parser.add_argument('--days', type=int, default=6, help='Exam days at size 1')
+    parser.add_argument('--time-limit', type=float, default=60, help='Solver time limit per instance (seconds)')
+    parser.add_argument('--workers', type=int, default=8, help='CP-SAT search workers')
+    parser.add_argument('--unavailability', type=float, default=0.05,
+                        help='Probability that a teacher is unavailable on a slot (first 7 days)')
+    parser.add_argument('--responsible-ratio', type=float, default=0.6,
+                        help='Share of exams whose responsible teacher is in the pool')
+    parser.add_argument('--seed', type=int, default=0, help='Instance random seed')
+    parser.add_argument('--output', default='bench_scaling.csv', help='CSV the result rows are appended to')
+    args = parser.parse_args()
+
+    base = InstanceSpec(days=args.days, unavailability=args.unavailability,
+                        responsible_ratio=args.responsible_ratio, seed=args.seed)
+    common = {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'unavailability': args.unavailability,
+        'responsible_ratio': args.responsible_ratio,
+        'seed': args.seed,
+        'time_limit': args.time_limit,
+        'workers': args.workers,
+    }
+
+    new_file = not os.path.exists(args.output)
+    workdir = tempfile.mkdtemp(prefix="bench_scaling_")
+    try:
+        with open(args.output, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            if new_file:
+                writer.writeheader()
+
+            print(f"{'Size':<6}{'Teachers':>9}{'Slots':>7}{'Exams':>7}{'Vars':>9}{'Build (s)':>11}"
+                  f"{'First (s)':>11}{'Optimal (s)':>13}{'Status':>11}{'Objective':>11}{'RSS (MB)':>10}")
+            print("-" * 105)
+            for size in args.sizes:
+                directory = os.path.join(workdir, f"x{size}")
+                instance = generate_instance(directory, base.scaled(size))
+
+                # A fresh (spawned) process per instance, so the peak memory is the instance's own
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    result = pool.submit(run_case, directory, args.time_limit, args.workers).result()
+
+                row = dict(common, size=size, teachers=instance['teachers'], days=args.days * size,
+                           time_slots=instance['time_slots'], exams=instance['exams'], **result)
+                writer.writerow(row)
+                f.flush()
+                print(f"{size:<6}{row['teachers']:>9}{row['time_slots']:>7}{row['exams']:>7}"
+                      f"{row['assignment_variables']:>9}{show(row['build_time']):>11}"
+                      f"{show(row['first_feasible_time']):>11}{show(row['optimal_time']):>13}"
+                      f"{row['status']:>11}{show(row['objective'], 0):>11}{show(row['peak_rss_mb'], 0):>10}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n✓ Rows appended to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
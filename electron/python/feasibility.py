@@ -0,0 +1,276 @@
+"""
+Pre-solve Feasibility Analyzer
+==============================
+
+Fast checks (milliseconds) of the HARD constraints of SlotBasedScheduler,
+run before CP-SAT is started:
+- Per-slot capacity: enough available teachers for exams × 2
+- Per-teacher hours: enough available slots for the required hours, and
+  required hours reachable with whole slots
+- Global totals: required hours vs. minimum / maximum slot coverage
+- Flow bound over the bipartite teacher-slot graph. The hard constraints
+  (exact hours per teacher, [min, min + max_extra_teachers] teachers per
+  slot, at most one assignment per available pair) form a flow problem with
+  lower bounds, so this check is exact: if it passes, the hard constraints
+  are satisfiable.
+
+With hours_tolerance > 0 (soft exact-hours mode) each teacher's hours may be
+anywhere in [required - tolerance, required + tolerance].
+
+Works on any teacher / time slot objects exposing the Teacher and
+TimeSlotInfo interface of main.py.
+"""
+
+from dataclasses import dataclass, field, asdict
+from typing import TYPE_CHECKING, List, Dict, Tuple
+from collections import defaultdict
+import math
+import time
+
+from startup import LazyModule
+
+if TYPE_CHECKING:  # real import, also seen by PyInstaller's analysis
+    from ortools.graph.python import max_flow
+else:
+    max_flow = LazyModule("ortools.graph.python.max_flow")
+
+
+@dataclass
+class FeasibilityIssue:
+    """One reason why the instance cannot be scheduled."""
+    kind: str
+    message: str
+    slots: List[Tuple[int, int]] = field(default_factory=list)  # (day, slot)
+    teachers: List[str] = field(default_factory=list)
+    grades: List[str] = field(default_factory=list)
+
+
+@dataclass
+class FeasibilityReport:
+    """Result of check_feasibility()."""
+    feasible: bool
+    issues: List[FeasibilityIssue]
+    elapsed: float  # seconds
+
+    def to_dict(self) -> Dict:
+        return {
+            'feasible': self.feasible,
+            'elapsed_ms': round(self.elapsed * 1000, 2),
+            'issues': [asdict(issue) for issue in self.issues],
+        }
+
+    def print_report(self):
+        """Print the report in the same style as the scheduler output."""
+        if self.feasible:
+            print(f"✓ Hard constraints are satisfiable (checked in {self.elapsed * 1000:.1f} ms)")
+            return
+
+        print(f"✗ INFEASIBLE - {len(self.issues)} issue(s) found in {self.elapsed * 1000:.1f} ms")
+        for issue in self.issues:
+            print(f"\n  [{issue.kind}] {issue.message}")
+            if issue.slots:
+                slots = ", ".join(f"Day {day} S{slot}" for day, slot in issue.slots[:10])
+                more = f" ... and {len(issue.slots) - 10} more" if len(issue.slots) > 10 else ""
+                print(f"    Slots: {slots}{more}")
+            if issue.teachers:
+                more = f" ... and {len(issue.teachers) - 10} more" if len(issue.teachers) > 10 else ""
+                print(f"    Teachers: {', '.join(issue.teachers[:10])}{more}")
+            if issue.grades:
+                print(f"    Grades: {', '.join(issue.grades)}")
+
+
+def _grades_of(teacher_ids, teachers_by_id) -> List[str]:
+    return sorted(set(teachers_by_id[t_id].grade for t_id in teacher_ids))
+
+
+def check_feasibility(teachers, time_slots, max_extra_teachers: int,
+                      hours_tolerance: float = 0.0) -> FeasibilityReport:
+    """Check the hard constraints without starting the solver.
+
+    max_extra_teachers is the scheduler's slot upper bound above the
+    minimum (MAX_EXTRA_TEACHERS in main.py).
+    """
+    start = time.perf_counter()
+    issues = []
+
+    teachers_by_id = {t.id: t for t in teachers}
+    teacher_ids = sorted(teachers_by_id)
+    slot_keys = [ts.get_time_key() for ts in time_slots]
+
+    # Availability lists (teacher -> slots, slot -> teachers)
+    available_slots = defaultdict(list)
+    available_teachers = defaultdict(list)
+    for ts in time_slots:
+        for t_id in teacher_ids:
+            if teachers_by_id[t_id].is_available(ts.day, ts.slot):
+                available_slots[t_id].append(ts.get_time_key())
+                available_teachers[ts.get_time_key()].append(t_id)
+
+    min_teachers = {ts.get_time_key(): ts.get_min_teachers() for ts in time_slots}
+    max_teachers = {key: value + max_extra_teachers for key, value in min_teachers.items()}
+    slot_tenths = {ts.get_time_key(): int(round(ts.get_hours() * 10)) for ts in time_slots}
+
+    # 1. Per-slot capacity
+    short_slots = [key for key in slot_keys if len(available_teachers[key]) < min_teachers[key]]
+    for key in short_slots:
+        issues.append(FeasibilityIssue(
+            kind='slot_capacity',
+            message=f"Day {key[0]} S{key[1]} needs {min_teachers[key]} teachers "
+                    f"but only {len(available_teachers[key])} are available",
+            slots=[key],
+            teachers=list(available_teachers[key]),
+        ))
+
+    # 2. Per-teacher hours: availability and slot granularity
+    uniform_tenths = len(set(slot_tenths.values())) == 1
+    unit = next(iter(slot_tenths.values())) if slot_tenths else 15
+    tolerance_tenths = int(round(hours_tolerance * 10))
+    min_units, max_units = {}, {}  # teacher -> allowed number of slots
+    bad_granularity = defaultdict(list)  # grade -> teacher_ids
+    for t_id in teacher_ids:
+        teacher = teachers_by_id[t_id]
+        required_tenths = int(teacher.required_hours * 10)
+        min_tenths = max(0, required_tenths - tolerance_tenths)
+        max_tenths = required_tenths + tolerance_tenths
+        available_tenths = sum(slot_tenths[key] for key in available_slots[t_id])
+        if available_tenths < min_tenths:
+            issues.append(FeasibilityIssue(
+                kind='teacher_hours',
+                message=f"Teacher {t_id} ({teacher.grade}) needs {min_tenths / 10}h "
+                        f"but is only available for {available_tenths / 10}h",
+                slots=list(available_slots[t_id]),
+                teachers=[t_id],
+                grades=[teacher.grade],
+            ))
+        if uniform_tenths:
+            min_units[t_id] = math.ceil(min_tenths / unit)
+            max_units[t_id] = max_tenths // unit
+            if min_units[t_id] > max_units[t_id]:
+                bad_granularity[teacher.grade].append(t_id)
+
+    for grade, grade_teachers in sorted(bad_granularity.items()):
+        hours = teachers_by_id[grade_teachers[0]].required_hours
+        issues.append(FeasibilityIssue(
+            kind='hours_granularity',
+            message=f"Grade {grade}: {hours}h is not a multiple of the {unit / 10}h slot duration",
+            teachers=grade_teachers,
+            grades=[grade],
+        ))
+
+    # 3. Global totals
+    total_required = sum(int(teachers_by_id[t_id].required_hours * 10) for t_id in teacher_ids)
+    total_low = sum(max(0, int(teachers_by_id[t_id].required_hours * 10) - tolerance_tenths)
+                    for t_id in teacher_ids)
+    total_high = total_required + tolerance_tenths * len(teacher_ids)
+    total_min = sum(min_teachers[key] * slot_tenths[key] for key in slot_keys)
+    total_max = sum(max_teachers[key] * slot_tenths[key] for key in slot_keys)
+    if total_high < total_min:
+        issues.append(FeasibilityIssue(
+            kind='total_hours',
+            message=f"Teachers provide {total_high / 10}h but slots need at least {total_min / 10}h",
+            grades=sorted(set(t.grade for t in teachers)),
+        ))
+    elif total_low > total_max:
+        issues.append(FeasibilityIssue(
+            kind='total_hours',
+            message=f"Teachers must work {total_low / 10}h but slots accept at most {total_max / 10}h",
+            grades=sorted(set(t.grade for t in teachers)),
+        ))
+
+    # 4. Flow bounds on the bipartite teacher-slot graph (slots of equal duration only)
+    if uniform_tenths and not issues:
+        issues.extend(_flow_issues(teacher_ids, slot_keys, available_slots, min_units, max_units,
+                                   min_teachers, max_teachers, teachers_by_id))
+
+    return FeasibilityReport(feasible=not issues, issues=issues, elapsed=time.perf_counter() - start)
+
+
+def _flow_issues(teacher_ids, slot_keys, available_slots, min_units, max_units,
+                 min_teachers, max_teachers, teachers_by_id) -> List[FeasibilityIssue]:
+    """Supply, demand and combined flow checks; returns the violated groups (Hall sets)."""
+    issues = []
+    source, sink = 0, 1
+    teacher_node = {t_id: 2 + i for i, t_id in enumerate(teacher_ids)}
+    slot_node = {key: 2 + len(teacher_ids) + i for i, key in enumerate(slot_keys)}
+
+    # a) Supply: can every teacher place all required slots with slots capped at their maximum?
+    flow = max_flow.SimpleMaxFlow()
+    teacher_arcs = {t_id: flow.add_arc_with_capacity(source, teacher_node[t_id], min_units[t_id])
+                    for t_id in teacher_ids}
+    for t_id in teacher_ids:
+        for key in available_slots[t_id]:
+            flow.add_arc_with_capacity(teacher_node[t_id], slot_node[key], 1)
+    for key in slot_keys:
+        flow.add_arc_with_capacity(slot_node[key], sink, max_teachers[key])
+    flow.solve(source, sink)
+
+    if flow.optimal_flow() < sum(min_units.values()):
+        stuck = [t_id for t_id in teacher_ids if flow.flow(teacher_arcs[t_id]) < min_units[t_id]]
+        cut = set(flow.get_source_side_min_cut())
+        full_slots = [key for key in slot_keys if slot_node[key] in cut]
+        issues.append(FeasibilityIssue(
+            kind='teacher_group',
+            message=f"{len(stuck)} teacher(s) cannot reach their hours: the slots they are available "
+                    f"for are already full",
+            slots=full_slots,
+            teachers=stuck,
+            grades=_grades_of(stuck, teachers_by_id),
+        ))
+
+    # b) Demand: can every slot reach its minimum with teachers capped at their required slots?
+    flow = max_flow.SimpleMaxFlow()
+    slot_arcs = {key: flow.add_arc_with_capacity(source, slot_node[key], min_teachers[key])
+                 for key in slot_keys}
+    for t_id in teacher_ids:
+        for key in available_slots[t_id]:
+            flow.add_arc_with_capacity(slot_node[key], teacher_node[t_id], 1)
+        flow.add_arc_with_capacity(teacher_node[t_id], sink, max_units[t_id])
+    flow.solve(source, sink)
+
+    if flow.optimal_flow() < sum(min_teachers.values()):
+        short = [key for key in slot_keys if flow.flow(slot_arcs[key]) < min_teachers[key]]
+        cut = set(flow.get_source_side_min_cut())
+        exhausted = [t_id for t_id in teacher_ids if teacher_node[t_id] in cut]
+        issues.append(FeasibilityIssue(
+            kind='slot_group',
+            message=f"{len(short)} slot(s) cannot reach exams × 2 teachers: every teacher available "
+                    f"for them has no required hours left",
+            slots=short,
+            teachers=exhausted,
+            grades=_grades_of(exhausted, teachers_by_id),
+        ))
+
+    if issues:
+        return issues
+
+    # c) Both at once: circulation with lower bounds (teacher in [min, max] slots, slot in [min, max] teachers)
+    super_source, super_sink = 2 + len(teacher_ids) + len(slot_keys), 3 + len(teacher_ids) + len(slot_keys)
+    flow = max_flow.SimpleMaxFlow()
+    for t_id in teacher_ids:
+        flow.add_arc_with_capacity(super_source, teacher_node[t_id], min_units[t_id])
+        flow.add_arc_with_capacity(source, teacher_node[t_id], max_units[t_id] - min_units[t_id])
+        for key in available_slots[t_id]:
+            flow.add_arc_with_capacity(teacher_node[t_id], slot_node[key], 1)
+    for key in slot_keys:
+        flow.add_arc_with_capacity(slot_node[key], sink, max_teachers[key] - min_teachers[key])
+        flow.add_arc_with_capacity(slot_node[key], super_sink, min_teachers[key])
+    total_low = sum(min_units.values())
+    total_min = sum(min_teachers.values())
+    flow.add_arc_with_capacity(super_source, sink, total_min)
+    flow.add_arc_with_capacity(source, super_sink, total_low)
+    flow.add_arc_with_capacity(sink, source, sum(max_units.values()) + total_min)
+    flow.solve(super_source, super_sink)
+
+    if flow.optimal_flow() < total_low + total_min:
+        cut = set(flow.get_source_side_min_cut())
+        group_teachers = [t_id for t_id in teacher_ids if teacher_node[t_id] in cut]
+        group_slots = [key for key in slot_keys if slot_node[key] in cut]
+        issues.append(FeasibilityIssue(
+            kind='combined',
+            message="Teacher hours and per-slot bounds cannot be met together for this group",
+            slots=group_slots,
+            teachers=group_teachers,
+            grades=_grades_of(group_teachers, teachers_by_id),
+        ))
+
+    return issues
@@ -11,18 +11,33 @@ Corrigé :
 
 import sys
 import json
-from docx import Document
 from datetime import datetime
 import zipfile
 import os
 from io import BytesIO
 import re
-import pandas as pd
-from docx.shared import RGBColor
-from docx2pdf import convert
+import math
 import tempfile
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
+from typing import TYPE_CHECKING
+
+from startup import LazyModule, PROFILE_STARTUP_FLAG, profile_startup
+
+# Bibliothèques lourdes chargées à la première utilisation (docx2pdf ouvre Word
+# via COM sous Windows) : les erreurs d'usage et la lecture du planning ne les paient pas
+if TYPE_CHECKING:  # imports réels, aussi vus par l'analyse de PyInstaller
+    import pandas as pd
+    import docx
+    import docx.shared as docx_shared
+    import docx2pdf
+else:
+    pd = LazyModule("pandas")
+    docx = LazyModule("docx")
+    docx_shared = LazyModule("docx.shared")
+    docx2pdf = LazyModule("docx2pdf")
+
+HEAVY_MODULES = ("pandas", "openpyxl", "docx", "docx2pdf")
 
 # ============================================================================
 # UTILITAIRE DE CHEMIN POUR PYINSTALLER
@@ -77,19 +92,29 @@ def load_enseignants_mapping(excel_dir):
         sys.exit(1)
 
     df = pd.read_excel(enseignants_file)
-    enseignants_dict = {}
 
-    for _, row in df.iterrows():
-        try:
-            id_prof = int(row["code_smartex_ens"])
-            nom = str(row["nom_ens"]).strip().title()
-            prenom = str(row["prenom_ens"]).strip().title()
-            grade = str(row["grade_code_ens"]).strip().upper()
-            enseignants_dict[id_prof] = f"{nom} {prenom} ({grade})"
-        except Exception:
-            continue
+    # int(code) de chaque ligne ; les lignes sans code entier sont ignorées
+    codes = df["code_smartex_ens"]
+    if pd.api.types.is_numeric_dtype(codes):
+        numbers = codes.astype("float64")
+        ids = numbers.where(numbers.abs() != float("inf")).dropna().apply(math.trunc)
+    else:
+        ids = codes.map(_int_or_none).dropna()
 
-    return enseignants_dict
+    rows = df.loc[ids.index]
+    labels = (rows["nom_ens"].astype(str).str.strip().str.title() + " "
+              + rows["prenom_ens"].astype(str).str.strip().str.title() + " ("
+              + rows["grade_code_ens"].astype(str).str.strip().str.upper() + ")")
+
+    # En cas de doublon, la dernière ligne l'emporte
+    return dict(zip(ids.astype("int64").tolist(), labels))
+
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except Exception:
+        return None
 
 # ============================================================================
 # OUTILS DE REMPLACEMENT DE TEXTE
@@ -159,7 +184,7 @@ def process_day_document(template_path, data, session_type):
     Supprime TOUTES les lignes du modèle avant d'ajouter les données réelles
     Applique la mise en page (couleurs, formatage)
     """
-    doc = Document(template_path)
+    doc = docx.Document(template_path)
     replace_text_in_document(doc, "[smstre]", "2")
     replace_text_in_document(doc, "[session]", session_type)
     replace_text_in_document(doc, "[annee]", "2024-2025")
@@ -207,7 +232,7 @@ def process_teacher_document(template_path, prof_name, prof_data):
     Supprime TOUTES les lignes du modèle avant d'ajouter les données réelles
     Applique la couleur bleue (RGB 0, 176, 240) aux horaires et durées
     """
-    doc = Document(template_path)
+    doc = docx.Document(template_path)
     replace_text_in_document(doc, "[prof]", prof_name)
 
     for table in doc.tables:
@@ -233,7 +258,7 @@ def process_teacher_document(template_path, prof_name, prof_data):
                         paragraph.clear()
                     # Ajouter le texte avec couleur
                     run = row_cells[1].paragraphs[0].add_run(horaire_text)
-                    run.font.color.rgb = RGBColor(0, 176, 240)
+                    run.font.color.rgb = docx_shared.RGBColor(0, 176, 240)
 
                     # Colonne 2: Durée (avec couleur bleue)
                     duree_text = "1.5h"
@@ -242,7 +267,7 @@ def process_teacher_document(template_path, prof_name, prof_data):
                         paragraph.clear()
                     # Ajouter le texte avec couleur
                     run = row_cells[2].paragraphs[0].add_run(duree_text)
-                    run.font.color.rgb = RGBColor(0, 176, 240)
+                    run.font.color.rgb = docx_shared.RGBColor(0, 176, 240)
 
     # Convert to PDF and return
     # Create temporary files for docx and pdf
@@ -252,7 +277,7 @@ def process_teacher_document(template_path, prof_name, prof_data):
 
     # Convert to PDF
     temp_pdf_path = temp_docx_path.replace('.docx', '.pdf')
-    convert(temp_docx_path, temp_pdf_path)
+    docx2pdf.convert(temp_docx_path, temp_pdf_path)
 
     # Read PDF into BytesIO
     with open(temp_pdf_path, 'rb') as pdf_file:
@@ -465,7 +490,7 @@ def process_teacher_document_fast(template_path, prof_name, prof_data):
     """
     VERSION RAPIDE - Retourne juste le doc sans conversion
     """
-    doc = Document(template_path)
+    doc = docx.Document(template_path)
     replace_text_in_document(doc, "[prof]", prof_name)
 
     for table in doc.tables:
@@ -483,13 +508,13 @@ def process_teacher_document_fast(template_path, prof_name, prof_data):
                     for paragraph in row_cells[1].paragraphs:
                         paragraph.clear()
                     run = row_cells[1].paragraphs[0].add_run(horaire_text)
-                    run.font.color.rgb = RGBColor(0, 176, 240)
+                    run.font.color.rgb = docx_shared.RGBColor(0, 176, 240)
 
                     duree_text = "1.5h"
                     for paragraph in row_cells[2].paragraphs:
                         paragraph.clear()
                     run = row_cells[2].paragraphs[0].add_run(duree_text)
-                    run.font.color.rgb = RGBColor(0, 176, 240)
+                    run.font.color.rgb = docx_shared.RGBColor(0, 176, 240)
 
     return doc
 
@@ -497,9 +522,8 @@ def convert_single_docx_to_pdf(docx_path, pdf_path):
     """
     Convertit un seul DOCX en PDF
     """
-    from docx2pdf import convert
     try:
-        convert(docx_path, pdf_path)
+        docx2pdf.convert(docx_path, pdf_path)
         return True
     except Exception as e:
         print(f"Erreur conversion {docx_path}: {e}", file=sys.stderr)
@@ -560,17 +584,11 @@ def generate_teacher_document(planning_data, teacher_id, excel_dir, output_dir):
 # 🔹 POINT D'ENTRÉE PRINCIPAL
 # ============================================================================
 
-def main():
-    if len(sys.argv) < 3:
-        print(json.dumps({
-            'success': False,
-            'error': 'Usage: python generate_docs.py <command> <excel_file> [teacher_id]'
-        }))
-        return
-
-    command = sys.argv[1]
-    data_file = sys.argv[2]
-
+def run_command(command, data_file, teacher_id=None):
+    """
+    Exécute une commande ('global' ou 'teacher') et retourne le résultat (dict).
+    Utilisé par main() et par le worker persistant (worker.py).
+    """
     # ✅ Ajouter cette ligne pour obtenir le dossier du fichier Excel
     excel_dir = os.path.dirname(os.path.abspath(data_file))
 
@@ -578,8 +596,7 @@ def main():
         df = pd.read_excel(data_file)
         planning_data = df.to_dict('records')
     except Exception as e:
-        print(json.dumps({'success': False, 'error': f'Erreur de lecture du fichier: {str(e)}'}))
-        return
+        return {'success': False, 'error': f'Erreur de lecture du fichier: {str(e)}'}
 
     # Utilise le dossier Téléchargements par défaut
     downloads_dir = os.path.expanduser("~/Downloads")
@@ -591,16 +608,34 @@ def main():
     output_dir = downloads_dir
 
     if command == 'global':
-        result = generate_global_documents(planning_data, excel_dir, output_dir)  # ✅ Ajouter excel_dir
+        return generate_global_documents(planning_data, excel_dir, output_dir)  # ✅ Ajouter excel_dir
     elif command == 'teacher':
-        if len(sys.argv) < 4:
-            print(json.dumps({'success': False, 'error': 'ID enseignant manquant'}))
-            return
-        teacher_id = sys.argv[3]
-        result = generate_teacher_document(planning_data, teacher_id, excel_dir, output_dir)  # ✅ Ajouter excel_dir
-    else:
-        result = {'success': False, 'error': f'Commande inconnue: {command}'}
+        if teacher_id is None:
+            return {'success': False, 'error': 'ID enseignant manquant'}
+        return generate_teacher_document(planning_data, teacher_id, excel_dir, output_dir)  # ✅ Ajouter excel_dir
+    return {'success': False, 'error': f'Commande inconnue: {command}'}
+
+
+def main():
+    if PROFILE_STARTUP_FLAG in sys.argv:
+        argv = [arg for arg in sys.argv[1:] if arg != PROFILE_STARTUP_FLAG]
+        exit_code = profile_startup(os.path.abspath(__file__), argv, HEAVY_MODULES)
+        if exit_code is not None:
+            sys.exit(exit_code)
+        sys.argv = [sys.argv[0]] + argv
+
+    if len(sys.argv) < 3:
+        print(json.dumps({
+            'success': False,
+            'error': 'Usage: python generate_docs.py <command> <excel_file> [teacher_id]'
+        }))
+        return
+
+    command = sys.argv[1]
+    data_file = sys.argv[2]
+    teacher_id = sys.argv[3] if len(sys.argv) > 3 else None
 
+    result = run_command(command, data_file, teacher_id)
     print(json.dumps(result, ensure_ascii=False))
 
 
@@ -0,0 +1,399 @@
+"""
+Shared input model
+==================
+
+The teachers workbook (Enseignants_participants.xlsx) and the repartition
+(Répartition_SE_dedup.xlsx) are read by both stages of a run: the analysis
+(analyze_surveillance.py) and then the scheduler (main.py). They used to
+parse them each in their own way, with different filters
+(participe_surveillance `== True` on one side, 'TRUE' text on the other) and
+different counts (every repartition row vs the deduplicated exams).
+
+This module is the single definition of what those workbooks contain:
+
+- parse_teachers: participating teachers, normalized (zero-padded ids,
+  generated ids for missing codes, upper-case grades);
+- parse_exams: deduplicated exams grouped by (day, slot), streamed from the
+  repartition (xlsx_stream);
+- InputCache: on-disk cache of the parsed models, keyed on the content of
+  the workbooks. The analysis reads the uploaded files and the scheduler the
+  copies made in python-workspace: both land on the same entries, so a run
+  pays for one parse whichever stage comes first.
+
+The models are plain data (dicts, lists, sets): main.py builds its Teacher /
+TimeSlotInfo objects from them, the analysis only counts.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import pickle
+import sys
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from startup import LazyModule
+from xlsx_stream import iter_rows
+
+if TYPE_CHECKING:  # real imports, also seen by PyInstaller's analysis
+    import numpy as np
+    import pandas as pd
+else:
+    np = LazyModule("numpy")
+    pd = LazyModule("pandas")
+
+
+# ============================================================================
+# CELL PARSING
+# ============================================================================
+
+# Parsed workbooks keyed by (path, mtime, size): a long-lived process
+# (worker.py) only re-reads a file when it changed on disk
+_excel_cache: Dict[Tuple[str, int, int], pd.DataFrame] = {}
+
+
+def read_excel(filepath: str) -> pd.DataFrame:
+    """pd.read_excel through the in-memory cache; returns a copy the caller may modify."""
+    stat = os.stat(filepath)
+    path = os.path.abspath(filepath)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key not in _excel_cache:
+        for stale in [k for k in _excel_cache if k[0] == path]:
+            del _excel_cache[stale]
+        _excel_cache[key] = pd.read_excel(filepath)
+    return _excel_cache[key].copy()
+
+
+def int_column(values: pd.Series) -> pd.Series:
+    """int(value) of every cell as a nullable Int64 column, <NA> where int() fails.
+    
+    Same result as calling int() row by row: numbers are truncated, empty
+    cells and text that is not an integer literal (e.g. "12.0") give <NA>.
+    Numeric columns are converted in one pass, other columns element-wise.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        numbers = values.astype('float64')
+        return pd.Series(np.trunc(numbers.where(np.isfinite(numbers))), index=values.index).astype('Int64')
+    
+    def to_int(value):
+        try:
+            return int(value)
+        except (ValueError, TypeError, OverflowError):
+            return None
+    
+    return values.map(to_int).astype('Int64')
+
+
+def participates(values: pd.Series) -> pd.Series:
+    """participe_surveillance as a boolean mask.
+    
+    An Excel boolean TRUE and the text "TRUE" (any case, surrounding spaces)
+    count; anything else, empty cells included, does not.
+    """
+    return values.astype(str).str.strip().str.upper() == 'TRUE'
+
+
+def parse_time_slot(h_debut_str) -> int:
+    """Parse time string to slot number (1-4)."""
+    try:
+        if isinstance(h_debut_str, datetime):
+            hour = h_debut_str.hour
+            minute = h_debut_str.minute
+        else:
+            time_part = str(h_debut_str).split()[-1]
+            hour, minute = map(int, time_part.split(':')[:2])
+        
+        if hour == 8 and minute == 30:
+            return 1
+        elif hour == 10 and minute == 30:
+            return 2
+        elif hour == 12 and minute == 30:
+            return 3
+        elif hour == 14 and minute == 30:
+            return 4
+        else:
+            print(f"Warning: Unknown time {hour}:{minute}, defaulting to slot 1")
+            return 1
+    except:
+        print(f"Warning: Could not parse time {h_debut_str}, defaulting to slot 1")
+        return 1
+
+
+def parse_exam_date(value) -> Optional[datetime]:
+    """dateExam cell (dd/mm/yyyy text or Excel date) to datetime, None for an empty cell."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.strptime(str(value), '%d/%m/%Y')
+
+
+# ============================================================================
+# MODELS
+# ============================================================================
+
+def parse_teachers(filepath: str) -> Dict:
+    """Participating teachers of the teachers workbook.
+    
+    Returns {'total': rows of the workbook, 'max_id', 'generated_ids',
+    'teachers': [{'id', 'grade', 'first_name', 'last_name', 'email'}, ...]}.
+    Rows whose code is not an integer are skipped; missing codes get
+    max_id + 1, max_id + 2, ... in row order.
+    """
+    df = read_excel(filepath)
+    total = len(df)
+    
+    # Only keep teachers who participate in surveillance
+    df = df[participates(df['participe_surveillance'])]
+    
+    # Find maximum existing ID to generate new ones for missing IDs
+    codes = df['code_smartex_ens']
+    missing = codes.isna() | (codes == '')
+    int_codes = int_column(codes)
+    existing = int_codes[~missing].dropna()
+    max_id = max(0, int(existing.max())) if len(existing) else 0
+    
+    print(f"  - Maximum existing teacher ID: {max_id}")
+    
+    kept = missing | int_codes.notna()
+    df, missing, int_codes = df[kept], missing[kept], int_codes[kept]
+    ids = int_codes.where(~missing, max_id + missing.cumsum()).astype('int64')
+    
+    teachers = [
+        {'id': teacher_id, 'grade': grade, 'first_name': first_name, 'last_name': last_name, 'email': email}
+        for teacher_id, grade, first_name, last_name, email in zip(
+            ids.astype(str).str.zfill(3),
+            df['grade_code_ens'].astype(str).str.strip().str.upper(),
+            df['prenom_ens'].astype(str).str.strip(),
+            df['nom_ens'].astype(str).str.strip(),
+            df['email_ens'].astype(str).str.strip())
+    ]
+    return {'total': total, 'max_id': max_id, 'generated_ids': int(missing.sum()), 'teachers': teachers}
+
+
+def parse_exams(filepath: str) -> Dict:
+    """Exams of the repartition grouped by time slot.
+    
+    The workbook is streamed (xlsx_stream.iter_rows): only dateExam,
+    h_debut, enseignant and cod_salle are kept, duplicate rows are skipped
+    on the fly and every exam goes straight into its (date, slot) group, so
+    memory stays flat whatever the size of the export.
+    
+    Returns {'dates': every exam date (YYYY-MM-DD, sorted), 'time_slots':
+    [{'day', 'slot', 'date', 'num_exams', 'exam_ids', 'responsible_teachers',
+    'exam_rooms', 'exam_responsibles'}, ...] sorted by (day, slot)}. Day
+    numbers follow the order of the dates; rows without a date or an integer
+    teacher code are left out. exam_rooms and exam_responsibles follow
+    exam_ids; an exam without cod_salle (or a file without the column) has
+    its exam id as room.
+    """
+    # (date, slot) -> exam ids, responsible teachers, rooms and responsible teacher per exam
+    slot_data = {}
+    dates = set()
+    
+    # A few distinct dates and start times repeat over thousands of rows:
+    # each one is parsed once (the slot warnings are replayed per row)
+    parsed_dates = {}
+    parsed_slots = {}
+    
+    rows = iter_rows(filepath, ('dateExam', 'h_debut', 'enseignant', 'cod_salle'), dedupe=True,
+                     optional=('cod_salle',))
+    for position, (date_value, start_time, teacher_code, room) in rows:
+        if date_value not in parsed_dates:
+            parsed_dates[date_value] = parse_exam_date(date_value)
+        date = parsed_dates[date_value]
+        if date is None:
+            continue
+        dates.add(date)
+        
+        if start_time not in parsed_slots:
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                slot = parse_time_slot(start_time)
+            parsed_slots[start_time] = (slot, output.getvalue())
+        slot, warning = parsed_slots[start_time]
+        if warning:
+            sys.stdout.write(warning)
+        
+        try:
+            teacher_id = str(int(teacher_code)).zfill(3)
+        except (ValueError, TypeError):
+            continue
+        
+        exam_ids, responsible_teachers, rooms, responsibles = slot_data.setdefault(
+            (date, slot), ([], set(), [], []))
+        exam_id = f"E{position + 1:03d}"
+        exam_ids.append(exam_id)
+        responsible_teachers.add(teacher_id)
+        room = str(room).strip() if room is not None else ""
+        rooms.append(room or exam_id)
+        responsibles.append(teacher_id)
+    
+    unique_dates = sorted(dates)
+    date_to_day = {date: idx + 1 for idx, date in enumerate(unique_dates)}
+    
+    time_slots = [
+        {
+            'day': date_to_day[date],
+            'slot': slot,
+            'date': date.strftime('%Y-%m-%d'),
+            'num_exams': len(exam_ids),
+            'exam_ids': exam_ids,
+            'responsible_teachers': responsible_teachers,
+            'exam_rooms': rooms,
+            'exam_responsibles': responsibles,
+        }
+        for (date, slot), (exam_ids, responsible_teachers, rooms, responsibles)
+        in sorted(slot_data.items(), key=lambda item: (date_to_day[item[0][0]], item[0][1]))
+    ]
+    return {'dates': [date.strftime('%Y-%m-%d') for date in unique_dates], 'time_slots': time_slots}
+
+
+# ============================================================================
+# ON-DISK CACHE
+# ============================================================================
+
+# Parsed inputs are cached in this directory of the working directory (python-workspace)
+INPUT_CACHE_DIR = "input_cache"
+# Bump when the parsing of the Excel inputs changes, to invalidate existing entries
+INPUT_CACHE_VERSION = 3
+
+
+class _TeeWriter(io.TextIOBase):
+    """Write to several text streams at once."""
+    
+    def __init__(self, *streams):
+        self.streams = streams
+    
+    def writable(self):
+        return True
+    
+    def write(self, text):
+        for stream in self.streams:
+            stream.write(text)
+        return len(text)
+    
+    def flush(self):
+        for stream in self.streams:
+            stream.flush()
+
+
+class InputCache:
+    """On-disk cache of the parsed Excel inputs (one pickle per input kind).
+    
+    An entry is keyed on the SHA-256 of every workbook it was parsed from,
+    on the parse parameters and on INPUT_CACHE_VERSION:
+    any change to an input is a miss. The content alone is hashed, not the
+    path or mtime, so a copy of a workbook (python-workspace) hits the entry
+    of the original (the analysis reads the uploaded file). Entries hold
+    plain data (dicts, sets, lists) rather than Teacher / TimeSlotInfo
+    instances, so they load the same whether main.py runs as a script or is
+    imported (worker.py). What the parse prints (warnings) is stored with the
+    value and replayed on a hit, so the log reads the same.
+    
+    With enabled=False every call parses and nothing is read or written.
+    """
+    
+    def __init__(self, directory: str = INPUT_CACHE_DIR, enabled: bool = True):
+        self.directory = directory
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.load_time = 0.0
+        self.parse_time = 0.0
+    
+    @staticmethod
+    def _fingerprint(filepath: str) -> str:
+        """sha256 of the content of a workbook."""
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _key(self, name: str, filepaths: List[str], params) -> str:
+        key_data = [INPUT_CACHE_VERSION, name, [self._fingerprint(path) for path in filepaths], params]
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def _entry_path(self, name: str, key: str) -> str:
+        return os.path.join(self.directory, f"{name}-{key[:16]}.pkl")
+    
+    def _load(self, path: str, key: str):
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"  ⚠ Ignoring unreadable input cache entry {path}: {e}")
+            return None
+        return entry if entry.get('key') == key else None
+    
+    def _store(self, name: str, path: str, key: str, value, log: str):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump({'key': key, 'value': value, 'log': log}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            # Only the latest entry of each input kind is kept
+            for filename in os.listdir(self.directory):
+                stale = os.path.join(self.directory, filename)
+                if filename.startswith(f"{name}-") and filename.endswith(".pkl") and stale != path:
+                    os.remove(stale)
+        except OSError as e:
+            print(f"  ⚠ Could not write the input cache entry {path}: {e}")
+    
+    def load_or_parse(self, name: str, filepaths: List[str], params, parse):
+        """Cached value of parse() for these workbooks and parameters.
+        
+        parse must return picklable plain data; its stdout is shown as usual
+        on a miss and replayed on a hit.
+        """
+        if not self.enabled:
+            return parse()
+        
+        start = time.perf_counter()
+        key = self._key(name, filepaths, params)
+        path = self._entry_path(name, key)
+        entry = self._load(path, key)
+        if entry is not None:
+            sys.stdout.write(entry['log'])
+            elapsed = time.perf_counter() - start
+            self.hits += 1
+            self.load_time += elapsed
+            print(f"  ⚡ Loaded from the input cache in {elapsed * 1000:.0f} ms ({path})")
+            return entry['value']
+        
+        log = io.StringIO()
+        with contextlib.redirect_stdout(_TeeWriter(sys.stdout, log)):
+            value = parse()
+        self._store(name, path, key, value, log.getvalue())
+        self.misses += 1
+        self.parse_time += time.perf_counter() - start
+        return value
+    
+    def summary(self) -> str:
+        if not self.enabled:
+            return "Input cache: disabled"
+        return (f"Input cache: {self.hits} hit(s) ({self.load_time * 1000:.0f} ms), "
+                f"{self.misses} miss(es) ({self.parse_time * 1000:.0f} ms parsing) in {self.directory}/")
+
+
+def load_teachers(filepath: str, cache: Optional[InputCache] = None) -> Dict:
+    """parse_teachers through the cache (parsed directly without one)."""
+    if cache is None:
+        return parse_teachers(filepath)
+    return cache.load_or_parse("teachers", [filepath], None, lambda: parse_teachers(filepath))
+
+
+def load_exams(filepath: str, cache: Optional[InputCache] = None) -> Dict:
+    """parse_exams through the cache (parsed directly without one)."""
+    if cache is None:
+        return parse_exams(filepath)
+    return cache.load_or_parse("exams", [filepath], None, lambda: parse_exams(filepath))
@@ -3,8 +3,9 @@ Exam Invigilation Scheduling System - Slot-Based Assignment
 ============================================================
 
 Features:
-- Simplified slot-based assignment (not room-specific)
-- Teachers assigned to TIME SLOTS, not individual exam rooms
+- Slot-based assignment: the model assigns teachers to TIME SLOTS
+- Rooms filled afterwards, slot by slot (room_assignment.py): 2 invigilators
+  per exam room, responsible teachers in their own exam's room
 - Imports data from 3 Excel files:
   1. Enseignants avec code ensiegant responsable.xlsx - Teacher list with grades and details
   2. Souhaits Enseignants.xlsx - Teacher unavailability preferences (matched by name)
@@ -30,18 +31,51 @@ Author: Claude
 Date: 2025-10-18
 """
 
-from ortools.sat.python import cp_model
-from dataclasses import dataclass, field
-from typing import List, Dict, Set, Tuple, Optional
-import pandas as pd
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, List, Dict, Set, Tuple, Optional
 from collections import defaultdict
 from datetime import datetime
 import math
+import os
+import re
 import sys
 import io
+import json
+import time
+import random
+import signal
+import threading
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from feasibility import check_feasibility
+from room_assignment import RESERVE_ROOM, ROOM_INVIGILATORS, RoomAssignment, assign_rooms
+from startup import LazyModule, PROFILE_STARTUP_FLAG, profile_startup
+import input_model
+from input_model import INPUT_CACHE_DIR, InputCache, load_exams, load_teachers
+
+# pandas and OR-Tools are only imported when first used: --help, argument
+# errors and the greedy engine no longer pay for CP-SAT at start-up.
+if TYPE_CHECKING:  # real imports, also seen by PyInstaller's analysis
+    import numpy as np
+    import pandas as pd
+    from ortools.sat.python import cp_model
+else:
+    np = LazyModule("numpy")
+    pd = LazyModule("pandas")
+    cp_model = LazyModule("ortools.sat.python.cp_model")
+
+# Modules timed by --profile-startup in the PyInstaller executable
+HEAVY_MODULES = ("pandas", "openpyxl", "ortools.sat.python.cp_model", "ortools.graph.python.max_flow",
+                 "ortools.graph.python.linear_sum_assignment")
 
-# Force stdout to use UTF-8
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+# Force stdout to use UTF-8 (in place: re-wrapping sys.stdout.buffer would close
+# the stream of an importer that already wrapped it, e.g. worker.py)
+if hasattr(sys.stdout, 'reconfigure'):
+    sys.stdout.reconfigure(encoding='utf-8')
 
 # ============================================================================
 # CONSTANTS
@@ -55,6 +89,63 @@ TIME_SLOTS = {
     4: {"name": "S4", "start": "14:30", "end": "16:00", "hours": 1.5}
 }
 
+# Default grade-based hours (overridable with --grade-hours)
+DEFAULT_GRADE_HOURS = {
+    "PR": 6.0,   # Professeur
+    "MA": 10.5,   # Maître Assistant  
+    "MC": 6.0,   # Maître de Conférences
+    "AC": 13.5,    # Assistant Contractuel
+    "AS": 12.0,    # Assistant
+    "PTC": 13.5,   # PTC
+    "PES": 13.5,   # PES
+    "V": 6.0,     # Vacataire
+    "EX": 4.5     # External
+}
+
+# Upper bound on teachers per slot: min (exams × 2) + this many
+MAX_EXTRA_TEACHERS = 20
+
+# Soft-constraint weights (priority 0 → 3)
+RESPONSIBLE_WEIGHT = 200
+BUFFER_WEIGHT = 150
+TIME_GAP_WEIGHT = 100
+DAY_GAP_WEIGHT = 50
+
+# Objective terms in priority order (used by the staged / lexicographic solve)
+OBJECTIVE_PRIORITIES = ("hours_deviation", "responsible", "buffer", "time_gaps", "day_gaps")
+
+# Soft exact-hours mode: penalty per tenth of an hour away from the target
+# (one 1.5h slot = 15 tenths = 300, above every other priority)
+HOURS_DEVIATION_WEIGHT = 20
+
+# Gap penalty formulations:
+# - "reified": has_gap <=> (works_s1 AND NOT works_s2), workday = max(slots)
+# - "linear":  has_gap >= works_s1 - works_s2 and workday bounded by two linear
+#              inequalities; equivalent under minimization, far fewer enforced constraints
+GAP_FORMULATIONS = ("reified", "linear")
+
+# Decomposed solve: subproblems are solved per day or per calendar week
+DECOMPOSITION_SPLITS = ("day", "week")
+
+# Decomposed solve: share of the time limit given to each master (hours allocation) solve
+MASTER_TIME_SHARE = 0.1
+
+# Decomposed solve: master/subproblem rounds before giving up on a block
+MAX_COORDINATION_ROUNDS = 3
+
+# Decomposed solve: master penalty per teacher whose hours in an already solved block change
+REALLOCATION_WEIGHT = 1000
+
+# Greedy engine: default local search budget (seconds) and penalty per tenth of an hour of hard violation
+GREEDY_TIME_LIMIT = 1.0
+GREEDY_VIOLATION_WEIGHT = 10000
+
+# Instrumentation report written next to schedule_solution.xlsx
+SOLVE_REPORT_FILE = "solve_report.json"
+
+# CP-SAT log line that ends the presolve (the report takes the presolve time from it)
+SEARCH_START_LOG = re.compile(r"Starting search at ([0-9.]+)s")
+
 
 # ============================================================================
 # DATA STRUCTURES
@@ -94,6 +185,8 @@ class TimeSlotInfo:
     num_exams: int
     exam_ids: List[str]
     responsible_teachers: Set[str]  # Teachers responsible for exams in this slot
+    exam_rooms: List[str] = field(default_factory=list)  # Room (cod_salle) of each exam, as exam_ids
+    exam_responsibles: List[str] = field(default_factory=list)  # Responsible teacher of each exam, as exam_ids
     
     def get_time_key(self) -> Tuple[int, int]:
         return (self.day, self.slot)
@@ -126,6 +219,116 @@ class TimeSlotInfo:
         return f"Day {self.day}, {slot_info['name']} ({slot_info['start']}-{slot_info['end']}): {self.num_exams} exams"
 
 
+@dataclass
+class ProblemMatrix:
+    """Teachers × time slots in array form, built once per scheduler.
+
+    Row i is teacher teacher_ids[i], column j time slot slot_keys[j] (in the
+    order given to the scheduler). available[i, j] stands for
+    Teacher.is_available in the model builder's loops; hours are in tenths,
+    as in the model.
+    """
+    teacher_ids: List[str]
+    slot_keys: List[Tuple[int, int]]
+    teacher_index: Dict[str, int]
+    slot_index: Dict[Tuple[int, int], int]
+    available: np.ndarray        # bool (teachers × slots)
+    required_tenths: np.ndarray  # int (teachers): Teacher.required_hours
+    slot_tenths: np.ndarray      # int (slots): slot duration
+    slot_min: np.ndarray         # int (slots): TimeSlotInfo.get_min_teachers()
+    slot_target: np.ndarray      # int (slots): TimeSlotInfo.get_target_teachers()
+    days: List[int]                     # distinct days, sorted
+    day_columns: Dict[int, np.ndarray]  # day -> columns of its slots, by slot number
+    slot_teachers: List[np.ndarray]     # column -> rows of the teachers available for the slot
+
+    @classmethod
+    def build(cls, teachers: List[Teacher], time_slots: List[TimeSlotInfo]) -> ProblemMatrix:
+        teacher_ids = [t.id for t in teachers]
+        slot_keys = [ts.get_time_key() for ts in time_slots]
+        slot_index = {key: j for j, key in enumerate(slot_keys)}
+        slot_days = np.array([ts.day for ts in time_slots], dtype=np.int64)
+
+        # Only the unavailable pairs are visited (a few per teacher)
+        available = np.ones((len(teachers), len(time_slots)), dtype=bool)
+        for i, teacher in enumerate(teachers):
+            blocked = [slot_index[key] for key in teacher.unavailable_slots if key in slot_index]
+            available[i, blocked] = False
+            if teacher.unavailable_days:
+                available[i, np.isin(slot_days, list(teacher.unavailable_days))] = False
+
+        days = sorted(set(slot_days.tolist()))
+        slot_numbers = np.array([ts.slot for ts in time_slots], dtype=np.int64)
+        day_columns = {}
+        for day in days:
+            columns = np.flatnonzero(slot_days == day)
+            day_columns[day] = columns[np.argsort(slot_numbers[columns], kind='stable')]
+        
+        return cls(
+            teacher_ids=teacher_ids,
+            slot_keys=slot_keys,
+            teacher_index={t_id: i for i, t_id in enumerate(teacher_ids)},
+            slot_index=slot_index,
+            available=available,
+            required_tenths=np.array([int(t.required_hours * 10) for t in teachers], dtype=np.int64),
+            slot_tenths=np.array([int(ts.get_hours() * 10) for ts in time_slots], dtype=np.int64),
+            slot_min=np.array([ts.get_min_teachers() for ts in time_slots], dtype=np.int64),
+            slot_target=np.array([ts.get_target_teachers() for ts in time_slots], dtype=np.int64),
+            days=days,
+            day_columns=day_columns,
+            slot_teachers=[np.flatnonzero(available[:, j]) for j in range(len(time_slots))],
+        )
+
+    def is_available(self, teacher_id: str, key: Tuple[int, int]) -> bool:
+        return bool(self.available[self.teacher_index[teacher_id], self.slot_index[key]])
+
+    def available_slot_keys(self, i: int) -> List[Tuple[int, int]]:
+        """Keys of the slots teacher i can work, in slot order."""
+        return [self.slot_keys[j] for j in np.flatnonzero(self.available[i])]
+
+
+@dataclass
+class SolverProfile:
+    """CP-SAT search parameters. Fields left to None keep the CP-SAT default."""
+    time_limit: float = 30
+    num_workers: Optional[int] = None  # 0 = use all cores
+    random_seed: Optional[int] = None
+    relative_gap_limit: Optional[float] = None  # stop when (objective - bound) / objective <= gap
+    linearization_level: Optional[int] = None  # 0, 1 or 2
+    presolve: Optional[bool] = None
+    log_search_progress: bool = False
+    
+    def apply(self, parameters):
+        """Copy this profile onto a CpSolver.parameters object."""
+        parameters.max_time_in_seconds = self.time_limit
+        if self.num_workers is not None:
+            parameters.num_workers = self.num_workers
+        if self.random_seed is not None:
+            parameters.random_seed = self.random_seed
+        if self.relative_gap_limit is not None:
+            parameters.relative_gap_limit = self.relative_gap_limit
+        if self.linearization_level is not None:
+            parameters.linearization_level = self.linearization_level
+        if self.presolve is not None:
+            parameters.cp_model_presolve = self.presolve
+        parameters.log_search_progress = self.log_search_progress
+    
+    def __str__(self):
+        workers = "all cores" if not self.num_workers else f"{self.num_workers} workers"
+        gap = f"{self.relative_gap_limit:.1%}" if self.relative_gap_limit is not None else "default"
+        return f"time limit {self.time_limit}s, {workers}, gap {gap}"
+
+
+# Solver presets: trade solution quality for latency
+SOLVER_PRESETS = {
+    "fast": SolverProfile(time_limit=10, num_workers=min(8, os.cpu_count() or 1),
+                          relative_gap_limit=0.05, linearization_level=0),
+    "balanced": SolverProfile(time_limit=30, num_workers=0,
+                              relative_gap_limit=0.01, linearization_level=1),
+    "thorough": SolverProfile(time_limit=120, num_workers=0,
+                              relative_gap_limit=0.0, linearization_level=2),
+}
+
+
 # ============================================================================
 # DATA IMPORT
 # ============================================================================
@@ -133,31 +336,11 @@ class TimeSlotInfo:
 class DataImporter:
     """Import exam and teacher data from Excel files."""
     
-    @staticmethod
-    def parse_time_slot(h_debut_str) -> int:
-        """Parse time string to slot number (1-4)."""
-        try:
-            if isinstance(h_debut_str, datetime):
-                hour = h_debut_str.hour
-                minute = h_debut_str.minute
-            else:
-                time_part = str(h_debut_str).split()[-1]
-                hour, minute = map(int, time_part.split(':')[:2])
-            
-            if hour == 8 and minute == 30:
-                return 1
-            elif hour == 10 and minute == 30:
-                return 2
-            elif hour == 12 and minute == 30:
-                return 3
-            elif hour == 14 and minute == 30:
-                return 4
-            else:
-                print(f"Warning: Unknown time {hour}:{minute}, defaulting to slot 1")
-                return 1
-        except:
-            print(f"Warning: Could not parse time {h_debut_str}, defaulting to slot 1")
-            return 1
+    # Cell parsing shared with analyze_surveillance.py (input_model)
+    read_excel = staticmethod(input_model.read_excel)
+    parse_time_slot = staticmethod(input_model.parse_time_slot)
+    parse_exam_date = staticmethod(input_model.parse_exam_date)
+    int_column = staticmethod(input_model.int_column)
     
     @staticmethod
     def parse_seance_to_slot(seance: str) -> int:
@@ -176,56 +359,28 @@ class DataImporter:
             return 1
     
     @staticmethod
-    def import_teachers(filepath: str, grade_hours: Dict[str, float]) -> List[Teacher]:
-        """Import teachers from Enseignants avec code ensiegant responsable.xlsx"""
-        df = pd.read_excel(filepath)
-        
-        # Only keep teachers who participate in surveillance
-        df = df[df['participe_surveillance'].astype(str).str.strip().str.upper() == 'TRUE']
-        
-        # Find maximum existing ID to generate new ones for missing IDs
-        max_id = 0
-        for idx, row in df.iterrows():
-            try:
-                if pd.notna(row['code_smartex_ens']) and row['code_smartex_ens'] != '':
-                    current_id = int(row['code_smartex_ens'])
-                    max_id = max(max_id, current_id)
-            except (ValueError, TypeError):
-                continue
-        
-        print(f"  - Maximum existing teacher ID: {max_id}")
+    def _print_row_warnings(warnings: List[Tuple[int, int, str]]):
+        """Print (row, order, message) warnings in row order, as a row-by-row import would."""
+        for _, _, message in sorted(warnings):
+            print(message)
+    
+    @staticmethod
+    def import_teachers(filepath: str, grade_hours: Dict[str, float],
+                        model: Optional[Dict] = None) -> List[Teacher]:
+        """Import teachers from Enseignants avec code ensiegant responsable.xlsx
         
-        # Track generated IDs
-        next_id = max_id + 1
-        generated_ids = 0
+        model is the parsed workbook (input_model.load_teachers); it is
+        parsed here when not given.
+        """
+        if model is None:
+            model = input_model.parse_teachers(filepath)
+        max_id = model['max_id']
+        generated_ids = model['generated_ids']
         
-        teachers = []
-        for idx, row in df.iterrows():
-            try:
-                grade = str(row['grade_code_ens']).strip().upper()
-                
-                # Handle missing or empty code_smartex_ens
-                if pd.isna(row['code_smartex_ens']) or row['code_smartex_ens'] == '':
-                    teacher_id = str(next_id).zfill(3)
-                    next_id += 1
-                    generated_ids += 1
-                else:
-                    teacher_id = str(int(row['code_smartex_ens'])).zfill(3)
-                
-                # Get required hours for this grade
-                required_hours = grade_hours.get(grade, 9.0)
-                
-                teacher = Teacher(
-                    id=teacher_id,
-                    grade=grade,
-                    required_hours=required_hours,
-                    first_name=str(row['prenom_ens']).strip(),
-                    last_name=str(row['nom_ens']).strip(),
-                    email=str(row['email_ens']).strip()
-                )
-                teachers.append(teacher)
-            except (ValueError, TypeError) as e:
-                continue
+        teachers = [
+            Teacher(required_hours=grade_hours.get(data['grade'], 9.0), **data)
+            for data in model['teachers']
+        ]
         
         print(f"✓ Imported {len(teachers)} teachers from {filepath}")
         if generated_ids > 0:
@@ -242,41 +397,47 @@ class DataImporter:
         
         return teachers
     
+    @staticmethod
+    def build_name_to_id(teacher_details_df: pd.DataFrame) -> Dict[str, str]:
+        """Map "first last" and "f.last" (lower case) to the zero-padded teacher ID.
+        
+        Rows without an integer code are ignored; when two rows give the same
+        name, the later one wins.
+        """
+        codes = teacher_details_df['code_smartex_ens']
+        int_codes = DataImporter.int_column(codes)
+        valid = codes.notna() & (codes != '') & int_codes.notna()
+        
+        teacher_ids = int_codes[valid].astype('int64').astype(str).str.zfill(3)
+        first_names = teacher_details_df.loc[valid, 'prenom_ens'].astype(str).str.strip().str.lower()
+        last_names = teacher_details_df.loc[valid, 'nom_ens'].astype(str).str.strip().str.lower()
+        full_names = first_names + ' ' + last_names
+        initial_names = (first_names.str[0] + '.' + last_names).where(first_names != '')
+        
+        # Interleave full / initial name per row so later rows overwrite earlier ones
+        names = np.empty(2 * len(teacher_ids), dtype=object)
+        names[0::2] = full_names.to_numpy()
+        names[1::2] = initial_names.to_numpy()
+        return {name: teacher_id for name, teacher_id in zip(names, np.repeat(teacher_ids.to_numpy(), 2))
+                if isinstance(name, str)}
+    
     @staticmethod
     def import_unavailability(filepath: str, teachers: List[Teacher], 
-                            teacher_details_filepath: str) -> None:
+                            teacher_details_filepath: str) -> Dict[str, Set[Tuple[int, int]]]:
         """Import teacher unavailability from Souhaits Enseignants.xlsx by matching names
         
+        Fills Teacher.unavailable_slots in place and returns the unavailable
+        (day, slot) pairs per teacher id (what InputCache stores).
+        
         Expected format:
         - Column 'Enseignant': Teacher name (e.g., "N.BEN HARIZ")
         - Column 'Jour': Day name (Lundi, Mardi, Mercredi, Jeudi, Vendredi, Samedi, Dimanche)
         - Column 'Séances': Comma-separated sessions (e.g., "S1,S2,S3,S4")
         """
-        df = pd.read_excel(filepath)
+        df = DataImporter.read_excel(filepath)
         
-        # Load teacher details to create name-to-id mapping
-        teacher_details_df = pd.read_excel(teacher_details_filepath)
-        teacher_details_df = teacher_details_df.dropna(subset=['code_smartex_ens'])
-        teacher_details_df = teacher_details_df[teacher_details_df['code_smartex_ens'] != '']
-        
-        # Create name-to-id mapping (case-insensitive, handle various formats)
-        name_to_id = {}
-        for idx, row in teacher_details_df.iterrows():
-            try:
-                teacher_id = str(int(row['code_smartex_ens'])).zfill(3)
-                first_name = str(row['prenom_ens']).strip().lower()
-                last_name = str(row['nom_ens']).strip().lower()
-                
-                # Store multiple formats
-                full_name = f"{first_name} {last_name}"
-                name_to_id[full_name] = teacher_id
-                
-                # Also store with first initial
-                if first_name:
-                    initial_format = f"{first_name[0]}.{last_name}"
-                    name_to_id[initial_format] = teacher_id
-            except (ValueError, TypeError):
-                continue
+        # Load teacher details to create name-to-id mapping (case-insensitive)
+        name_to_id = DataImporter.build_name_to_id(DataImporter.read_excel(teacher_details_filepath))
         
         # Day name to number mapping (French)
         day_mapping = {
@@ -290,46 +451,50 @@ class DataImporter:
         }
         
         teacher_dict = {t.id: t for t in teachers}
-        constraints_added = 0
-        unmatched_teachers = set()
-        
-        for idx, row in df.iterrows():
-            try:
-                # Get teacher name (can be in format "N.BEN HARIZ" or "First Last")
-                teacher_name = str(row['Enseignant']).strip().lower()
-                
-                # Get day name and convert to number
-                day_name = str(row['Jour']).strip().lower()
-                if day_name not in day_mapping:
-                    print(f"Warning: Unknown day name '{day_name}', skipping")
-                    continue
-                day = day_mapping[day_name]
-                
-                # Get sessions (can be "S1,S2,S3,S4" or "S1,S2" etc.)
-                seances_str = str(row['Séances']).strip()
-                seances = [s.strip().upper() for s in seances_str.split(',')]
-                
-                # Find teacher ID by name
-                teacher_id = name_to_id.get(teacher_name)
-                
-                if teacher_id is None:
-                    unmatched_teachers.add(teacher_name)
-                    continue
-                
-                if teacher_id not in teacher_dict:
-                    continue
-                
-                teacher = teacher_dict[teacher_id]
-                
-                # Add unavailability for each session
-                for seance in seances:
-                    slot = DataImporter.parse_seance_to_slot(seance)
-                    teacher.unavailable_slots.add((day, slot))
-                    constraints_added += 1
-                    
-            except (ValueError, TypeError, KeyError) as e:
-                print(f"Warning: Error processing row {idx}: {e}")
-                continue
+        warnings = []  # (row, order, message), printed in row order
+        
+        columns = ['Enseignant', 'Jour', 'Séances']
+        missing_columns = [column for column in columns if column not in df.columns]
+        if missing_columns:
+            print(f"Warning: Column(s) {', '.join(missing_columns)} missing from {filepath}, "
+                  f"no unavailability imported")
+            df = df.iloc[0:0].reindex(columns=columns)
+        
+        # Teacher name (can be in format "N.BEN HARIZ" or "First Last") and day number
+        teacher_names = df['Enseignant'].astype(str).str.strip().str.lower()
+        day_names = df['Jour'].astype(str).str.strip().str.lower()
+        days = day_names.map(day_mapping)
+        known_day = days.notna().to_numpy()
+        for position in np.flatnonzero(~known_day):
+            warnings.append((position, 0, f"Warning: Unknown day name '{day_names.iloc[position]}', skipping"))
+        
+        teacher_ids = teacher_names.map(name_to_id)
+        matched = known_day & teacher_ids.notna().to_numpy()
+        unmatched_teachers = set(teacher_names[known_day & ~matched])
+        in_teachers = matched & teacher_ids.isin(list(teacher_dict)).to_numpy()
+        
+        # One row per (wish row, session) of the known teachers
+        sessions = pd.DataFrame({
+            'position': np.arange(len(df)),
+            'teacher_id': teacher_ids,
+            'day': days,
+            'seance': df['Séances'].astype(str).str.strip().str.split(','),
+        })[in_teachers].explode('seance')
+        seances = sessions['seance'].str.strip().str.upper()
+        sessions['slot'] = seances.map({'S1': 1, 'S2': 2, 'S3': 3, 'S4': 4})
+        unknown = sessions['slot'].isna().to_numpy()
+        for order, (position, seance) in enumerate(zip(sessions['position'][unknown], seances[unknown])):
+            warnings.append((position, 1 + order, f"Warning: Unknown seance {seance}, defaulting to slot 1"))
+        sessions['slot'] = sessions['slot'].fillna(1).astype(int)
+        
+        DataImporter._print_row_warnings(warnings)
+        
+        unavailability = {}
+        for teacher_id, day, slot in zip(sessions['teacher_id'], sessions['day'].astype(int), sessions['slot']):
+            unavailability.setdefault(teacher_id, set()).add((int(day), int(slot)))
+        for teacher_id, slots in unavailability.items():
+            teacher_dict[teacher_id].unavailable_slots.update(slots)
+        constraints_added = len(sessions)
         
         num_constrained = sum(1 for t in teachers if t.unavailable_slots or t.unavailable_days)
         
@@ -338,54 +503,20 @@ class DataImporter:
         if unmatched_teachers:
             print(f"  - Unmatched teachers: {len(unmatched_teachers)} (not in participating teachers list)")
             print(f"    Examples: {', '.join(list(unmatched_teachers)[:5])}")
+        
+        return {t.id: set(t.unavailable_slots) for t in teachers if t.unavailable_slots}
     
     @staticmethod
-    def import_exams_as_slots(filepath: str) -> List[TimeSlotInfo]:
-        """Import exams and group them by time slots."""
-        df = pd.read_excel(filepath)
-        
-        # Remove duplicate rows
-        df = df.drop_duplicates()
-        
-        # Convert dates and assign day numbers
-        df['dateExam'] = pd.to_datetime(df['dateExam'], format='%d/%m/%Y')
-        unique_dates = sorted(df['dateExam'].unique())
-        date_to_day = {date: idx + 1 for idx, date in enumerate(unique_dates)}
-        
-        # Group exams by time slot
-        slot_data = defaultdict(lambda: {
-            'exam_ids': [],
-            'responsible_teachers': set(),
-            'date': None
-        })
+    def import_exams_as_slots(filepath: str, model: Optional[Dict] = None) -> List[TimeSlotInfo]:
+        """Import exams and group them by time slots.
         
-        for idx, row in df.iterrows():
-            try:
-                date_str = row['dateExam'].strftime('%Y-%m-%d')
-                slot = DataImporter.parse_time_slot(row['h_debut'])
-                day_number = date_to_day[row['dateExam']]
-                teacher_id = str(int(row['enseignant'])).zfill(3)
-                exam_id = f"E{idx+1:03d}"
-                
-                key = (day_number, slot)
-                slot_data[key]['exam_ids'].append(exam_id)
-                slot_data[key]['responsible_teachers'].add(teacher_id)
-                slot_data[key]['date'] = date_str
-            except (ValueError, TypeError, KeyError) as e:
-                continue
-        
-        # Create TimeSlotInfo objects
-        time_slots = []
-        for (day, slot), data in sorted(slot_data.items()):
-            time_slot_info = TimeSlotInfo(
-                day=day,
-                slot=slot,
-                date=data['date'],
-                num_exams=len(data['exam_ids']),
-                exam_ids=data['exam_ids'],
-                responsible_teachers=data['responsible_teachers']
-            )
-            time_slots.append(time_slot_info)
+        model is the parsed repartition (input_model.load_exams); it is
+        parsed here when not given.
+        """
+        if model is None:
+            model = input_model.parse_exams(filepath)
+        unique_dates = [datetime.strptime(date, '%Y-%m-%d') for date in model['dates']]
+        time_slots = [TimeSlotInfo(**data) for data in model['time_slots']]
         
         print(f"✓ Imported and grouped exams into {len(time_slots)} time slots")
         print(f"  - Total exams: {sum(ts.num_exams for ts in time_slots)}")
@@ -399,61 +530,375 @@ class DataImporter:
                   f"{ts.get_target_teachers()} teachers needed")
         
         return time_slots
+    
+    @staticmethod
+    def import_previous_solution(filepath: str, time_slots: List[TimeSlotInfo]) -> Set[Tuple[str, Tuple[int, int]]]:
+        """Import (teacher_id, (day, slot)) assignments from a previous export_solution_to_excel file.
+        
+        Rows are matched on Date + Séance (not on the day number, which shifts
+        when exam dates change); rows whose slot no longer exists are dropped.
+        """
+        df = DataImporter.read_excel(filepath)
+        
+        seance_to_slot = {info['name']: slot for slot, info in TIME_SLOTS.items()}
+        date_slot_to_key = {}
+        for ts in time_slots:
+            date_str = datetime.strptime(ts.date, '%Y-%m-%d').strftime('%d/%m/%Y')
+            date_slot_to_key[(date_str, ts.slot)] = ts.get_time_key()
+        
+        assignments = set()
+        dropped = 0
+        for idx, row in df.iterrows():
+            try:
+                teacher_id = str(int(row['Enseignant_ID'])).zfill(3)
+                date_str = str(row['Date']).strip()
+                slot = seance_to_slot.get(str(row['Séance']).strip().upper())
+                key = date_slot_to_key.get((date_str, slot))
+                if key is None:
+                    dropped += 1
+                    continue
+                assignments.add((teacher_id, key))
+            except (ValueError, TypeError, KeyError):
+                dropped += 1
+                continue
+        
+        print(f"✓ Imported {len(assignments)} previous assignments from {filepath}")
+        if dropped:
+            print(f"  - {dropped} rows dropped (time slot no longer exists or invalid row)")
+        
+        return assignments
+    
+    @staticmethod
+    def import_checkpoint(filepath: str, time_slots: List[TimeSlotInfo]) -> Set[Tuple[str, Tuple[int, int]]]:
+        """Import (teacher_id, (day, slot)) assignments from a solver checkpoint (see write_checkpoint).
+        
+        Assignments are matched on date + slot; those whose slot no longer exists are dropped.
+        """
+        with open(filepath, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        
+        date_slot_to_key = {(ts.date, ts.slot): ts.get_time_key() for ts in time_slots}
+        assignments = set()
+        dropped = 0
+        for teacher_id, date, slot in checkpoint.get('assignments', []):
+            key = date_slot_to_key.get((date, slot))
+            if key is None:
+                dropped += 1
+                continue
+            assignments.add((teacher_id, key))
+        
+        print(f"✓ Imported {len(assignments)} assignments from checkpoint {filepath} "
+              f"(status {checkpoint.get('status')}, objective {checkpoint.get('objective')}, "
+              f"saved {checkpoint.get('saved_at')})")
+        if dropped:
+            print(f"  - {dropped} assignments dropped (time slot no longer exists)")
+        
+        return assignments
 
 
 # ============================================================================
 # SCHEDULER
 # ============================================================================
 
+class SearchCanceller:
+    """Stop the running CP-SAT search cleanly on request.
+    
+    A cancel request is a "stop" line on stdin, or SIGINT / SIGTERM (SIGBREAK
+    on Windows). The attached solver is stopped with StopSearch(), so the
+    solve returns the best solution found so far instead of losing it. A
+    second signal exits immediately.
+    """
+    
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self._solver = None
+        self._lock = threading.Lock()
+    
+    def install(self, listen_stdin: bool = True):
+        """Register the signal handlers and start the stdin listener thread."""
+        for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), self._on_signal)
+        if listen_stdin:
+            threading.Thread(target=self._read_stdin, daemon=True).start()
+    
+    def _read_stdin(self):
+        for line in sys.stdin:
+            if line.strip().lower() == "stop":
+                self.cancel()
+                return
+    
+    def _on_signal(self, signum, frame):
+        if self.cancelled.is_set():
+            sys.exit(130)
+        self.cancel()
+    
+    def cancel(self):
+        with self._lock:
+            if self.cancelled.is_set():
+                return
+            self.cancelled.set()
+            if self._solver is not None:
+                self._solver.StopSearch()
+        print("\n⚠ Cancel requested - stopping the search, the best solution so far (if any) is kept", flush=True)
+    
+    def attach(self, solver: cp_model.CpSolver):
+        """Make solver the one stopped by a cancel request (call before Solve)."""
+        with self._lock:
+            self._solver = solver
+            if self.cancelled.is_set():
+                solver.parameters.max_time_in_seconds = 0
+    
+    def detach(self):
+        with self._lock:
+            self._solver = None
+
+
+class SolutionObserver:
+    """Called by CP-SAT on every improving solution (through solution_callback()).
+    
+    - stream: write the solution as one JSON line on stdout (--stream).
+      Format: {"type": "solution", "index", "objective", "bound", "elapsed",
+      "added", "removed"[, "stage"]}, where added/removed are [teacher_id,
+      day, slot] triples relative to the previous solution (the first line
+      lists every assignment). finish() writes a last {"type": "done"} line.
+      Other stdout lines are the usual banners and never start with '{'.
+    - checkpoint_path: rewrite a JSON checkpoint with the best solution so
+      far (see write_checkpoint), so even a killed run leaves it behind.
+    - canceller: stop the search from the callback if a cancel request
+      arrived before the solver could be stopped directly.
+    
+    elapsed counts from the creation of the observer, so it keeps growing
+    across the stages of a staged solve. solution_count is kept in every
+    case, for the instrumentation report.
+    
+    This is not a CpSolverSolutionCallback subclass itself so that defining
+    it does not import OR-Tools (see solution_callback).
+    """
+    
+    def __init__(self, assignments: Dict[Tuple[str, Tuple[int, int]], cp_model.IntVar],
+                 time_slot_dict: Dict[Tuple[int, int], TimeSlotInfo], stream: bool = False,
+                 checkpoint_path: Optional[str] = None, canceller: Optional[SearchCanceller] = None):
+        self.assignments = assignments
+        self.time_slot_dict = time_slot_dict
+        self.stream = stream
+        self.checkpoint_path = checkpoint_path
+        self.canceller = canceller
+        self.stage = None  # Set by solve_lexicographic
+        self.current = set()
+        self.objective = None
+        self.bound = None
+        self.solution_count = 0
+        self.first_solution_time = None  # Solver wall time of the first solution (reset per solve by the scheduler)
+        self.start = time.perf_counter()
+    
+    def _elapsed(self) -> float:
+        return round(time.perf_counter() - self.start, 3)
+    
+    def solution_callback(self) -> cp_model.CpSolverSolutionCallback:
+        """CP-SAT callback forwarding each solution to on_solution (pass it to Solve)."""
+        observer = self
+        
+        class Callback(cp_model.CpSolverSolutionCallback):
+            def on_solution_callback(self):
+                observer.on_solution(self)
+        
+        return Callback()
+    
+    def on_solution(self, callback: cp_model.CpSolverSolutionCallback):
+        if self.stream or self.checkpoint_path:
+            current = {key for key, var in self.assignments.items() if callback.Value(var)}
+        else:
+            current = self.current  # Only counting: the solution itself is not needed
+        if self.first_solution_time is None:
+            self.first_solution_time = callback.WallTime()
+        self.objective = callback.ObjectiveValue()
+        self.bound = callback.BestObjectiveBound()
+        if self.stream:
+            event = {
+                'type': 'solution',
+                'index': self.solution_count,
+                'objective': self.objective,
+                'bound': self.bound,
+                'elapsed': self._elapsed(),
+                'added': [[t_id, day, slot] for t_id, (day, slot) in sorted(current - self.current)],
+                'removed': [[t_id, day, slot] for t_id, (day, slot) in sorted(self.current - current)],
+            }
+            if self.stage:
+                event['stage'] = self.stage
+            emit_stream_event(event)
+        self.current = current
+        self.solution_count += 1
+        if self.checkpoint_path:
+            self._write_checkpoint("RUNNING")
+        if self.canceller is not None and self.canceller.cancelled.is_set():
+            callback.StopSearch()
+    
+    def _write_checkpoint(self, status_name: str):
+        write_checkpoint(self.checkpoint_path, self.current, self.time_slot_dict, {
+            'status': status_name,
+            'cancelled': self.canceller is not None and self.canceller.cancelled.is_set(),
+            'objective': self.objective,
+            'bound': self.bound,
+            'stage': self.stage,
+            'elapsed': self._elapsed(),
+        })
+    
+    def finish(self, status_name: str):
+        """Final status: last stream line and last checkpoint update."""
+        if self.stream:
+            emit_stream_event({
+                'type': 'done',
+                'status': status_name,
+                'solutions': self.solution_count,
+                'elapsed': self._elapsed(),
+            })
+        if self.checkpoint_path and self.solution_count:
+            self._write_checkpoint(status_name)
+
+
+def emit_stream_event(event: Dict):
+    """Write one JSON line on stdout and flush it so the UI receives it immediately."""
+    print(json.dumps(event, ensure_ascii=False), flush=True)
+
+
+def write_checkpoint(path: str, assignments: Set[Tuple[str, Tuple[int, int]]],
+                     time_slot_dict: Dict[Tuple[int, int], TimeSlotInfo], info: Dict):
+    """Atomically (re)write a solver checkpoint (read back by DataImporter.import_checkpoint).
+    
+    Assignments are stored as [teacher_id, date, slot] so they can be matched
+    on the exam date when the day numbers of a later run differ.
+    """
+    checkpoint = dict(info)
+    checkpoint['saved_at'] = datetime.now().isoformat(timespec='seconds')
+    checkpoint['assignments'] = [[t_id, time_slot_dict[key].date, key[1]] for t_id, key in sorted(assignments)]
+    
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
 class SlotBasedScheduler:
-    """CP-SAT based scheduler with slot-based assignment."""
+    """CP-SAT based scheduler with slot-based assignment.
+    
+    With sparse=True, assignment variables are only created for (teacher, slot)
+    pairs where the teacher is available, so unavailable pairs never reach the
+    model (instead of being created and then forced to 0).
+    
+    gap_formulation selects how the responsible/time-gap/day-gap penalties are
+    modelled (see GAP_FORMULATIONS).
     
-    def __init__(self, teachers: List[Teacher], time_slots: List[TimeSlotInfo]):
+    hours_tolerance > 0 turns the exact-hours HARD constraint into a band of
+    ± hours_tolerance around Teacher.required_hours, with the deviation
+    penalized in the objective (HOURS_DEVIATION_WEIGHT per tenth of an hour).
+    
+    stream=True writes every improving solution of solve() and
+    solve_lexicographic() to stdout as JSON lines; checkpoint_path keeps a
+    checkpoint of the best solution so far; canceller lets a cancel request
+    stop these solves while keeping their best solution (see
+    SolutionObserver and SearchCanceller).
+    """
+    
+    def __init__(self, teachers: List[Teacher], time_slots: List[TimeSlotInfo],
+                 sparse: bool = False, gap_formulation: str = "reified",
+                 hours_tolerance: float = 0.0, stream: bool = False,
+                 checkpoint_path: Optional[str] = None,
+                 canceller: Optional[SearchCanceller] = None):
+        if gap_formulation not in GAP_FORMULATIONS:
+            raise ValueError(f"Unknown gap formulation '{gap_formulation}', "
+                             f"expected one of {GAP_FORMULATIONS}")
+        
         self.teachers = {t.id: t for t in teachers}
         self.time_slots = time_slots
-        
-        self.model = cp_model.CpModel()
+        self.sparse = sparse
+        self.gap_formulation = gap_formulation
+        self.hours_tolerance = hours_tolerance
+        self.stream = stream
+        self.checkpoint_path = checkpoint_path
+        self.canceller = canceller
+        
+        self.model = None  # CpModel, created by build_model() (the greedy engine never needs one)
         self.assignments = {}  # (teacher_id, time_slot_key) -> BoolVar
         self.teacher_hours_vars = {}  # teacher_id -> IntVar
+        self.hours_deviation_vars = {}  # teacher_id -> IntVar (|hours - required| in tenths, soft hours mode)
+        self.objective_terms = {priority: [] for priority in OBJECTIVE_PRIORITIES}
+        self.stage_reports = []  # Filled by solve_lexicographic()
         self.solution = None
+        self.model_built = False
+        self.solution_hint = None  # Set of (teacher_id, time_slot_key) from a previous schedule
+        self.repair_hint = True  # Let CP-SAT repair the hint (off for hints known to be feasible)
+        self.repair_changes = None  # Filled by repair(): added/removed pairs and changed teachers
+        self.status_name = None  # CP-SAT status of the last solve
         
         # Index time slots by key
         self.time_slot_dict = {ts.get_time_key(): ts for ts in time_slots}
         
+        # Availability and requirements as arrays, read by the model builder
+        self.matrix = ProblemMatrix.build(list(self.teachers.values()), time_slots)
+        self.assignment_grid = None  # (teachers × slots) object array of the assignment BoolVars
+        self.assignment_mask = None  # (teachers × slots) bool, True where assignment_grid has a variable
+        self.slot_count_vars = {}  # slot column -> IntVar, teachers assigned (hard bounds and buffer objective)
+        self.build_times = {}  # model-build phase -> seconds, filled by build_model()
+        self.solve_reports = []  # One entry per CP-SAT solve (see _record_solve)
+        self.capture_presolve_time = False  # Read the search log for presolve_time even without --log-search
+        
         print(f"\nScheduler initialized:")
         print(f"  - Teachers: {len(self.teachers)}")
         print(f"  - Time slots: {len(self.time_slots)}")
         print(f"  - Total teacher-slot assignments needed: {sum(ts.get_target_teachers() for ts in time_slots)}")
     
+    def _hours_band(self, teacher: Teacher) -> Tuple[int, int]:
+        """Allowed total hours of a teacher, in tenths: (min, max)."""
+        required_tenths = int(teacher.required_hours * 10)
+        tolerance_tenths = int(round(self.hours_tolerance * 10))
+        return max(0, required_tenths - tolerance_tenths), required_tenths + tolerance_tenths
+    
     def _create_variables(self):
         """Create decision variables."""
         print("\nCreating variables...")
         
-        for teacher_id in self.teachers:
-            for ts in self.time_slots:
-                var_name = f"assign_{teacher_id}_d{ts.day}_s{ts.slot}"
-                self.assignments[(teacher_id, ts.get_time_key())] = self.model.NewBoolVar(var_name)
+        matrix = self.matrix
+        self.assignment_grid = np.full(matrix.available.shape, None, dtype=object)
+        self.assignment_mask = matrix.available if self.sparse else np.ones_like(matrix.available)
+        pairs = np.argwhere(matrix.available) if self.sparse else np.ndindex(*matrix.available.shape)
+        for i, j in pairs:
+            teacher_id, key = matrix.teacher_ids[i], matrix.slot_keys[j]
+            var = self.model.NewBoolVar(f"assign_{teacher_id}_d{key[0]}_s{key[1]}")
+            self.assignments[(teacher_id, key)] = var
+            self.assignment_grid[i, j] = var
         
         print(f"  ✓ {len(self.assignments)} assignment variables")
+        if self.sparse:
+            skipped = int(matrix.available.size - matrix.available.sum())
+            print(f"  ✓ Sparse model: {skipped} unavailable pairs skipped")
+    
+    def _slot_assignments(self, j: int) -> List:
+        """Assignment variables of the teachers available for slot j (teacher order)."""
+        return self.assignment_grid[self.matrix.slot_teachers[j], j].tolist()
     
     def _add_hard_constraints(self):
         """Add mandatory constraints."""
         print("\nAdding hard constraints...")
         
+        matrix = self.matrix
+        
         # 1. Each time slot needs MINIMUM teachers (exams × 2) - HARD
-        for ts in self.time_slots:
-            available_teachers = [self.assignments[(t_id, ts.get_time_key())]
-                                 for t_id in self.teachers
-                                 if self.teachers[t_id].is_available(ts.day, ts.slot)]
+        # The count variable of each slot is reused by the buffer objective
+        self.slot_count_vars = {}
+        for j, (day, slot) in enumerate(matrix.slot_keys):
+            count = self.model.NewIntVar(0, 100, f'slot_count_{day}_{slot}')
+            self.model.Add(count == cp_model.LinearExpr.Sum(self._slot_assignments(j)))
+            self.slot_count_vars[j] = count
             
-            min_teachers = ts.get_min_teachers()
+            min_teachers = int(matrix.slot_min[j])
             
             # HARD: Must have at least minimum (2 per exam)
-            self.model.Add(sum(available_teachers) >= min_teachers)
+            self.model.Add(count >= min_teachers)
             
             # Allow reasonable upper bound (don't over-assign)
-            max_teachers = min_teachers + 20  # Flexible upper bound
-            self.model.Add(sum(available_teachers) <= max_teachers)
+            max_teachers = min_teachers + MAX_EXTRA_TEACHERS  # Flexible upper bound
+            self.model.Add(count <= max_teachers)
         
         print(f"  ✓ Each time slot gets minimum (exams × 2) teachers (HARD)")
         print(f"  ✓ Buffer (1-4 extra) will be soft preference")
@@ -469,8 +914,7 @@ class SlotBasedScheduler:
                     responsible_missing.append(resp_id)
                     continue
                 
-                teacher = self.teachers[resp_id]
-                if not teacher.is_available(ts.day, ts.slot):
+                if not matrix.is_available(resp_id, ts.get_time_key()):
                     responsible_unavailable.append((resp_id, ts.day, ts.slot))
                     continue
                 
@@ -487,74 +931,101 @@ class SlotBasedScheduler:
         self.responsible_preferences = []
         for ts in self.time_slots:
             for resp_id in ts.responsible_teachers:
-                if resp_id in self.teachers and self.teachers[resp_id].is_available(ts.day, ts.slot):
+                if resp_id in self.teachers and matrix.is_available(resp_id, ts.get_time_key()):
                     self.responsible_preferences.append((resp_id, ts.get_time_key()))
 
         
-        # 3. Teachers can't work when unavailable
-        unavailable_count = 0
-        for teacher_id, teacher in self.teachers.items():
-            for ts in self.time_slots:
-                if not teacher.is_available(ts.day, ts.slot):
-                    self.model.Add(self.assignments[(teacher_id, ts.get_time_key())] == 0)
-                    unavailable_count += 1
-        
-        print(f"  ✓ Unavailability constraints applied ({unavailable_count} blocked assignments)")
+        # 3. Teachers can't work when unavailable (sparse model has no variable for these pairs)
+        if self.sparse:
+            print("  ✓ Unavailability handled by sparse variables (no blocking constraints)")
+        else:
+            unavailable_count = 0
+            for i, j in np.argwhere(~matrix.available):
+                self.model.Add(self.assignment_grid[i, j] == 0)
+                unavailable_count += 1
+            
+            print(f"  ✓ Unavailability constraints applied ({unavailable_count} blocked assignments)")
         
         # 4. HARD CONSTRAINT: Teachers must meet their target hours exactly
-        for teacher_id, teacher in self.teachers.items():
-            hours_expr = []
-            for ts in self.time_slots:
-                hours_int = int(ts.get_hours() * 10)
-                hours_expr.append(self.assignments[(teacher_id, ts.get_time_key())] * hours_int)
+        for i, (teacher_id, teacher) in enumerate(self.teachers.items()):
+            columns = np.flatnonzero(self.assignment_mask[i])
+            hours_expr = cp_model.LinearExpr.WeightedSum(self.assignment_grid[i, columns].tolist(),
+                                                         matrix.slot_tenths[columns].tolist())
             
             total_hours = self.model.NewIntVar(0, 500, f'hours_{teacher_id}')
-            self.model.Add(total_hours == sum(hours_expr))
+            self.model.Add(total_hours == hours_expr)
             self.teacher_hours_vars[teacher_id] = total_hours
             
-            required_tenths = int(teacher.required_hours * 10)
-            self.model.Add(total_hours == required_tenths)
-        
-        print(f"  ✓ All teachers must meet their exact target hours (HARD constraint)")
+            required_tenths = int(matrix.required_tenths[i])
+            if self.hours_tolerance <= 0:
+                self.model.Add(total_hours == required_tenths)
+                continue
+            
+            # Soft hours mode: stay within the band, deviation is penalized in the objective
+            min_tenths, max_tenths = self._hours_band(teacher)
+            self.model.Add(total_hours >= min_tenths)
+            self.model.Add(total_hours <= max_tenths)
+            deviation = self.model.NewIntVar(0, max_tenths - min_tenths, f'hours_dev_{teacher_id}')
+            self.model.AddAbsEquality(deviation, total_hours - required_tenths)
+            self.hours_deviation_vars[teacher_id] = deviation
+        
+        if self.hours_tolerance <= 0:
+            print("  ✓ All teachers must meet their exact target hours (HARD constraint)")
+        else:
+            print(f"  ✓ Teachers must stay within ±{self.hours_tolerance}h of their target hours "
+                  f"(deviation penalized)")
     
     def _add_soft_constraints(self):
         """Add optimization objectives."""
         print("\nSetting optimization objectives...")
         
-        penalties = []
+        penalties = self.objective_terms  # priority -> list of weighted terms
+        linear = self.gap_formulation == "linear"
+        matrix = self.matrix
+        grid = self.assignment_grid
         
         # Get all days
-        all_days = sorted(set(ts.day for ts in self.time_slots))
+        all_days = matrix.days
+        
+        # Soft hours mode: deviation from the target hours comes before every other priority
+        if self.hours_deviation_vars:
+            for deviation in self.hours_deviation_vars.values():
+                penalties['hours_deviation'].append(deviation * HOURS_DEVIATION_WEIGHT)
+            print(f"  ✓ Hours deviation (weight {HOURS_DEVIATION_WEIGHT} per 0.1h) - "
+                  f"{len(self.hours_deviation_vars)} teachers")
         
         # 0. HIGHEST PRIORITY: Prefer responsible teachers work during their exam slots (weight 200)
         resp_penalty = 0
         if hasattr(self, 'responsible_preferences'):
             for resp_id, slot_key in self.responsible_preferences:
+                assigned_var = self.assignments[(resp_id, slot_key)]
+                
+                if linear:
+                    # Penalty is directly (1 - assigned), no auxiliary variable needed
+                    penalties['responsible'].append((1 - assigned_var) * RESPONSIBLE_WEIGHT)
+                    resp_penalty += 1
+                    continue
+                
                 # Penalty if responsible teacher is NOT assigned
                 not_assigned = self.model.NewBoolVar(f'resp_not_{resp_id}_{slot_key}')
-                assigned_var = self.assignments[(resp_id, slot_key)]
                 
                 self.model.Add(assigned_var == 0).OnlyEnforceIf(not_assigned)
                 self.model.Add(assigned_var == 1).OnlyEnforceIf(not_assigned.Not())
                 
-                penalties.append(not_assigned * 200)
+                penalties['responsible'].append(not_assigned * RESPONSIBLE_WEIGHT)
                 resp_penalty += 1
         
         if resp_penalty > 0:
             print(f"  ✓ Priority 0: Prefer responsible teachers (weight 200) - {resp_penalty} preferences")
+        self._lap('responsible')
         
         # 1. PRIORITY 1: Try to reach target with buffer (weight 150)
         buffer_penalty = 0
-        for ts in self.time_slots:
-            available_teachers = [self.assignments[(t_id, ts.get_time_key())]
-                                 for t_id in self.teachers
-                                 if self.teachers[t_id].is_available(ts.day, ts.slot)]
+        for j, ts in enumerate(self.time_slots):
+            # Count of teachers assigned, created with the slot's hard bounds
+            count = self.slot_count_vars[j]
             
-            # Count teachers assigned
-            count = self.model.NewIntVar(0, 100, f'slot_count_{ts.day}_{ts.slot}')
-            self.model.Add(count == sum(available_teachers))
-            
-            target = ts.get_target_teachers()
+            target = int(matrix.slot_target[j])
             
             # Penalty for deviation from target
             deviation = self.model.NewIntVar(-100, 100, f'slot_dev_{ts.day}_{ts.slot}')
@@ -563,72 +1034,116 @@ class SlotBasedScheduler:
             self.model.Add(deviation == count - target)
             self.model.AddAbsEquality(abs_dev, deviation)
             
-            penalties.append(abs_dev * 150)
+            penalties['buffer'].append(abs_dev * BUFFER_WEIGHT)
             buffer_penalty += 1
         
         print(f"  ✓ Priority 1: Try to reach buffer targets (weight 150) - {buffer_penalty} slots")
+        self._lap('buffer')
         
         # 2. PRIORITY 2: Time clustering - Prefer consecutive slots on same day (weight 100)
         time_gap_penalty = 0
-        for teacher_id in self.teachers:
-            for day in all_days:
-                # Get slots that exist for this day
-                day_slots = sorted(set(ts.slot for ts in self.time_slots if ts.day == day))
+        # Consecutive slot pairs of each day, as (day, slot1, column1, column2)
+        slot_pairs = [(day, matrix.slot_keys[j1][1], j1, j2)
+                      for day in all_days
+                      for j1, j2 in zip(matrix.day_columns[day], matrix.day_columns[day][1:])]
+        for i, teacher_id in enumerate(matrix.teacher_ids):
+            for day, slot1, j1, j2 in slot_pairs:
+                works_slot1 = grid[i, j1]
+                works_slot2 = grid[i, j2]
                 
-                for i in range(len(day_slots) - 1):
-                    slot1, slot2 = day_slots[i], day_slots[i+1]
-                    
-                    key1 = (day, slot1)
-                    key2 = (day, slot2)
-                    
-                    if key1 in self.time_slot_dict and key2 in self.time_slot_dict:
-                        works_slot1 = self.assignments[(teacher_id, key1)]
-                        works_slot2 = self.assignments[(teacher_id, key2)]
-                        
-                        # Penalty for gap (works in slot1 but not slot2)
-                        has_gap = self.model.NewBoolVar(f'gap_{teacher_id}_d{day}_s{slot1}')
-                        self.model.AddBoolAnd([works_slot1, works_slot2.Not()]).OnlyEnforceIf(has_gap)
-                        self.model.AddBoolOr([works_slot1.Not(), works_slot2]).OnlyEnforceIf(has_gap.Not())
-                        
-                        penalties.append(has_gap * 100)
-                        time_gap_penalty += 1
+                # Sparse model: no gap possible without slot1, and gap == slot1 without slot2
+                if works_slot1 is None:
+                    continue
+                if works_slot2 is None:
+                    penalties['time_gaps'].append(works_slot1 * TIME_GAP_WEIGHT)
+                    time_gap_penalty += 1
+                    continue
+                
+                # Penalty for gap (works in slot1 but not slot2)
+                has_gap = self.model.NewBoolVar(f'gap_{teacher_id}_d{day}_s{slot1}')
+                if linear:
+                    # Minimization keeps has_gap at 0 unless the inequality forces it to 1
+                    self.model.Add(has_gap >= works_slot1 - works_slot2)
+                else:
+                    self.model.AddBoolAnd([works_slot1, works_slot2.Not()]).OnlyEnforceIf(has_gap)
+                    self.model.AddBoolOr([works_slot1.Not(), works_slot2]).OnlyEnforceIf(has_gap.Not())
+                
+                penalties['time_gaps'].append(has_gap * TIME_GAP_WEIGHT)
+                time_gap_penalty += 1
         
         print(f"  ✓ Priority 2: Time clustering (weight 100) - {time_gap_penalty} potential gaps")
+        self._lap('time gaps')
         
         # 3. PRIORITY 3: Day clustering - Prefer consecutive days (weight 50)
         day_gap_penalty = 0
-        for teacher_id in self.teachers:
-            for i in range(len(all_days) - 1):
-                day1, day2 = all_days[i], all_days[i+1]
-                
+        workday_vars = {}  # (teacher_id, day) -> BoolVar, shared by both adjacent day pairs (linear only)
+        
+        def linear_workday(teacher_id, day, day_assignments):
+            """works_day == 1 iff at least one slot of the day is assigned, as two linear inequalities."""
+            if (teacher_id, day) not in workday_vars:
+                works_day = self.model.NewBoolVar(f'workday_{teacher_id}_d{day}')
+                day_sum = cp_model.LinearExpr.Sum(day_assignments)
+                self.model.Add(day_sum >= works_day)
+                self.model.Add(day_sum <= len(day_assignments) * works_day)
+                workday_vars[(teacher_id, day)] = works_day
+            return workday_vars[(teacher_id, day)]
+        
+        for i, teacher_id in enumerate(matrix.teacher_ids):
+            # Assignment variables of the teacher per day, shared by both adjacent day pairs
+            has_var = self.assignment_mask[i]
+            day_vars = {}
+            for day in all_days:
+                columns = matrix.day_columns[day]
+                day_vars[day] = grid[i, columns[has_var[columns]]].tolist()
+            
+            for day1, day2 in zip(all_days, all_days[1:]):
                 # Check if teacher works on day1
-                slots_day1 = [(day1, ts.slot) for ts in self.time_slots if ts.day == day1]
-                slots_day2 = [(day2, ts.slot) for ts in self.time_slots if ts.day == day2]
+                slots_day1 = day_vars[day1]
+                slots_day2 = day_vars[day2]
                 
-                if slots_day1 and slots_day2:
+                if linear and slots_day1:
+                    works_day1 = linear_workday(teacher_id, day1, slots_day1)
+                    if slots_day2:
+                        works_day2 = linear_workday(teacher_id, day2, slots_day2)
+                        day_gap = self.model.NewBoolVar(f'daygap_{teacher_id}_{day1}_{day2}')
+                        self.model.Add(day_gap >= works_day1 - works_day2)
+                        penalties['day_gaps'].append(day_gap * DAY_GAP_WEIGHT)
+                    else:
+                        penalties['day_gaps'].append(works_day1 * DAY_GAP_WEIGHT)
+                    day_gap_penalty += 1
+                elif slots_day1 and not slots_day2:
+                    # Sparse model: teacher can never work day2, so any work on day1 is a gap
+                    works_day1 = self.model.NewBoolVar(f'workday_{teacher_id}_d{day1}')
+                    self.model.AddMaxEquality(works_day1, slots_day1)
+                    penalties['day_gaps'].append(works_day1 * DAY_GAP_WEIGHT)
+                    day_gap_penalty += 1
+                elif slots_day1 and slots_day2:
                     works_day1 = self.model.NewBoolVar(f'workday_{teacher_id}_d{day1}')
                     works_day2 = self.model.NewBoolVar(f'workday_{teacher_id}_d{day2}')
                     
-                    self.model.AddMaxEquality(works_day1,
-                        [self.assignments[(teacher_id, key)] for key in slots_day1])
-                    self.model.AddMaxEquality(works_day2,
-                        [self.assignments[(teacher_id, key)] for key in slots_day2])
+                    self.model.AddMaxEquality(works_day1, slots_day1)
+                    self.model.AddMaxEquality(works_day2, slots_day2)
                     
                     # Penalty for gap (works day1 but not day2)
                     day_gap = self.model.NewBoolVar(f'daygap_{teacher_id}_{day1}_{day2}')
                     self.model.AddBoolAnd([works_day1, works_day2.Not()]).OnlyEnforceIf(day_gap)
                     self.model.AddBoolOr([works_day1.Not(), works_day2]).OnlyEnforceIf(day_gap.Not())
                     
-                    penalties.append(day_gap * 50)
+                    penalties['day_gaps'].append(day_gap * DAY_GAP_WEIGHT)
                     day_gap_penalty += 1
         
         print(f"  ✓ Priority 3: Day clustering (weight 50) - {day_gap_penalty} potential gaps")
+        if linear:
+            print(f"  ✓ Linear gap formulation ({len(workday_vars)} shared workday variables)")
+        self._lap('day gaps')
         
         # Minimize total penalties
-        if penalties:
+        all_penalties = [term for terms in penalties.values() for term in terms]
+        if all_penalties:
             total_penalty = self.model.NewIntVar(0, 100000000, 'total_penalty')
-            self.model.Add(total_penalty == sum(penalties))
+            self.model.Add(total_penalty == cp_model.LinearExpr.Sum(all_penalties))
             self.model.Minimize(total_penalty)
+        self._lap('objective')
         
         print("\n  Summary of optimization priorities:")
         print("    0. Prefer responsible teachers work their exam slots (weight 200)")
@@ -636,21 +1151,220 @@ class SlotBasedScheduler:
         print("    2. Minimize time gaps within days (weight 100)")
         print("    3. Minimize gaps between days (weight 50)")
     
-    def solve(self, time_limit: int = 180) -> bool:
-        """Solve the scheduling problem."""
-        print("\n" + "="*70)
-        print("SOLVING")
-        print("="*70)
+    def build_model(self):
+        """Create variables, hard constraints and objective (only once)."""
+        if self.model_built:
+            return
         
+        self.build_times = {}
+        self._lap_start = time.perf_counter()
+        self.model = cp_model.CpModel()
         self._create_variables()
+        self._lap('variables')
         self._add_hard_constraints()
+        self._lap('hard constraints')
         self._add_soft_constraints()
+        if self.solution_hint is not None:
+            self._add_solution_hint()
+            self._lap('hint')
+        self.model_built = True
         
-        solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = time_limit
+        print(f"\nModel built in {sum(self.build_times.values()):.2f}s: "
+              + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.build_times.items()))
+    
+    def _lap(self, phase: str):
+        """Record the time since the previous lap as model-build phase `phase` (see build_times)."""
+        now = time.perf_counter()
+        self.build_times[phase] = self.build_times.get(phase, 0.0) + now - self._lap_start
+        self._lap_start = now
+    
+    def set_solution_hint(self, assignments: Set[Tuple[str, Tuple[int, int]]], repair: bool = True):
+        """Warm-start the search from a previous schedule (see DataImporter.import_previous_solution).
+        
+        repair=False keeps CP-SAT from perturbing a hint that already satisfies
+        every hard constraint (e.g. a feasible greedy schedule), so the first
+        solution is the hint itself.
+        """
+        self.solution_hint = set(assignments)
+        self.repair_hint = repair
+        if self.model_built:
+            self.model.ClearHints()
+            self._add_solution_hint()
+    
+    def _add_solution_hint(self):
+        """Hint every assignment variable: 1 for surviving previous assignments, 0 otherwise."""
+        surviving = 0
+        for key, var in self.assignments.items():
+            if key in self.solution_hint:
+                self.model.AddHint(var, 1)
+                surviving += 1
+            else:
+                self.model.AddHint(var, 0)
+        
+        lost = len(self.solution_hint) - surviving
+        print(f"\n  ✓ Solution hint: {surviving} previous assignments kept", end="")
+        print(f", {lost} no longer possible (unavailable or teacher removed)" if lost else "")
+    
+    def get_model_stats(self, measure_presolve: bool = True) -> Dict[str, float]:
+        """Return model size (variables, constraints) and optionally the presolve time."""
+        self.build_model()
+        
+        stats = self._model_size()
+        del stats['constraints_by_type']
+        
+        if measure_presolve:
+            solver = cp_model.CpSolver()
+            solver.parameters.stop_after_presolve = True
+            solver.Solve(self.model)
+            stats['presolve_time'] = solver.WallTime()
+        
+        return stats
+    
+    def _model_size(self) -> Dict:
+        """Variable and constraint counts of the CP-SAT model proto."""
+        proto = self.model.Proto()
+        by_type = defaultdict(int)
+        for constraint in proto.constraints:
+            by_type[constraint.WhichOneof('constraint')] += 1
+        return {
+            'variables': len(proto.variables),
+            'constraints': len(proto.constraints),
+            'assignment_variables': len(self.assignments),
+            'constraints_by_type': dict(sorted(by_type.items())),
+        }
+    
+    @staticmethod
+    def print_model_size_report(teachers: List[Teacher], time_slots: List[TimeSlotInfo]):
+        """Build the dense and the sparse model and compare their sizes."""
+        print("\n" + "="*70)
+        print("MODEL SIZE REPORT")
+        print("="*70)
+        
+        dense = SlotBasedScheduler(teachers, time_slots, sparse=False).get_model_stats()
+        sparse = SlotBasedScheduler(teachers, time_slots, sparse=True).get_model_stats()
+        
+        print(f"\n{'':<24}{'Dense':>12}{'Sparse':>12}{'Change':>12}")
+        for label, key in [("Assignment variables", 'assignment_variables'),
+                           ("Variables", 'variables'),
+                           ("Constraints", 'constraints')]:
+            change = (sparse[key] - dense[key]) / dense[key] * 100 if dense[key] else 0.0
+            print(f"{label:<24}{dense[key]:>12}{sparse[key]:>12}{change:>11.1f}%")
+        change = ((sparse['presolve_time'] - dense['presolve_time']) / dense['presolve_time'] * 100
+                  if dense['presolve_time'] else 0.0)
+        print(f"{'Presolve time (s)':<24}{dense['presolve_time']:>12.3f}"
+              f"{sparse['presolve_time']:>12.3f}{change:>11.1f}%")
+    
+    def _make_observer(self) -> SolutionObserver:
+        """Solution callback for streaming / checkpointing / cancelling and the solution count."""
+        return SolutionObserver(self.assignments, self.time_slot_dict, stream=self.stream,
+                                checkpoint_path=self.checkpoint_path, canceller=self.canceller)
+    
+    def _run_solver(self, solver: cp_model.CpSolver, observer: Optional[SolutionObserver],
+                    phase: str = "search"):
+        """solver.Solve on the model, stoppable through the canceller, recorded in solve_reports."""
+        # The presolve time comes from the search log: read when it is printed anyway (--log-search)
+        # or on request, since every log line then goes through a Python callback during the search
+        search_start = []
+        capture = solver.parameters.log_search_progress or self.capture_presolve_time
+        if capture:
+            if not solver.parameters.log_search_progress:
+                solver.parameters.log_search_progress = True
+                solver.parameters.log_to_stdout = False
+            solver.log_callback = lambda line: search_start.extend(SEARCH_START_LOG.findall(line))
+        solutions = observer.solution_count if observer else 0
+        if observer:
+            observer.first_solution_time = None
+        
+        if self.canceller is not None:
+            self.canceller.attach(solver)
+        try:
+            status = solver.Solve(self.model, observer.solution_callback() if observer else None)
+        finally:
+            if self.canceller is not None:
+                self.canceller.detach()
+        
+        self._record_solve(phase, solver, status,
+                           solutions=observer.solution_count - solutions if observer else None,
+                           first_solution_time=observer.first_solution_time if observer else None,
+                           presolve_time=float(search_start[0]) if search_start else None)
+        return status
+    
+    def _record_solve(self, phase: str, solver: cp_model.CpSolver, status,
+                      solutions: Optional[int] = None, first_solution_time: Optional[float] = None,
+                      presolve_time: Optional[float] = None):
+        """Append the statistics of a finished CP-SAT solve to solve_reports.
+        
+        gap is CP-SAT's relative gap, |objective - bound| / max(1, |objective|).
+        solutions counts the improving solutions and first_solution_time is
+        the solver time of the first one (None when not observed);
+        presolve_time is None when the search log was not read (see
+        capture_presolve_time).
+        """
+        found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        objective = solver.ObjectiveValue() if found else None
+        bound = solver.BestObjectiveBound() if found else None
+        self.solve_reports.append({
+            'phase': phase,
+            'status': solver.StatusName(status),
+            'objective': objective,
+            'best_bound': bound,
+            'gap': abs(objective - bound) / max(1.0, abs(objective)) if found else None,
+            'solutions': solutions,
+            'first_solution_time': first_solution_time,
+            'wall_time': solver.WallTime(),
+            'user_time': solver.UserTime(),
+            'presolve_time': presolve_time,
+            'search_time': max(0.0, solver.WallTime() - presolve_time) if presolve_time is not None else None,
+            'conflicts': solver.NumConflicts(),
+            'branches': solver.NumBranches(),
+            'response_stats': solver.ResponseStats(),
+        })
+    
+    def get_instrumentation_report(self) -> Dict:
+        """Model-build phase times, model size and the statistics of every solve, as a JSON-ready dict."""
+        report = {
+            'engine': type(self).__name__,
+            'status': self.status_name,
+            'build_time': sum(self.build_times.values()),
+            'build_phases': dict(self.build_times),
+        }
+        if self.model is not None:
+            report['model'] = self._model_size()
+        report['solves'] = self.solve_reports
+        if self.solution is not None:
+            report['penalties'] = self.evaluate_penalties()
+        return report
+    
+    def solve(self, time_limit: Optional[float] = None,
+              profile: Optional[SolverProfile] = None) -> bool:
+        """Solve the scheduling problem.
+        
+        profile sets the CP-SAT search parameters; an explicit time_limit
+        overrides the profile's one (default 180s without a profile).
+        """
+        print("\n" + "="*70)
+        print("SOLVING")
+        print("="*70)
         
-        print(f"\nSolving (time limit: {time_limit}s)...")
-        status = solver.Solve(self.model)
+        self.build_model()
+        
+        profile = SolverProfile(**vars(profile)) if profile else SolverProfile(time_limit=180)
+        if time_limit is not None:
+            profile.time_limit = time_limit
+        
+        solver = cp_model.CpSolver()
+        profile.apply(solver.parameters)
+        if self.solution_hint is not None and self.repair_hint:
+            # Let CP-SAT repair the hint when an edit made it infeasible
+            solver.parameters.repair_hint = True
+        
+        print(f"\nSolving ({profile})...")
+        observer = self._make_observer()
+        status = self._run_solver(solver, observer)
+        self.status_name = solver.StatusName(status)
+        observer.finish(self.status_name)
+        if self.canceller is not None and self.canceller.cancelled.is_set():
+            print("⚠ Search cancelled")
         
         if status == cp_model.OPTIMAL:
             print("✓ OPTIMAL solution found!")
@@ -666,6 +1380,315 @@ class SlotBasedScheduler:
         self._extract_solution(solver)
         return True
     
+    def solve_lexicographic(self, stage_time_limits: Optional[List[float]] = None,
+                            profile: Optional[SolverProfile] = None) -> bool:
+        """Staged solve: optimize one priority at a time, in OBJECTIVE_PRIORITIES order.
+        
+        After each stage the reached value is fixed as a constraint (the
+        priority can no longer get worse) and the stage solution is hinted to
+        the next stage. stage_time_limits gives one budget per non-empty
+        stage; by default the profile's time limit is split evenly. Time left
+        over by a stage that finishes early is added to the next one.
+        Per-stage objective values and times are kept in self.stage_reports.
+        """
+        print("\n" + "="*70)
+        print("SOLVING (STAGED / LEXICOGRAPHIC)")
+        print("="*70)
+        
+        self.build_model()
+        
+        profile = SolverProfile(**vars(profile)) if profile else SolverProfile(time_limit=180)
+        stages = [priority for priority in OBJECTIVE_PRIORITIES if self.objective_terms[priority]]
+        if not stage_time_limits:
+            stage_time_limits = [profile.time_limit / max(1, len(stages))] * len(stages)
+        elif len(stage_time_limits) < len(stages):
+            stage_time_limits = list(stage_time_limits) + [stage_time_limits[-1]] * (len(stages) - len(stage_time_limits))
+        
+        self.stage_reports = []
+        best_solver = None
+        carry_over = 0.0
+        observer = self._make_observer()
+        for priority, stage_limit in zip(stages, stage_time_limits):
+            stage_limit += carry_over
+            expr = sum(self.objective_terms[priority])
+            self.model.Minimize(expr)
+            
+            solver = cp_model.CpSolver()
+            profile.time_limit = stage_limit
+            profile.apply(solver.parameters)
+            if best_solver is None and self.solution_hint is not None and self.repair_hint:
+                solver.parameters.repair_hint = True
+            
+            print(f"\nStage '{priority}' ({len(self.objective_terms[priority])} terms, {stage_limit:.1f}s)...")
+            observer.stage = priority
+            status = self._run_solver(solver, observer, phase=f"stage:{priority}")
+            self.status_name = solver.StatusName(status)
+            
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                print(f"  ✗ Status: {solver.StatusName(status)}")
+                if best_solver is None:
+                    observer.finish(self.status_name)
+                    return False
+                print("  ℹ Keeping the solution of the previous stage")
+                break
+            
+            value = int(round(solver.ObjectiveValue()))
+            self.stage_reports.append({
+                'priority': priority,
+                'status': solver.StatusName(status),
+                'objective': value,
+                'best_bound': solver.BestObjectiveBound(),
+                'time': solver.WallTime(),
+            })
+            print(f"  ✓ {solver.StatusName(status)}: {value} (bound {solver.BestObjectiveBound():.0f}, "
+                  f"{solver.WallTime():.2f}s)")
+            
+            # Fix this priority and hint the next stage with the current solution
+            self.model.Add(expr <= value)
+            self.model.ClearHints()
+            for var in self.assignments.values():
+                self.model.AddHint(var, solver.Value(var))
+            best_solver = solver
+            carry_over = max(0.0, stage_limit - solver.WallTime())
+            
+            if self.canceller is not None and self.canceller.cancelled.is_set():
+                print("  ⚠ Search cancelled - remaining stages skipped")
+                break
+        
+        print(f"\n{'Stage':<18}{'Status':>10}{'Objective':>12}{'Bound':>12}{'Time (s)':>10}")
+        for report in self.stage_reports:
+            print(f"{report['priority']:<18}{report['status']:>10}{report['objective']:>12}"
+                  f"{report['best_bound']:>12.0f}{report['time']:>10.2f}")
+        
+        observer.finish(self.status_name)
+        self._extract_solution(best_solver)
+        return True
+    
+    def _find_repair_neighbourhoods(self, baseline: Set[Tuple[str, Tuple[int, int]]]) -> List[Set[str]]:
+        """Growing sets of teachers allowed to move for the baseline to become feasible again.
+        
+        A teacher is affected when one of its baseline assignments became
+        impossible or its baseline hours no longer match its target; a slot is
+        affected when its baseline coverage is outside [min, min + MAX_EXTRA_TEACHERS].
+        Neighbourhoods: affected teachers only, then every teacher available in
+        an affected slot (so coverage can be shifted between them), then all.
+        When nothing is affected the first neighbourhood is empty: every
+        variable is fixed to the baseline before anything is freed.
+        """
+        affected_teachers = set()
+        slot_counts = defaultdict(int)
+        teacher_tenths = defaultdict(int)
+        
+        for teacher_id, slot_key in baseline:
+            if teacher_id not in self.teachers:
+                continue
+            ts = self.time_slot_dict.get(slot_key)
+            if ts is None or not self.matrix.is_available(teacher_id, slot_key):
+                affected_teachers.add(teacher_id)
+                continue
+            slot_counts[slot_key] += 1
+            teacher_tenths[teacher_id] += int(ts.get_hours() * 10)
+        
+        for teacher_id, teacher in self.teachers.items():
+            min_tenths, max_tenths = self._hours_band(teacher)
+            if not min_tenths <= teacher_tenths[teacher_id] <= max_tenths:
+                affected_teachers.add(teacher_id)
+        
+        affected_slots = [ts for ts in self.time_slots
+                          if not ts.get_min_teachers() <= slot_counts[ts.get_time_key()]
+                          <= ts.get_min_teachers() + MAX_EXTRA_TEACHERS]
+        
+        slot_neighbourhood = set(affected_teachers)
+        for ts in affected_slots:
+            column = self.matrix.available[:, self.matrix.slot_index[ts.get_time_key()]]
+            slot_neighbourhood.update(self.matrix.teacher_ids[i] for i in np.flatnonzero(column))
+        
+        print(f"  - Affected teachers: {len(affected_teachers)}, affected slots: {len(affected_slots)}")
+        
+        neighbourhoods = [] if slot_neighbourhood else [set()]
+        for neighbourhood in (affected_teachers, slot_neighbourhood, set(self.teachers)):
+            if neighbourhood and (not neighbourhoods or len(neighbourhood) > len(neighbourhoods[-1])):
+                neighbourhoods.append(neighbourhood)
+        return neighbourhoods
+    
+    def _build_repair_model(self, baseline: Set[Tuple[str, Tuple[int, int]]], free_teachers: Set[str]):
+        """Hard constraints only, teachers outside free_teachers fixed to the baseline,
+        objective = number of (teacher, slot) pairs that differ from the baseline."""
+        self.model = cp_model.CpModel()
+        self.assignments = {}
+        self.teacher_hours_vars = {}
+        
+        self._create_variables()
+        self._add_hard_constraints()
+        
+        changes = []
+        fixed = 0
+        for key, var in self.assignments.items():
+            in_baseline = key in baseline
+            self.model.AddHint(var, int(in_baseline))
+            if key[0] not in free_teachers:
+                self.model.Add(var == int(in_baseline))
+                fixed += 1
+            changes.append(1 - var if in_baseline else var)
+        
+        self.model.Minimize(sum(changes))
+        self.model_built = True
+        print(f"  ✓ Repair model: {len(free_teachers)} free teachers, {fixed} variables fixed to the baseline")
+    
+    def repair(self, baseline: Set[Tuple[str, Tuple[int, int]]], time_limit: Optional[float] = None,
+               profile: Optional[SolverProfile] = None) -> bool:
+        """Minimal-disruption re-optimization of a published schedule.
+        
+        Keeps the baseline assignment as far as the hard constraints allow,
+        minimizing the number of changed (teacher, slot) pairs. Only the
+        affected neighbourhood is re-solved first; the whole schedule is
+        opened up only if that neighbourhood cannot be repaired.
+        """
+        print("\n" + "="*70)
+        print("REPAIRING SCHEDULE")
+        print("="*70)
+        
+        profile = SolverProfile(**vars(profile)) if profile else SolverProfile(time_limit=60)
+        if time_limit is not None:
+            profile.time_limit = time_limit
+        
+        neighbourhoods = self._find_repair_neighbourhoods(baseline)
+        for free_teachers in neighbourhoods:
+            self._build_repair_model(baseline, free_teachers)
+            
+            solver = cp_model.CpSolver()
+            profile.apply(solver.parameters)
+            status = self._run_solver(solver, SolutionObserver(self.assignments, self.time_slot_dict),
+                                      phase="repair")
+            self.status_name = solver.StatusName(status)
+            
+            if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                break
+            if status != cp_model.INFEASIBLE or free_teachers is neighbourhoods[-1]:
+                print(f"✗ Status: {solver.StatusName(status)}")
+                return False
+            print("  ℹ Neighbourhood cannot be repaired, widening it")
+        
+        label = "OPTIMAL" if status == cp_model.OPTIMAL else "FEASIBLE"
+        print(f"✓ {label} repair found in {solver.WallTime():.2f}s: "
+              f"{int(solver.ObjectiveValue())} changed assignments")
+        
+        self._extract_solution(solver)
+        
+        current = {(t_id, key) for t_id, keys in self.solution['teacher_slots'].items() for key in keys}
+        baseline = {(t_id, key) for t_id, key in baseline if t_id in self.teachers}
+        added = sorted(current - baseline)
+        removed = sorted(baseline - current)
+        self.repair_changes = {
+            'added': added,
+            'removed': removed,
+            'changed_teachers': sorted(set(t_id for t_id, _ in added + removed)),
+        }
+        return True
+    
+    def print_repair_changes(self):
+        """Print the assignments changed by repair() and the teachers whose convocation must be regenerated."""
+        if not self.repair_changes:
+            return
+        
+        print(f"\n{'='*70}")
+        print("REPAIR CHANGES")
+        print("="*70)
+        for label, pairs in (("+", self.repair_changes['added']), ("-", self.repair_changes['removed'])):
+            for teacher_id, (day, slot) in pairs:
+                print(f"  {label} {teacher_id} ({self.teachers[teacher_id].get_full_name()}): "
+                      f"Day {day}, {TIME_SLOTS[slot]['name']}")
+        
+        changed = self.repair_changes['changed_teachers']
+        print(f"\nConvocations to regenerate: {len(changed)}/{len(self.teachers)} teachers")
+        if changed:
+            print(f"  IDs: {', '.join(changed)}")
+    
+    def explain_infeasibility(self, time_limit: float = 60) -> Optional[Dict]:
+        """Find a small conflicting subset of hard constraint groups.
+        
+        Builds a hard-constraints-only model where each group (exact hours of
+        one teacher, minimum / maximum of one slot, unavailability of one
+        teacher) is enforced by an assumption literal, then asks CP-SAT for a
+        sufficient set of assumptions for infeasibility. Returns None when
+        the hard constraints are satisfiable, otherwise a JSON-ready dict.
+        """
+        print("\n" + "="*70)
+        print("EXPLAINING INFEASIBILITY")
+        print("="*70)
+        
+        model = cp_model.CpModel()
+        x = {}
+        for teacher_id in self.teachers:
+            for ts in self.time_slots:
+                x[(teacher_id, ts.get_time_key())] = model.NewBoolVar(f"x_{teacher_id}_d{ts.day}_s{ts.slot}")
+        
+        groups = []  # (literal, description) in assumption order
+        
+        def group_literal(description: Dict):
+            literal = model.NewBoolVar(f"group_{len(groups)}")
+            groups.append((literal, description))
+            return literal
+        
+        for teacher_id, teacher in sorted(self.teachers.items()):
+            literal = group_literal({
+                'type': 'teacher_hours', 'teacher_id': teacher_id, 'name': teacher.get_full_name(),
+                'grade': teacher.grade, 'required_hours': teacher.required_hours,
+            })
+            total = sum(x[(teacher_id, ts.get_time_key())] * int(ts.get_hours() * 10) for ts in self.time_slots)
+            min_tenths, max_tenths = self._hours_band(teacher)
+            model.AddLinearConstraint(total, min_tenths, max_tenths).OnlyEnforceIf(literal)
+        
+        for ts in self.time_slots:
+            count = sum(x[(teacher_id, ts.get_time_key())] for teacher_id in self.teachers)
+            slot_info = {'day': ts.day, 'slot': TIME_SLOTS[ts.slot]['name'], 'date': ts.date}
+            literal = group_literal(dict(type='slot_minimum', min_teachers=ts.get_min_teachers(), **slot_info))
+            model.Add(count >= ts.get_min_teachers()).OnlyEnforceIf(literal)
+            literal = group_literal(dict(type='slot_maximum',
+                                         max_teachers=ts.get_min_teachers() + MAX_EXTRA_TEACHERS, **slot_info))
+            model.Add(count <= ts.get_min_teachers() + MAX_EXTRA_TEACHERS).OnlyEnforceIf(literal)
+        
+        for teacher_id, teacher in sorted(self.teachers.items()):
+            blocked = [ts for ts in self.time_slots if not self.matrix.is_available(teacher_id, ts.get_time_key())]
+            if not blocked:
+                continue
+            literal = group_literal({
+                'type': 'teacher_unavailability', 'teacher_id': teacher_id, 'name': teacher.get_full_name(),
+                'grade': teacher.grade,
+                'slots': [f"Day {ts.day} {TIME_SLOTS[ts.slot]['name']}" for ts in blocked],
+            })
+            for ts in blocked:
+                model.Add(x[(teacher_id, ts.get_time_key())] == 0).OnlyEnforceIf(literal)
+        
+        model.AddAssumptions([literal for literal, _ in groups])
+        
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        solver.parameters.num_workers = 1  # assumption cores are only reported by the sequential search
+        solver.parameters.linearization_level = 2  # needed to prove the aggregate (sum of hours) conflicts
+        status = solver.Solve(model)
+        
+        if status != cp_model.INFEASIBLE:
+            print(f"  ℹ Hard constraints are not infeasible (status: {solver.StatusName(status)})")
+            return None
+        
+        index_to_group = {literal.Index(): description for literal, description in groups}
+        core = [index_to_group[index] for index in solver.SufficientAssumptionsForInfeasibility()]
+        
+        print(f"✓ Conflicting subset: {len(core)} of {len(groups)} constraint groups "
+              f"(found in {solver.WallTime():.2f}s)")
+        for group in core:
+            if group['type'] in ('teacher_hours', 'teacher_unavailability'):
+                print(f"  - {group['type']}: {group['teacher_id']} ({group['name']}, {group['grade']})")
+            else:
+                print(f"  - {group['type']}: Day {group['day']} {group['slot']}")
+        
+        return {
+            'status': 'INFEASIBLE',
+            'num_groups': len(groups),
+            'core': core,
+        }
+    
     def _extract_solution(self, solver: cp_model.CpSolver):
         """Extract solution from solver."""
         self.solution = {
@@ -682,6 +1705,53 @@ class SlotBasedScheduler:
                 ts = self.time_slot_dict[slot_key]
                 self.solution['teacher_hours'][teacher_id] += ts.get_hours()
     
+    def evaluate_penalties(self, solution: Optional[Dict] = None) -> Dict[str, int]:
+        """Recompute the objective of a solution from its assignments.
+        
+        Independent of the gap formulation used in the model, so objective
+        values of different formulations (or engines) can be compared.
+        """
+        solution = solution or self.solution
+        assigned = set()
+        for slot_key, teacher_ids in solution['slot_teachers'].items():
+            for teacher_id in teacher_ids:
+                assigned.add((teacher_id, slot_key))
+        
+        all_days = sorted(set(ts.day for ts in self.time_slots))
+        day_slots = {day: sorted(ts.slot for ts in self.time_slots if ts.day == day) for day in all_days}
+        
+        penalties = {'hours_deviation': 0, 'responsible': 0, 'buffer': 0, 'time_gaps': 0, 'day_gaps': 0}
+        
+        for teacher_id, teacher in self.teachers.items():
+            hours = sum(self.time_slot_dict[key].get_hours() for key in solution['teacher_slots'].get(teacher_id, []))
+            deviation_tenths = abs(int(round(hours * 10)) - int(teacher.required_hours * 10))
+            penalties['hours_deviation'] += deviation_tenths * HOURS_DEVIATION_WEIGHT
+        
+        for ts in self.time_slots:
+            for resp_id in ts.responsible_teachers:
+                if (resp_id in self.teachers and self.matrix.is_available(resp_id, ts.get_time_key())
+                        and (resp_id, ts.get_time_key()) not in assigned):
+                    penalties['responsible'] += RESPONSIBLE_WEIGHT
+            
+            count = len(solution['slot_teachers'].get(ts.get_time_key(), []))
+            penalties['buffer'] += abs(count - ts.get_target_teachers()) * BUFFER_WEIGHT
+        
+        for teacher_id in self.teachers:
+            works_day = {}
+            for day in all_days:
+                slots = day_slots[day]
+                for slot1, slot2 in zip(slots, slots[1:]):
+                    if (teacher_id, (day, slot1)) in assigned and (teacher_id, (day, slot2)) not in assigned:
+                        penalties['time_gaps'] += TIME_GAP_WEIGHT
+                works_day[day] = any((teacher_id, (day, slot)) in assigned for slot in slots)
+            
+            for day1, day2 in zip(all_days, all_days[1:]):
+                if works_day[day1] and not works_day[day2]:
+                    penalties['day_gaps'] += DAY_GAP_WEIGHT
+        
+        penalties['total'] = sum(penalties.values())
+        return penalties
+    
     def print_solution(self):
         """Print solution summary."""
         if not self.solution:
@@ -725,9 +1795,11 @@ class SlotBasedScheduler:
         total_deviation = 0
         teachers_at_target = 0
         
+        constraint_label = ("HARD CONSTRAINT" if self.hours_tolerance <= 0
+                            else f"SOFT, ±{self.hours_tolerance}h allowed")
         for grade in sorted(set(t.grade for t in self.teachers.values())):
             teachers_in_grade = [t for t in self.teachers.values() if t.grade == grade]
-            print(f"\n{grade} (Target: {teachers_in_grade[0].required_hours}h - HARD CONSTRAINT):")
+            print(f"\n{grade} (Target: {teachers_in_grade[0].required_hours}h - {constraint_label}):")
             
             for teacher in sorted(teachers_in_grade, key=lambda t: t.id):
                 hours = self.solution['teacher_hours'][teacher.id]
@@ -750,9 +1822,37 @@ class SlotBasedScheduler:
         print(f"Teachers at exact target: {teachers_at_target}/{len(self.teachers)} ✓")
         print(f"Average deviation: {total_deviation / len(self.teachers):.2f}h per teacher")
         print(f"Total teacher-slot assignments: {sum(len(v) for v in self.solution['slot_teachers'].values())}")
+        
+        if self.hours_tolerance > 0:
+            deviations = self.get_hours_deviations()
+            off_target = {t_id: dev for t_id, dev in deviations.items() if abs(dev) >= 0.1}
+            print(f"\nHours deviation (soft mode, ±{self.hours_tolerance}h): "
+                  f"{len(off_target)} teachers off target")
+            for teacher_id, deviation in sorted(off_target.items()):
+                teacher = self.teachers[teacher_id]
+                print(f"  {deviation:+.1f}h {teacher_id} ({teacher.get_full_name()}, {teacher.grade})")
+    
+    def get_hours_deviations(self) -> Dict[str, float]:
+        """Per-teacher deviation from the target hours in the current solution (hours, signed)."""
+        if not self.solution:
+            return {}
+        return {teacher_id: round(self.solution['teacher_hours'][teacher_id] - teacher.required_hours, 1)
+                for teacher_id, teacher in self.teachers.items()}
     
-    def export_solution_to_excel(self, filename: str = "schedule_solution.xlsx"):
-        """Export solution to Excel with teacher names and emails."""
+    def get_assignment_set(self) -> Set[Tuple[str, Tuple[int, int]]]:
+        """(teacher_id, time_slot_key) pairs of the current solution, e.g. to hint another solve."""
+        if not self.solution:
+            return set()
+        return {(teacher_id, slot_key) for teacher_id, slot_keys in self.solution['teacher_slots'].items()
+                for slot_key in slot_keys}
+    
+    def export_solution_to_excel(self, filename: str = "schedule_solution.xlsx",
+                                 rooms: Optional[RoomAssignment] = None):
+        """Export solution to Excel with teacher names and emails.
+        
+        With rooms (room_assignment.assign_rooms), each row also gets the
+        teacher's room in a 'Salle' column, as generate_docs reads it.
+        """
         if not self.solution:
             print("No solution to export")
             return
@@ -784,6 +1884,8 @@ class SlotBasedScheduler:
                     'Grade': teacher.grade,
                     'Responsable': is_responsible
                 })
+                if rooms is not None:
+                    data[-1]['Salle'] = rooms.room_of(ts.get_time_key(), teacher_id)
         
         df = pd.DataFrame(data)
         df = df.sort_values(['Date', 'Séance', 'Enseignant_ID'])
@@ -793,35 +1895,708 @@ class SlotBasedScheduler:
         print(f"  - Total assignments: {len(data)}")
 
 
+# ============================================================================
+# DECOMPOSED SCHEDULER
+# ============================================================================
+
+def _solve_block(task):
+    """Solve the subproblem of one block (day or week) of a decomposed instance.
+    
+    Module level so it can be sent to a process pool. The scheduler banners
+    are swallowed, only the solution goes back to the parent process.
+    """
+    block, teachers, time_slots, scheduler_options, profile, hint = task
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scheduler = SlotBasedScheduler(teachers, time_slots, **scheduler_options)
+        if hint:
+            scheduler.set_solution_hint(hint)
+        solved = scheduler.solve(profile=profile)
+    solution = {key: dict(values) for key, values in scheduler.solution.items()} if solved else None
+    return block, solution, scheduler.status_name, time.perf_counter() - start
+
+
+class DecomposedScheduler(SlotBasedScheduler):
+    """Solve large sessions block by block, a block being a day or a calendar week.
+    
+    A small master CP-SAT model first allocates each teacher's required hours
+    across days (number of slots per teacher per day), respecting
+    availability, the slot minimums, responsible teachers and day clustering.
+    Each block is then an independent SlotBasedScheduler instance in which
+    teachers must work exactly their allocated hours. Blocks are solved in
+    parallel in a process pool and stitched into the usual solution dict.
+    
+    When a block finds no solution for its allocation, that allocation is
+    forbidden in the master and hours are re-allocated; changing the hours of
+    blocks already solved is penalized (REALLOCATION_WEIGHT), and only the
+    blocks whose allocation changed are solved again (at most
+    MAX_COORDINATION_ROUNDS rounds). The stitched schedule satisfies the
+    full model but, unlike SlotBasedScheduler.solve, is never proven optimal.
+    
+    Hours are allocated as slot counts, so all slots must have the same
+    duration.
+    """
+    
+    def __init__(self, teachers: List[Teacher], time_slots: List[TimeSlotInfo],
+                 split: str = "day", max_workers: Optional[int] = None,
+                 sparse: bool = False, gap_formulation: str = "reified",
+                 hours_tolerance: float = 0.0):
+        if split not in DECOMPOSITION_SPLITS:
+            raise ValueError(f"Unknown split '{split}', expected one of {DECOMPOSITION_SPLITS}")
+        slot_tenths = {int(ts.get_hours() * 10) for ts in time_slots}
+        if len(slot_tenths) > 1:
+            raise ValueError("Decomposed solve requires all time slots to have the same duration")
+        
+        super().__init__(teachers, time_slots, sparse=sparse, gap_formulation=gap_formulation,
+                         hours_tolerance=hours_tolerance)
+        self.split = split
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.slot_tenths = slot_tenths.pop() if slot_tenths else 15
+        self.scheduler_options = {'sparse': sparse, 'gap_formulation': gap_formulation}
+        self.block_reports = []  # Filled by solve(): one row per block subproblem
+        
+        # day -> slots of the day, block -> days of the block
+        self.day_slots = defaultdict(list)
+        for ts in sorted(time_slots, key=lambda x: (x.day, x.slot)):
+            self.day_slots[ts.day].append(ts)
+        self.blocks = defaultdict(list)
+        for day, slots in sorted(self.day_slots.items()):
+            self.blocks[self._block_of(slots[0])].append(day)
+        
+        print(f"  - Decomposition: {len(self.blocks)} blocks (split by {split}), "
+              f"up to {self.max_workers} processes")
+    
+    def _block_of(self, ts: TimeSlotInfo):
+        """Block key of a time slot: its day number or its ISO week ('2025-W03')."""
+        if self.split == "day":
+            return ts.day
+        year, week, _ = datetime.strptime(ts.date, '%Y-%m-%d').isocalendar()
+        return f"{year}-W{week:02d}"
+    
+    def _block_label(self, block) -> str:
+        return f"Day {block}" if self.split == "day" else block
+    
+    def _block_totals(self, allocation: Dict[Tuple[str, int], int], block) -> Dict[str, int]:
+        """Slots allocated to each teacher over the days of a block."""
+        totals = defaultdict(int)
+        for (teacher_id, day), slots in allocation.items():
+            if day in self.blocks[block]:
+                totals[teacher_id] += slots
+        return dict(totals)
+    
+    def _solve_master(self, previous: Optional[Dict[Tuple[str, int], int]], solved_blocks: Set,
+                      forbidden: List[Tuple[object, Dict[str, int]]],
+                      time_limit: float) -> Optional[Dict[Tuple[str, int], int]]:
+        """Allocate slots per teacher per day.
+        
+        Moving hours in or out of solved_blocks (compared to the previous
+        allocation) is penalized; forbidden lists (block, {teacher_id: slots})
+        block allocations that found no schedule.
+        Returns {(teacher_id, day): slots}, or None when no allocation exists.
+        """
+        model = cp_model.CpModel()
+        alloc = {}  # (teacher_id, day) -> IntVar, number of slots worked that day
+        works = {}  # (teacher_id, day) -> BoolVar
+        penalties = []
+        
+        for teacher_id, teacher in self.teachers.items():
+            for day, slots in self.day_slots.items():
+                available = sum(1 for ts in slots if self.matrix.is_available(teacher_id, ts.get_time_key()))
+                if not available:
+                    continue
+                key = (teacher_id, day)
+                alloc[key] = model.NewIntVar(0, available, f'alloc_{teacher_id}_d{day}')
+                works[key] = model.NewBoolVar(f'works_{teacher_id}_d{day}')
+                model.Add(alloc[key] >= works[key])
+                model.Add(alloc[key] <= available * works[key])
+        
+        # Hours: same band as the full model, allocated in whole slots
+        for teacher_id, teacher in self.teachers.items():
+            teacher_alloc = [alloc[(teacher_id, day)] for day in self.day_slots if (teacher_id, day) in alloc]
+            total_tenths = self.slot_tenths * sum(teacher_alloc)
+            min_tenths, max_tenths = self._hours_band(teacher)
+            model.Add(total_tenths >= min_tenths)
+            model.Add(total_tenths <= max_tenths)
+            if self.hours_tolerance > 0:
+                deviation = model.NewIntVar(0, max_tenths - min_tenths, f'hours_dev_{teacher_id}')
+                model.AddAbsEquality(deviation, total_tenths - int(teacher.required_hours * 10))
+                penalties.append(deviation * HOURS_DEVIATION_WEIGHT)
+        
+        # Slots: enough teachers working that day and available in the slot (necessary condition)
+        for ts in self.time_slots:
+            column = self.matrix.available[:, self.matrix.slot_index[ts.get_time_key()]]
+            candidates = [works[(t_id, ts.day)] for t_id, available in zip(self.matrix.teacher_ids, column)
+                          if available and (t_id, ts.day) in works]
+            model.Add(sum(candidates) >= ts.get_min_teachers())
+        
+        # Days: capacity bounds and buffer target summed over the day's slots
+        for day, slots in self.day_slots.items():
+            day_alloc = sum(var for (t_id, d), var in alloc.items() if d == day)
+            day_min = sum(ts.get_min_teachers() for ts in slots)
+            model.Add(day_alloc >= day_min)
+            model.Add(day_alloc <= day_min + MAX_EXTRA_TEACHERS * len(slots))
+            day_target = sum(ts.get_target_teachers() for ts in slots)
+            deviation = model.NewIntVar(0, 100 * len(slots), f'day_absdev_{day}')
+            model.AddAbsEquality(deviation, day_alloc - day_target)
+            penalties.append(deviation * BUFFER_WEIGHT)
+        
+        # Responsible teachers should work on the day of their exam
+        for ts in self.time_slots:
+            for resp_id in ts.responsible_teachers:
+                key = (resp_id, ts.day)
+                if key in works and self.matrix.is_available(resp_id, ts.get_time_key()):
+                    penalties.append((1 - works[key]) * RESPONSIBLE_WEIGHT)
+        
+        # Day clustering, as in the full model
+        all_days = sorted(self.day_slots)
+        for teacher_id in self.teachers:
+            for day1, day2 in zip(all_days, all_days[1:]):
+                works_day1 = works.get((teacher_id, day1))
+                works_day2 = works.get((teacher_id, day2))
+                if works_day1 is None:
+                    continue
+                if works_day2 is None:
+                    penalties.append(works_day1 * DAY_GAP_WEIGHT)
+                    continue
+                day_gap = model.NewBoolVar(f'daygap_{teacher_id}_{day1}_{day2}')
+                model.Add(day_gap >= works_day1 - works_day2)
+                penalties.append(day_gap * DAY_GAP_WEIGHT)
+        
+        # Coordination: keep solved blocks if possible, forbid allocations that failed
+        def block_sum(teacher_id, block):
+            return sum(alloc[(teacher_id, day)] for day in self.blocks[block] if (teacher_id, day) in alloc)
+        
+        for block in solved_blocks:
+            previous_totals = self._block_totals(previous, block)
+            for teacher_id in self.teachers:
+                changed = model.NewBoolVar(f'changed_{teacher_id}_{block}')
+                model.Add(block_sum(teacher_id, block) == previous_totals.get(teacher_id, 0)).OnlyEnforceIf(changed.Not())
+                penalties.append(changed * REALLOCATION_WEIGHT)
+        for index, (block, block_alloc) in enumerate(forbidden):
+            differs = []
+            for teacher_id in self.teachers:
+                differ = model.NewBoolVar(f'differs_{teacher_id}_{block}_{index}')
+                model.Add(block_sum(teacher_id, block) != block_alloc.get(teacher_id, 0)).OnlyEnforceIf(differ)
+                differs.append(differ)
+            model.AddBoolOr(differs)
+        
+        model.Minimize(sum(penalties))
+        
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        status = solver.Solve(model)
+        self._record_solve("master", solver, status)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            self.status_name = solver.StatusName(status)
+            return None
+        
+        return {key: solver.Value(var) for key, var in alloc.items() if solver.Value(var) > 0}
+    
+    def _solve_blocks(self, blocks: List, allocation: Dict[Tuple[str, int], int],
+                      profile: SolverProfile, deadline: float) -> List[Tuple]:
+        """Solve the given blocks for an allocation, in parallel when there are several processes."""
+        pool_size = min(self.max_workers, len(blocks))
+        waves = math.ceil(len(blocks) / pool_size)
+        block_profile = SolverProfile(**vars(profile))
+        block_profile.time_limit = max(1.0, (deadline - time.perf_counter()) / waves)
+        block_profile.num_workers = max(1, (profile.num_workers or os.cpu_count() or 1) // pool_size)
+        block_profile.log_search_progress = False
+        
+        tasks = []
+        for block in blocks:
+            days = set(self.blocks[block])
+            block_slots = [ts for ts in self.time_slots if ts.day in days]
+            block_teachers = []
+            for teacher in self.teachers.values():
+                slots_worked = sum(allocation.get((teacher.id, day), 0) for day in days)
+                if slots_worked:
+                    block_teachers.append(replace(teacher,
+                                                  required_hours=slots_worked * self.slot_tenths / 10))
+            hint = None
+            if self.solution_hint is not None:
+                hint = {(t_id, key) for t_id, key in self.solution_hint if key[0] in days}
+            tasks.append((block, block_teachers, block_slots, self.scheduler_options, block_profile, hint))
+        
+        print(f"  Solving {len(blocks)} blocks with {pool_size} processes "
+              f"({block_profile.time_limit:.1f}s, {block_profile.num_workers} workers each)...")
+        if pool_size == 1:
+            return [_solve_block(task) for task in tasks]
+        with ProcessPoolExecutor(max_workers=pool_size) as pool:
+            return list(pool.map(_solve_block, tasks))
+    
+    def solve(self, time_limit: Optional[float] = None,
+              profile: Optional[SolverProfile] = None) -> bool:
+        """Decomposed solve: master allocation, then block subproblems, then stitching."""
+        print("\n" + "="*70)
+        print(f"SOLVING (DECOMPOSED BY {self.split.upper()})")
+        print("="*70)
+        
+        profile = SolverProfile(**vars(profile)) if profile else SolverProfile(time_limit=180)
+        if time_limit is not None:
+            profile.time_limit = time_limit
+        deadline = time.perf_counter() + profile.time_limit
+        
+        self.block_reports = []
+        allocation = None
+        block_solutions = {}
+        forbidden = []
+        
+        for round_number in range(1, MAX_COORDINATION_ROUNDS + 1):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            
+            start = time.perf_counter()
+            previous = allocation
+            allocation = self._solve_master(previous, set(block_solutions), forbidden,
+                                            min(remaining, max(1.0, profile.time_limit * MASTER_TIME_SHARE)))
+            if allocation is None:
+                if round_number == 1:
+                    # The master is a relaxation of the full model
+                    print(f"\n✗ Hours allocation failed ({self.status_name})")
+                else:
+                    print(f"\n✗ No other hours allocation for the failed blocks ({self.status_name})")
+                break
+            print(f"\nRound {round_number}: hours allocated over {len(self.day_slots)} days "
+                  f"in {time.perf_counter() - start:.2f}s")
+            for block in list(block_solutions):
+                if self._block_totals(allocation, block) != self._block_totals(previous, block):
+                    del block_solutions[block]  # Its hours moved: solve it again
+            
+            pending = [block for block in self.blocks if block not in block_solutions]
+            for block, solution, status_name, elapsed in self._solve_blocks(pending, allocation,
+                                                                            profile, deadline):
+                days = self.blocks[block]
+                self.block_reports.append({
+                    'round': round_number,
+                    'block': self._block_label(block),
+                    'slots': sum(len(self.day_slots[day]) for day in days),
+                    'teachers': len({t_id for (t_id, day) in allocation if day in days}),
+                    'status': status_name,
+                    'time': elapsed,
+                })
+                if solution is not None:
+                    block_solutions[block] = solution
+                else:
+                    forbidden.append((block, self._block_totals(allocation, block)))
+            
+            if len(block_solutions) == len(self.blocks):
+                break
+        
+        self._print_block_reports()
+        
+        if len(block_solutions) < len(self.blocks):
+            if allocation is not None or forbidden:
+                # Only a failed first master proves infeasibility; keep its status in that case
+                self.status_name = 'UNKNOWN'
+            print(f"✗ {len(self.blocks) - len(block_solutions)} blocks without a solution")
+            return False
+        
+        self.solution = {
+            'slot_teachers': defaultdict(list),
+            'teacher_slots': defaultdict(list),
+            'teacher_hours': defaultdict(float)
+        }
+        for block_solution in block_solutions.values():
+            for slot_key, teacher_ids in block_solution['slot_teachers'].items():
+                self.solution['slot_teachers'][slot_key].extend(teacher_ids)
+            for teacher_id, slot_keys in block_solution['teacher_slots'].items():
+                self.solution['teacher_slots'][teacher_id].extend(slot_keys)
+            for teacher_id, hours in block_solution['teacher_hours'].items():
+                self.solution['teacher_hours'][teacher_id] += hours
+        
+        self.status_name = 'FEASIBLE'
+        print("✓ FEASIBLE solution found (stitched from the block subproblems)")
+        return True
+    
+    def get_instrumentation_report(self) -> Dict:
+        """Base report (master solves in solves) plus the block subproblem rows."""
+        report = super().get_instrumentation_report()
+        report['blocks'] = self.block_reports
+        return report
+    
+    def _print_block_reports(self):
+        """Print one row per block subproblem solved."""
+        if not self.block_reports:
+            return
+        print(f"\n  {'Round':<7}{'Block':<12}{'Slots':>7}{'Teachers':>10}{'Status':>12}{'Time (s)':>10}")
+        for report in self.block_reports:
+            print(f"  {report['round']:<7}{report['block']:<12}{report['slots']:>7}"
+                  f"{report['teachers']:>10}{report['status']:>12}{report['time']:>10.2f}")
+
+
+# ============================================================================
+# GREEDY SCHEDULER
+# ============================================================================
+
+class GreedyScheduler(SlotBasedScheduler):
+    """Heuristic engine (no CP-SAT) for instant previews and CP-SAT seeding.
+    
+    Same input and solution dict as SlotBasedScheduler. A constructive greedy
+    (responsible teachers on their exam slots, then slot minimums from the
+    scarcest slot, then each teacher's remaining hours) is improved by local
+    search over teacher_slots: move one assignment to another slot, add or
+    drop one, or swap slots between two teachers. The search stops at a
+    local optimum or when the time limit is reached.
+    
+    Moves are scored with the evaluate_penalties objective plus
+    GREEDY_VIOLATION_WEIGHT per tenth of an hour of hard-constraint violation
+    (hours outside a teacher's band, teachers missing or in excess in a
+    slot, weighted by the slot duration), so the result may be near-feasible;
+    remaining violations are listed in self.violations. To seed CP-SAT, pass
+    get_assignment_set() to SlotBasedScheduler.set_solution_hint, with
+    repair=False when there are no violations.
+    """
+    
+    def __init__(self, teachers: List[Teacher], time_slots: List[TimeSlotInfo],
+                 hours_tolerance: float = 0.0):
+        super().__init__(teachers, time_slots, hours_tolerance=hours_tolerance)
+        self.violations = []  # Hard constraints still violated by the last solve
+        
+        slot_keys = [ts.get_time_key() for ts in sorted(time_slots, key=lambda x: (x.day, x.slot))]
+        self._tenths = {ts.get_time_key(): int(ts.get_hours() * 10) for ts in time_slots}
+        self._slot_bounds = {ts.get_time_key(): (ts.get_min_teachers(), ts.get_min_teachers() + MAX_EXTRA_TEACHERS)
+                             for ts in time_slots}
+        self._slot_targets = {ts.get_time_key(): ts.get_target_teachers() for ts in time_slots}
+        self._available = {t_id: sorted(self.matrix.available_slot_keys(i))
+                           for i, t_id in enumerate(self.matrix.teacher_ids)}
+        self._available_sets = {t_id: set(keys) for t_id, keys in self._available.items()}
+        self._candidates = {key: [t_id for t_id in self.teachers if key in self._available_sets[t_id]]
+                            for key in slot_keys}
+        self._required = {t_id: int(teacher.required_hours * 10) for t_id, teacher in self.teachers.items()}
+        self._bands = {t_id: self._hours_band(teacher) for t_id, teacher in self.teachers.items()}
+        self._responsible = defaultdict(list)  # teacher_id -> exam slots where the teacher is available
+        for ts in time_slots:
+            for resp_id in ts.responsible_teachers:
+                if resp_id in self.teachers and self.matrix.is_available(resp_id, ts.get_time_key()):
+                    self._responsible[resp_id].append(ts.get_time_key())
+        self._days = sorted(set(ts.day for ts in time_slots))
+        self._day_keys = {day: [key for key in slot_keys if key[0] == day] for day in self._days}
+    
+    def _teacher_cost(self, teacher_id: str, slots: Set[Tuple[int, int]]) -> int:
+        """Penalty of one teacher's schedule: hours, responsible, time and day gaps."""
+        hours = sum(self._tenths[key] for key in slots)
+        min_tenths, max_tenths = self._bands[teacher_id]
+        cost = abs(hours - self._required[teacher_id]) * HOURS_DEVIATION_WEIGHT
+        cost += max(0, min_tenths - hours, hours - max_tenths) * GREEDY_VIOLATION_WEIGHT
+        cost += RESPONSIBLE_WEIGHT * sum(1 for key in self._responsible.get(teacher_id, ()) if key not in slots)
+        
+        previous_works = False
+        for day in self._day_keys:
+            day_keys = self._day_keys[day]
+            works = False
+            for key1, key2 in zip(day_keys, day_keys[1:]):
+                if key1 in slots:
+                    works = True
+                    if key2 not in slots:
+                        cost += TIME_GAP_WEIGHT
+            works = works or day_keys[-1] in slots
+            if previous_works and not works:
+                cost += DAY_GAP_WEIGHT
+            previous_works = works
+        return cost
+    
+    def _slot_cost(self, key: Tuple[int, int], count: int) -> int:
+        """Penalty of a slot staffed by count teachers: buffer plus min/max violations."""
+        min_teachers, max_teachers = self._slot_bounds[key]
+        violation = max(0, min_teachers - count, count - max_teachers) * self._tenths[key]
+        return abs(count - self._slot_targets[key]) * BUFFER_WEIGHT + violation * GREEDY_VIOLATION_WEIGHT
+    
+    def _construct(self) -> Dict[str, Set[Tuple[int, int]]]:
+        """Build an initial schedule greedily."""
+        assigned = {t_id: set() for t_id in self.teachers}
+        hours = {t_id: 0 for t_id in self.teachers}
+        count = {key: 0 for key in self._tenths}
+        open_tenths = {t_id: sum(self._tenths[key] for key in keys) for t_id, keys in self._available.items()}
+        
+        def can_assign(t_id, key, limit):
+            return (key not in assigned[t_id] and count[key] < self._slot_bounds[key][1]
+                    and hours[t_id] + self._tenths[key] <= limit)
+        
+        def assign(t_id, key):
+            assigned[t_id].add(key)
+            hours[t_id] += self._tenths[key]
+            open_tenths[t_id] -= self._tenths[key]
+            count[key] += 1
+        
+        def closeness(t_id, key):
+            """0 next to an assigned slot, 1 same day as one, 2 otherwise."""
+            same_day = [slot for day, slot in assigned[t_id] if day == key[0]]
+            if any(abs(slot - key[1]) == 1 for slot in same_day):
+                return 0
+            return 1 if same_day else 2
+        
+        def tightness(t_id):
+            """Share of the teacher's still unassigned available hours needed to reach the target."""
+            missing = self._required[t_id] - hours[t_id]
+            return missing / open_tenths[t_id] if open_tenths[t_id] else 0.0
+        
+        # 1. Responsible teachers on their exam slots
+        for t_id, keys in self._responsible.items():
+            for key in keys:
+                if can_assign(t_id, key, self._required[t_id]):
+                    assign(t_id, key)
+        
+        # 2. Slot minimums, scarcest slots first
+        for key in sorted(self._tenths, key=lambda k: len(self._candidates[k]) - self._slot_bounds[k][0]):
+            while count[key] < self._slot_bounds[key][0]:
+                candidates = [t_id for t_id in self._candidates[key]
+                              if can_assign(t_id, key, self._required[t_id])]
+                if not candidates:
+                    candidates = [t_id for t_id in self._candidates[key]
+                                  if can_assign(t_id, key, self._bands[t_id][1])]
+                if not candidates:
+                    break
+                assign(min(candidates, key=lambda t_id: (closeness(t_id, key), -tightness(t_id))), key)
+        
+        # 3. Remaining hours, tightest teachers first, slots below target first
+        for t_id in sorted(self.teachers, key=tightness, reverse=True):
+            while hours[t_id] < self._required[t_id]:
+                options = [key for key in self._available[t_id]
+                           if can_assign(t_id, key, self._required[t_id])]
+                if not options:
+                    break
+                assign(t_id, min(options, key=lambda key: (count[key] >= self._slot_targets[key],
+                                                           closeness(t_id, key), count[key])))
+        
+        return assigned
+    
+    def _local_search(self, assigned: Dict[str, Set[Tuple[int, int]]], deadline: float,
+                      rng: random.Random) -> int:
+        """First-improvement descent over move/add/drop/swap; returns the number of moves applied."""
+        count = {key: 0 for key in self._tenths}
+        members = {key: set() for key in self._tenths}
+        for t_id, slots in assigned.items():
+            for key in slots:
+                count[key] += 1
+                members[key].add(t_id)
+        cost = {t_id: self._teacher_cost(t_id, slots) for t_id, slots in assigned.items()}
+        
+        def apply(t_id, new_slots, new_cost):
+            for key in assigned[t_id] - new_slots:
+                count[key] -= 1
+                members[key].discard(t_id)
+            for key in new_slots - assigned[t_id]:
+                count[key] += 1
+                members[key].add(t_id)
+            assigned[t_id] = new_slots
+            cost[t_id] = new_cost
+        
+        def improve(t_id):
+            slots = assigned[t_id]
+            outs = list(slots) + [None]
+            ins = [key for key in self._available[t_id] if key not in slots] + [None]
+            rng.shuffle(outs)
+            rng.shuffle(ins)
+            for out_key in outs:
+                for in_key in ins:
+                    if out_key is None and in_key is None:
+                        continue
+                    new_slots = set(slots)
+                    slot_delta = 0
+                    if out_key is not None:
+                        new_slots.discard(out_key)
+                        slot_delta += self._slot_cost(out_key, count[out_key] - 1) - self._slot_cost(out_key, count[out_key])
+                    if in_key is not None:
+                        new_slots.add(in_key)
+                        slot_delta += self._slot_cost(in_key, count[in_key] + 1) - self._slot_cost(in_key, count[in_key])
+                    new_cost = self._teacher_cost(t_id, new_slots)
+                    
+                    # Move / add / drop
+                    if new_cost - cost[t_id] + slot_delta < 0:
+                        apply(t_id, new_slots, new_cost)
+                        return True
+                    
+                    # Swap: another teacher of in_key takes out_key (slot counts unchanged)
+                    if out_key is None or in_key is None:
+                        continue
+                    for other_id in list(members[in_key]):
+                        if out_key in assigned[other_id] or out_key not in self._available_sets[other_id]:
+                            continue
+                        other_slots = (assigned[other_id] - {in_key}) | {out_key}
+                        other_cost = self._teacher_cost(other_id, other_slots)
+                        if new_cost - cost[t_id] + other_cost - cost[other_id] < 0:
+                            apply(t_id, new_slots, new_cost)
+                            apply(other_id, other_slots, other_cost)
+                            return True
+            return False
+        
+        moves = 0
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            order = list(self.teachers)
+            rng.shuffle(order)
+            for t_id in order:
+                if time.perf_counter() >= deadline:
+                    break
+                if improve(t_id):
+                    improved = True
+                    moves += 1
+        return moves
+    
+    def _total_cost(self, assigned: Dict[str, Set[Tuple[int, int]]]) -> int:
+        count = defaultdict(int)
+        for slots in assigned.values():
+            for key in slots:
+                count[key] += 1
+        return (sum(self._teacher_cost(t_id, slots) for t_id, slots in assigned.items())
+                + sum(self._slot_cost(key, count[key]) for key in self._tenths))
+    
+    def _find_violations(self, assigned: Dict[str, Set[Tuple[int, int]]]) -> List[str]:
+        """Describe the hard constraints the schedule still violates."""
+        violations = []
+        for ts in self.time_slots:
+            key = ts.get_time_key()
+            staffed = sum(1 for slots in assigned.values() if key in slots)
+            min_teachers, max_teachers = self._slot_bounds[key]
+            if not min_teachers <= staffed <= max_teachers:
+                violations.append(f"Day {ts.day} {TIME_SLOTS[ts.slot]['name']}: {staffed} teachers "
+                                  f"(allowed {min_teachers}-{max_teachers})")
+        for t_id, slots in assigned.items():
+            hours = sum(self._tenths[key] for key in slots)
+            min_tenths, max_tenths = self._bands[t_id]
+            if not min_tenths <= hours <= max_tenths:
+                violations.append(f"Teacher {t_id}: {hours / 10:.1f}h "
+                                  f"(target {self.teachers[t_id].required_hours:.1f}h)")
+        return violations
+    
+    def solve(self, time_limit: Optional[float] = None,
+              profile: Optional[SolverProfile] = None) -> bool:
+        """Greedy construction then local search.
+        
+        The search stops at a local optimum or after time_limit seconds
+        (default GREEDY_TIME_LIMIT); only the profile's random seed is used.
+        Returns True with a schedule even when it is only near-feasible
+        (see self.violations and status_name).
+        """
+        print("\n" + "="*70)
+        print("SOLVING (GREEDY + LOCAL SEARCH)")
+        print("="*70)
+        
+        start = time.perf_counter()
+        deadline = start + (time_limit if time_limit is not None else GREEDY_TIME_LIMIT)
+        rng = random.Random(profile.random_seed if profile and profile.random_seed is not None else 0)
+        
+        assigned = self._construct()
+        construct_cost = self._total_cost(assigned)
+        construct_time = time.perf_counter() - start
+        moves = self._local_search(assigned, deadline, rng)
+        
+        self.solution = {
+            'slot_teachers': defaultdict(list),
+            'teacher_slots': defaultdict(list),
+            'teacher_hours': defaultdict(float)
+        }
+        for t_id in sorted(assigned):
+            for key in sorted(assigned[t_id]):
+                self.solution['slot_teachers'][key].append(t_id)
+                self.solution['teacher_slots'][t_id].append(key)
+                self.solution['teacher_hours'][t_id] += self.time_slot_dict[key].get_hours()
+        
+        self.violations = self._find_violations(assigned)
+        self.status_name = 'NEAR_FEASIBLE' if self.violations else 'FEASIBLE'
+        
+        print(f"\n  ✓ Construction: cost {construct_cost} in {construct_time:.3f}s")
+        print(f"  ✓ Local search: {moves} moves, cost {self._total_cost(assigned)} "
+              f"in {time.perf_counter() - start:.3f}s total")
+        if self.violations:
+            print(f"⚠ NEAR-FEASIBLE schedule: {len(self.violations)} hard constraints violated")
+            for violation in self.violations[:10]:
+                print(f"    - {violation}")
+            if len(self.violations) > 10:
+                print(f"    ... and {len(self.violations) - 10} more")
+        else:
+            print("✓ FEASIBLE solution found (heuristic, not proven optimal)")
+        return True
+
+
 # ============================================================================
 # MAIN
 # ============================================================================
 
-if __name__ == "__main__":
+def main(argv: Optional[List[str]] = None, canceller: Optional[SearchCanceller] = None) -> int:
+    """Command line entry point; returns the process exit code.
+    
+    argv defaults to sys.argv[1:]. canceller lets a caller that owns stdin
+    and the signals (worker.py) stop the search; by default one listening
+    to stdin and to the signals is installed.
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if PROFILE_STARTUP_FLAG in argv:
+        argv = [arg for arg in argv if arg != PROFILE_STARTUP_FLAG]
+        exit_code = profile_startup(os.path.abspath(__file__), argv, HEAVY_MODULES)
+        if exit_code is not None:
+            return exit_code
+    
     print("="*70)
     print("EXAM SCHEDULING SYSTEM - SLOT-BASED ASSIGNMENT")
     print("="*70)
     
     # Configuration: Grade-based hours (default values)
-    GRADE_HOURS = {
-        "PR": 6.0,   # Professeur
-        "MA": 10.5,   # Maître Assistant  
-        "MC": 6.0,   # Maître de Conférences
-        "AC": 13.5,    # Assistant Contractuel
-        "AS": 12.0,    # Assistant
-        "PTC": 13.5,   # PTC
-        "PES": 13.5,   # PES
-        "V": 6.0,     # Vacataire
-        "EX": 4.5     # External
-    }
+    GRADE_HOURS = dict(DEFAULT_GRADE_HOURS)
     
     # Check for command line arguments
     import argparse
-    import json
     
     parser = argparse.ArgumentParser(description='Exam scheduling system')
     parser.add_argument('--grade-hours', type=str, help='JSON string with grade hours configuration')
-    args = parser.parse_args()
+    parser.add_argument('--preset', choices=sorted(SOLVER_PRESETS),
+                        help='Solver profile preset (fast / balanced / thorough)')
+    parser.add_argument('--time-limit', type=float, help='Solver time limit in seconds (default: 30)')
+    parser.add_argument('--workers', type=int, help='Number of CP-SAT search workers (0 = all cores)')
+    parser.add_argument('--seed', type=int, help='CP-SAT random seed')
+    parser.add_argument('--gap', type=float, help='Relative gap tolerance, e.g. 0.02 for 2%%')
+    parser.add_argument('--log-search', action='store_true', help='Print the CP-SAT search log')
+    parser.add_argument('--sparse', action='store_true',
+                        help='Only create assignment variables for available (teacher, slot) pairs')
+    parser.add_argument('--gap-formulation', choices=GAP_FORMULATIONS, default='reified',
+                        help='How time/day gap penalties are modelled (default: reified)')
+    parser.add_argument('--hint-from', type=str, metavar='XLSX',
+                        help='Warm-start from a previous schedule_solution.xlsx')
+    parser.add_argument('--repair-from', type=str, metavar='XLSX',
+                        help='Repair a published schedule with as few changed assignments as possible')
+    parser.add_argument('--check-only', action='store_true',
+                        help='Only run the pre-solve feasibility check (no solver)')
+    parser.add_argument('--explain', action='store_true',
+                        help='On infeasibility, write a conflicting subset of constraints to infeasibility_core.json')
+    parser.add_argument('--hours-tolerance', type=float, default=0.0, metavar='HOURS',
+                        help='Allow teachers to deviate from their target hours by up to HOURS (penalized)')
+    parser.add_argument('--staged', action='store_true',
+                        help='Optimize the priorities one after the other (lexicographic) instead of a weighted sum')
+    parser.add_argument('--stage-time-limits', type=float, nargs='+', metavar='SECONDS',
+                        help='Time budget per stage for --staged (default: time limit split evenly)')
+    parser.add_argument('--model-report', action='store_true',
+                        help='Compare dense and sparse model sizes and presolve times, then exit')
+    parser.add_argument('--decompose', choices=DECOMPOSITION_SPLITS,
+                        help='Solve day by day (or week by week) in parallel after allocating hours across days')
+    parser.add_argument('--processes', type=int,
+                        help='Number of processes for --decompose (default: all cores)')
+    parser.add_argument('--engine', choices=('cpsat', 'greedy'), default='cpsat',
+                        help='cpsat (default) or greedy: heuristic preview in about a second '
+                             '(--time-limit is then the local search budget)')
+    parser.add_argument('--greedy-hint', action='store_true',
+                        help='Seed CP-SAT with a greedy schedule')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write every improving solution to stdout as a JSON line')
+    parser.add_argument('--checkpoint', nargs='?', const='solver_checkpoint.json', metavar='JSON',
+                        help='Keep the best solution so far in a checkpoint file (default: solver_checkpoint.json)')
+    parser.add_argument('--resume-from', type=str, metavar='JSON',
+                        help='Warm-start from a checkpoint written by --checkpoint')
+    parser.add_argument('--no-input-cache', action='store_true',
+                        help=f'Always re-parse the Excel inputs (no read/write of {INPUT_CACHE_DIR}/)')
+    parser.add_argument(PROFILE_STARTUP_FLAG, action='store_true',
+                        help='Run under python -X importtime and print the per-import cost on stderr')
+    args = parser.parse_args(argv)
+    if args.decompose and (args.repair_from or args.staged):
+        parser.error('--decompose cannot be combined with --repair-from or --staged')
+    if args.engine == 'greedy' and (args.decompose or args.repair_from or args.staged or args.greedy_hint):
+        parser.error('--engine greedy cannot be combined with --decompose, --repair-from, --staged or --greedy-hint')
+    if sum(bool(option) for option in (args.hint_from, args.greedy_hint, args.resume_from)) > 1:
+        parser.error('--hint-from, --greedy-hint and --resume-from are mutually exclusive')
+    if (args.stream or args.checkpoint) and (args.engine == 'greedy' or args.decompose or args.repair_from):
+        parser.error('--stream and --checkpoint only apply to the CP-SAT solve '
+                     '(not greedy, --decompose or --repair-from)')
     
     # Override default grade hours if provided via command line
     if args.grade_hours:
@@ -834,6 +2609,21 @@ if __name__ == "__main__":
             print(f"Error parsing grade hours JSON: {e}")
             print("Using default grade hours configuration")
     
+    # Solver profile: preset first, then individual overrides
+    solver_profile = SolverProfile(**vars(SOLVER_PRESETS[args.preset])) if args.preset else SolverProfile()
+    if args.time_limit is not None:
+        solver_profile.time_limit = args.time_limit
+    if args.workers is not None:
+        solver_profile.num_workers = args.workers
+    if args.seed is not None:
+        solver_profile.random_seed = args.seed
+    if args.gap is not None:
+        solver_profile.relative_gap_limit = args.gap
+    if args.log_search:
+        solver_profile.log_search_progress = True
+    
+    print(f"\nSolver profile: {args.preset or 'default'} ({solver_profile})")
+    
     print("\nGrade Hours Configuration:")
     for grade, hours in sorted(GRADE_HOURS.items()):
         print(f"  - {grade}: {hours}h")
@@ -847,18 +2637,29 @@ if __name__ == "__main__":
     print("IMPORTING DATA")
     print("="*70)
     
-    # Import data
+    # Wall time of each step of the run, for the instrumentation report
+    run_times = {}
+    step_start = time.perf_counter()
+    
+    # Import data (parsed structures cached on disk, see InputCache)
+    input_cache = InputCache(enabled=not args.no_input_cache)
+    
     print(f"\n1. Loading teachers from {TEACHERS_FILE}...")
-    teachers = DataImporter.import_teachers(
-        TEACHERS_FILE, 
-        GRADE_HOURS
-    )
+    teachers = DataImporter.import_teachers(TEACHERS_FILE, GRADE_HOURS,
+                                            model=load_teachers(TEACHERS_FILE, input_cache))
     
     print(f"\n2. Loading exams and grouping by time slots from {EXAMS_FILE}...")
-    time_slots = DataImporter.import_exams_as_slots(EXAMS_FILE)
+    time_slots = DataImporter.import_exams_as_slots(EXAMS_FILE, model=load_exams(EXAMS_FILE, input_cache))
     
     print(f"\n3. Loading unavailability from {UNAVAILABILITY_FILE}...")
-    DataImporter.import_unavailability(UNAVAILABILITY_FILE, teachers, TEACHERS_FILE)
+    unavailability = input_cache.load_or_parse(
+        "unavailability", [UNAVAILABILITY_FILE, TEACHERS_FILE], None,
+        lambda: DataImporter.import_unavailability(UNAVAILABILITY_FILE, teachers, TEACHERS_FILE))
+    for teacher in teachers:
+        teacher.unavailable_slots.update(unavailability.get(teacher.id, ()))
+    
+    print(f"\n{input_cache.summary()}")
+    run_times['import'] = time.perf_counter() - step_start
     
     # Summary
     print(f"\n{'='*70}")
@@ -933,27 +2734,133 @@ if __name__ == "__main__":
     if available_responsible > 0:
         print(f"\n✓ Will optimize to use {available_responsible} available responsible teachers when possible")
     
+    # Pre-solve feasibility check (hard constraints only, no solver)
+    print(f"\n{'='*70}")
+    print("FEASIBILITY CHECK")
+    print("="*70)
+    
+    step_start = time.perf_counter()
+    feasibility = check_feasibility(teachers, time_slots, max_extra_teachers=MAX_EXTRA_TEACHERS,
+                                    hours_tolerance=args.hours_tolerance)
+    run_times['feasibility'] = time.perf_counter() - step_start
+    feasibility.print_report()
+    
+    def write_infeasibility_core():
+        """Run the assumption-based explanation and save it for the UI."""
+        core = SlotBasedScheduler(teachers, time_slots,
+                                  hours_tolerance=args.hours_tolerance).explain_infeasibility()
+        if core is not None:
+            with open("infeasibility_core.json", "w", encoding="utf-8") as f:
+                json.dump(core, f, indent=2, ensure_ascii=False)
+            print("\n✓ Conflicting constraints written to infeasibility_core.json")
+    
+    if not feasibility.feasible:
+        with open("feasibility_report.json", "w", encoding="utf-8") as f:
+            json.dump(feasibility.to_dict(), f, indent=2, ensure_ascii=False)
+        print("\n✓ Details written to feasibility_report.json")
+        if args.explain:
+            write_infeasibility_core()
+        print("\n" + "="*70)
+        print("❌ INSTANCE IS INFEASIBLE - SOLVER NOT STARTED")
+        print("="*70)
+        return 1
+    
+    if args.check_only:
+        return 0
+    
+    if args.model_report:
+        SlotBasedScheduler.print_model_size_report(teachers, time_slots)
+        return 0
+    
     # Solve
     print(f"\n{'='*70}")
     print("STARTING OPTIMIZATION")
     print("="*70)
     
-    scheduler = SlotBasedScheduler(teachers, time_slots)
-        
-    if scheduler.solve(time_limit=30):
+    step_start = time.perf_counter()
+    if args.engine == 'greedy':
+        scheduler = GreedyScheduler(teachers, time_slots, hours_tolerance=args.hours_tolerance)
+    elif args.decompose:
+        scheduler = DecomposedScheduler(teachers, time_slots, split=args.decompose,
+                                        max_workers=args.processes, sparse=args.sparse,
+                                        gap_formulation=args.gap_formulation,
+                                        hours_tolerance=args.hours_tolerance)
+    else:
+        if canceller is None:
+            # "stop" on stdin or Ctrl+C / SIGTERM stops the search and keeps the best solution
+            canceller = SearchCanceller()
+            canceller.install()
+        scheduler = SlotBasedScheduler(teachers, time_slots, sparse=args.sparse,
+                                       gap_formulation=args.gap_formulation,
+                                       hours_tolerance=args.hours_tolerance, stream=args.stream,
+                                       checkpoint_path=args.checkpoint, canceller=canceller)
+    
+    if args.hint_from:
+        print(f"\nLoading solution hint from {args.hint_from}...")
+        scheduler.set_solution_hint(DataImporter.import_previous_solution(args.hint_from, time_slots))
+    
+    if args.resume_from:
+        print(f"\nResuming from checkpoint {args.resume_from}...")
+        scheduler.set_solution_hint(DataImporter.import_checkpoint(args.resume_from, time_slots))
+    
+    if args.greedy_hint:
+        print("\nComputing a greedy schedule to seed CP-SAT...")
+        greedy = GreedyScheduler(teachers, time_slots, hours_tolerance=args.hours_tolerance)
+        greedy.solve(profile=solver_profile)
+        scheduler.set_solution_hint(greedy.get_assignment_set(), repair=bool(greedy.violations))
+        
+    if args.repair_from:
+        print(f"\nLoading published schedule from {args.repair_from}...")
+        baseline = DataImporter.import_previous_solution(args.repair_from, time_slots)
+        solved = scheduler.repair(baseline, profile=solver_profile)
+    elif args.staged:
+        solved = scheduler.solve_lexicographic(args.stage_time_limits, profile=solver_profile)
+    elif args.engine == 'greedy':
+        solved = scheduler.solve(time_limit=args.time_limit, profile=solver_profile)
+    else:
+        solved = scheduler.solve(profile=solver_profile)
+    run_times['solve'] = time.perf_counter() - step_start
+    
+    if solved:
         scheduler.print_solution()
-        scheduler.export_solution_to_excel("schedule_solution.xlsx")
+        
+        print(f"\n{'='*70}")
+        print("ROOM ASSIGNMENT")
+        print("="*70)
+        rooms = assign_rooms(scheduler.solution['slot_teachers'], time_slots)
+        rooms.print_report()
+        run_times['rooms'] = rooms.elapsed
+        
+        step_start = time.perf_counter()
+        scheduler.export_solution_to_excel("schedule_solution.xlsx", rooms=rooms)
+        run_times['export'] = time.perf_counter() - step_start
+        if scheduler.repair_changes is not None:
+            scheduler.print_repair_changes()
+            with open("repair_changes.json", "w", encoding="utf-8") as f:
+                json.dump({
+                    'changed_teachers': scheduler.repair_changes['changed_teachers'],
+                    'added': [[t_id, day, slot] for t_id, (day, slot) in scheduler.repair_changes['added']],
+                    'removed': [[t_id, day, slot] for t_id, (day, slot) in scheduler.repair_changes['removed']],
+                }, f, indent=2)
+            print("\n✓ Changes written to repair_changes.json")
         print("\n" + "="*70)
         print("✓ SCHEDULE COMPLETE!")
         print("="*70)
         print("\nThe solution file 'schedule_solution.xlsx' includes:")
-        print("  - Teacher assignments by TIME SLOT (not specific rooms)")
+        print("  - Teacher assignments by TIME SLOT")
+        print(f"  - The room of each teacher (Salle: {ROOM_INVIGILATORS} per exam room, "
+              f"responsible teachers in their own exam's room, '{RESERVE_ROOM}' for the extra teachers)")
         print("  - Teacher names (Nom, Prénom) and emails")
         print("  - Number of exams per slot")
         print("  - Responsible teacher indicators")
-        print("\nNote: Teachers are assigned to time slots. You can distribute them")
-        print("      to specific exam rooms manually or randomly within each slot.")
+    elif canceller is not None and canceller.cancelled.is_set():
+        # Stopped before any solution: nothing to keep, and nothing to diagnose
+        print("\n" + "="*70)
+        print("⚠ SEARCH CANCELLED BEFORE A FIRST SOLUTION - NO SCHEDULE WRITTEN")
+        print("="*70)
     else:
+        if args.explain and scheduler.status_name == 'INFEASIBLE':
+            write_infeasibility_core()
         print("\n" + "="*70)
         print("❌ COULD NOT FIND SOLUTION")
         print("="*70)
@@ -966,4 +2873,30 @@ if __name__ == "__main__":
         print("  - Adjust GRADE_HOURS values to match total workload needed")
         print("  - Review unavailability constraints in Souhaits Enseignants.xlsx")
         print("  - Consider reducing buffer requirements")
-        print("  - Add more teachers to the pool")
\ No newline at end of file
+        print("  - Add more teachers to the pool")
+    
+    # Machine-readable timings, model size and solver statistics, to follow regressions across runs
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'arguments': argv,
+        'solved': solved,
+        'instance': {
+            'teachers': len(teachers),
+            'time_slots': len(time_slots),
+            'exams': sum(ts.num_exams for ts in time_slots),
+        },
+        'run_times': run_times,
+        'input_cache': {'hits': input_cache.hits, 'misses': input_cache.misses},
+        **scheduler.get_instrumentation_report(),
+    }
+    with open(SOLVE_REPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n✓ Instrumentation report written to {SOLVE_REPORT_FILE}")
+    
+    # Non-zero without a schedule, so callers never pick up the file of an earlier run
+    return 0 if solved else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Block subproblems run in child processes (PyInstaller build)
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Room Assignment
+===============
+
+Second stage after the slot-level schedule: the teachers of each time slot
+(solution['slot_teachers']) are placed in the rooms of the slot's exams,
+ROOM_INVIGILATORS per exam, taken from the repartition rows
+(TimeSlotInfo.exam_rooms / exam_responsibles). A responsible teacher goes to
+the room of their own exam whenever they are scheduled on that slot. The
+teachers of the slot beyond the room seats form its reserve (RESERVE_ROOM).
+
+Per slot this is a min-cost perfect matching between the slot's teachers
+and the seats (two per exam, then the reserve), solved with OR-Tools'
+linear sum assignment: seat cost 0 for a responsible teacher in their own
+exam's room, MISPLACED_COST for them anywhere else, 0 for everybody else.
+Slots are independent and solved in a thread pool.
+
+Works on any time slot objects exposing the TimeSlotInfo interface of
+main.py.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import time
+
+from startup import LazyModule
+
+if TYPE_CHECKING:  # real imports, also seen by PyInstaller's analysis
+    import numpy as np
+    from ortools.graph.python import linear_sum_assignment
+else:
+    np = LazyModule("numpy")
+    linear_sum_assignment = LazyModule("ortools.graph.python.linear_sum_assignment")
+
+
+# Invigilators per exam room (the slot minimum is exams × 2)
+ROOM_INVIGILATORS = 2
+
+# Room label of the teachers beyond the room seats of their slot
+RESERVE_ROOM = "Réserve"
+
+# Cost of a responsible teacher placed outside their own exam's room
+MISPLACED_COST = 1
+
+
+@dataclass
+class RoomAssignment:
+    """Result of assign_rooms()."""
+    rooms: Dict[Tuple[int, int], Dict[str, str]]  # (day, slot) -> teacher_id -> room (or RESERVE_ROOM)
+    responsible_present: int  # responsible teachers scheduled on the slot of their exam
+    responsible_in_room: int  # ... and placed in their exam's room
+    unfilled_seats: int  # room seats left empty (slots with fewer teachers than exams × 2)
+    elapsed: float  # seconds
+
+    def room_of(self, slot_key: Tuple[int, int], teacher_id: str) -> str:
+        return self.rooms.get(slot_key, {}).get(teacher_id, "")
+
+    def print_report(self):
+        """Print the summary in the same style as the scheduler output."""
+        reserve = sum(1 for slot_rooms in self.rooms.values()
+                      for room in slot_rooms.values() if room == RESERVE_ROOM)
+        print(f"✓ Rooms assigned for {len(self.rooms)} time slots in {self.elapsed * 1000:.1f} ms")
+        print(f"  - Responsible teachers in their exam's room: "
+              f"{self.responsible_in_room}/{self.responsible_present}")
+        print(f"  - Reserve teachers (beyond {ROOM_INVIGILATORS} per room): {reserve}")
+        if self.unfilled_seats:
+            print(f"  ⚠ {self.unfilled_seats} room seats without an invigilator")
+
+
+def _assign_slot(teacher_ids: List[str], exam_rooms: List[str],
+                 exam_responsibles: List[str]) -> Tuple[Dict[str, str], int, int, int]:
+    """Matching of one slot: (teacher_id -> room, responsible present, in room, unfilled seats)."""
+    teacher_ids = sorted(teacher_ids)
+    seat_exams = np.repeat(np.arange(len(exam_rooms)), ROOM_INVIGILATORS)
+    num_seats = len(seat_exams)
+    # Square problem: reserve seats for extra teachers, empty teacher rows for missing ones
+    size = max(len(teacher_ids), num_seats)
+    if size == 0:
+        return {}, 0, 0, 0
+
+    costs = np.zeros((size, size), dtype=np.int64)
+    teacher_row = {teacher_id: i for i, teacher_id in enumerate(teacher_ids)}
+    own_exams = {}
+    for exam, teacher_id in enumerate(exam_responsibles):
+        if teacher_id in teacher_row:
+            own_exams.setdefault(teacher_row[teacher_id], set()).add(exam)
+    for row, exams in own_exams.items():
+        costs[row, :] = MISPLACED_COST
+        costs[row, :num_seats][np.isin(seat_exams, list(exams))] = 0
+
+    rows, columns = np.indices((size, size))
+    assignment = linear_sum_assignment.SimpleLinearSumAssignment()
+    assignment.add_arcs_with_cost(rows.ravel().astype(np.int32), columns.ravel().astype(np.int32),
+                                  costs.ravel())
+    if assignment.solve() != assignment.OPTIMAL:
+        raise RuntimeError("Room assignment failed")
+
+    rooms = {}
+    in_room = 0
+    for row, teacher_id in enumerate(teacher_ids):
+        seat = assignment.right_mate(row)
+        rooms[teacher_id] = exam_rooms[seat_exams[seat]] if seat < num_seats else RESERVE_ROOM
+        if row in own_exams and costs[row, seat] == 0:
+            in_room += 1
+    unfilled = max(0, num_seats - len(teacher_ids))
+    return rooms, len(own_exams), in_room, unfilled
+
+
+def assign_rooms(slot_teachers: Dict[Tuple[int, int], List[str]], time_slots: List,
+                 max_workers: Optional[int] = None) -> RoomAssignment:
+    """Place the teachers of every slot in the rooms of its exams (see module docstring)."""
+    start = time.perf_counter()
+    tasks = [(ts.get_time_key(), slot_teachers.get(ts.get_time_key(), []),
+              ts.exam_rooms or list(ts.exam_ids), ts.exam_responsibles) for ts in time_slots]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(lambda task: _assign_slot(*task[1:]), tasks))
+
+    rooms = {}
+    present = in_room = unfilled = 0
+    for (slot_key, *_), (slot_rooms, slot_present, slot_in_room, slot_unfilled) in zip(tasks, results):
+        rooms[slot_key] = slot_rooms
+        present += slot_present
+        in_room += slot_in_room
+        unfilled += slot_unfilled
+
+    return RoomAssignment(rooms=rooms, responsible_present=present, responsible_in_room=in_room,
+                          unfilled_seats=unfilled, elapsed=time.perf_counter() - start)
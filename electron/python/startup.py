@@ -0,0 +1,145 @@
+"""
+Start-up cost helpers
+=====================
+
+- LazyModule: stands in for a heavy module (pandas, ortools, docx2pdf...)
+  and imports it on first attribute access, so a script only pays for the
+  libraries its code path actually uses.
+- profile_startup: implementation of the --profile-startup flag shared by
+  main.py, analyze_surveillance.py and generate_docs.py. The command is
+  re-run under `python -X importtime` and the per-import cost is
+  summarized on stderr (stdout is left untouched, it may carry JSON).
+
+Usage in a script:
+
+    if TYPE_CHECKING:  # real imports, also seen by PyInstaller's analysis
+        import pandas as pd
+    else:
+        pd = LazyModule("pandas")
+"""
+
+import importlib
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PROFILE_STARTUP_FLAG = "--profile-startup"
+
+# Rows shown per table of the summary
+PROFILE_TOP = 15
+
+
+class LazyModule:
+    """Module proxy: the real import happens on first attribute access."""
+
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        if self._module is None:
+            # __import__ rather than importlib.import_module: only the former
+            # is recorded by -X importtime
+            __import__(self._name)
+            self.__dict__['_module'] = sys.modules[self._name]
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule '{self._name}' ({state})>"
+
+
+def parse_importtime(lines: Sequence[str]) -> List[Tuple[str, int, int, int]]:
+    """Parse `-X importtime` lines into (module, self_us, cumulative_us, depth) rows."""
+    rows = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line "self [us] | cumulative | imported package"
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((stripped, int(fields[0]), int(fields[1]), depth))
+    return rows
+
+
+def print_import_summary(rows: List[Tuple[str, int, int, int]], wall_time: Optional[float] = None,
+                         top: int = PROFILE_TOP, file=None):
+    """Summarize the importtime rows: totals, top-level imports, self time per package."""
+    file = file or sys.stderr
+    total_us = sum(self_us for _, self_us, _, _ in rows)
+
+    per_package: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    for name, self_us, _, _ in rows:
+        package = per_package[name.split(".")[0]]
+        package[0] += self_us
+        package[1] += 1
+
+    top_level = sorted((row for row in rows if row[3] == 0), key=lambda row: -row[2])
+
+    print("\n" + "=" * 70, file=file)
+    print("STARTUP IMPORT PROFILE (python -X importtime)", file=file)
+    print("=" * 70, file=file)
+    print(f"Modules imported: {len(rows)}", file=file)
+    print(f"Total import time: {total_us / 1000:.1f} ms", file=file)
+    if wall_time is not None:
+        print(f"Command wall time: {wall_time:.2f} s", file=file)
+
+    print(f"\n{'Top-level import':<42}{'Cumulative (ms)':>16}{'Share':>8}", file=file)
+    print("-" * 66, file=file)
+    for name, _, cumulative_us, _ in top_level[:top]:
+        share = 100 * cumulative_us / total_us if total_us else 0.0
+        print(f"{name:<42}{cumulative_us / 1000:>16.1f}{share:>7.1f}%", file=file)
+
+    print(f"\n{'Package':<30}{'Modules':>9}{'Self (ms)':>12}{'Share':>8}", file=file)
+    print("-" * 59, file=file)
+    for package, (self_us, count) in sorted(per_package.items(), key=lambda item: -item[1][0])[:top]:
+        share = 100 * self_us / total_us if total_us else 0.0
+        print(f"{package:<30}{count:>9}{self_us / 1000:>12.1f}{share:>7.1f}%", file=file)
+
+
+def profile_startup(script: str, argv: Sequence[str], heavy_modules: Sequence[str] = ()) -> Optional[int]:
+    """Run the command with its per-import cost profiled (--profile-startup).
+
+    From source, the script is re-run as `python -X importtime script argv`:
+    its stdout passes through unchanged, its stderr is forwarded without the
+    importtime lines, and the summary is printed on stderr. Returns the exit
+    code of that run.
+
+    A PyInstaller executable cannot take -X options: heavy_modules are then
+    imported one by one in-process and timed (each time includes the
+    dependencies not loaded yet), and None is returned so the caller runs
+    the command itself.
+    """
+    if getattr(sys, 'frozen', False):
+        print(f"\n{'Module (frozen, in-process)':<42}{'Import (ms)':>12}", file=sys.stderr)
+        print("-" * 54, file=sys.stderr)
+        for name in heavy_modules:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+                elapsed = f"{(time.perf_counter() - start) * 1000:>12.1f}"
+            except ImportError as e:
+                elapsed = f"  unavailable ({e})"
+            print(f"{name:<42}{elapsed}", file=sys.stderr)
+        return None
+
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-X", "importtime", script, *argv],
+                               stderr=subprocess.PIPE, encoding="utf-8", errors="replace")
+    importtime_lines = []
+    for line in process.stderr:
+        if line.startswith("import time:"):
+            importtime_lines.append(line)
+        else:
+            sys.stderr.write(line)
+    exit_code = process.wait()
+    print_import_summary(parse_importtime(importtime_lines), wall_time=time.perf_counter() - start)
+    return exit_code
@@ -0,0 +1,215 @@
+"""
+Synthetic instance generator
+============================
+
+Writes the three workbooks DataImporter reads (Enseignants_participants.xlsx,
+Souhaits_avec_ids.xlsx, Répartition_SE_dedup.xlsx, same columns and cell
+formats as the bundled ones) for an instance of any size, so the scheduler
+can be tried beyond the single bundled session.
+
+Parameters (InstanceSpec):
+- teachers_per_grade: participating teachers of each grade; their target
+  hours come from DEFAULT_GRADE_HOURS.
+- days: exam days (consecutive dates, Sundays skipped), 4 slots each.
+- exams_per_slot: exams in every slot. By default it is derived from the
+  teachers' hours so that the slot minimums (2 teachers per exam) fit the
+  hours available, see balanced_exams_per_slot.
+- unavailability: probability that a teacher asks to be free on a given
+  slot. Souhaits rows give the day as a weekday name that DataImporter
+  reads as the exam day number (Lundi = day 1 ... Dimanche = day 7), so only
+  the first 7 days can carry wishes.
+- responsible_ratio: share of the exams whose responsible teacher is in the
+  participating pool; the other exams point to non-participating teachers
+  of the teachers workbook, as in the real exports.
+
+Usage: python synthetic_instance.py OUTPUT_DIR [--teachers-per-grade MA=31 PTC=17 ...]
+           [--days 6] [--exams-per-slot N] [--unavailability 0.05]
+           [--responsible-ratio 0.6] [--seed 0]
+"""
+
+import argparse
+import math
+import os
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+import pandas as pd
+
+from main import DEFAULT_GRADE_HOURS, TIME_SLOTS
+
+TEACHERS_FILE = "Enseignants_participants.xlsx"
+UNAVAILABILITY_FILE = "Souhaits_avec_ids.xlsx"
+EXAMS_FILE = "Répartition_SE_dedup.xlsx"
+
+# Grade mix of the bundled session (87 participating teachers)
+BUNDLED_TEACHERS_PER_GRADE = {
+    'MA': 31, 'PTC': 17, 'V': 12, 'AC': 8, 'PR': 5, 'AS': 3, 'PES': 3, 'EX': 3, 'MC': 3,
+}
+
+# Day names as DataImporter.import_unavailability numbers them
+DAY_NAMES = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
+
+# First exam date (a Monday)
+FIRST_DATE = date(2025, 5, 12)
+
+# Non-participating teachers per participating one (responsible teachers outside the pool)
+NON_PARTICIPATING_SHARE = 0.4
+
+
+@dataclass
+class InstanceSpec:
+    """Size and shape of a synthetic instance."""
+    teachers_per_grade: Dict[str, int] = field(default_factory=lambda: dict(BUNDLED_TEACHERS_PER_GRADE))
+    days: int = 6
+    exams_per_slot: Optional[int] = None  # None: balanced_exams_per_slot()
+    unavailability: float = 0.05
+    responsible_ratio: float = 0.6
+    seed: int = 0
+
+    def scaled(self, factor: int) -> 'InstanceSpec':
+        """Same spec with factor times the teachers of each grade and the days."""
+        return InstanceSpec(
+            teachers_per_grade={grade: count * factor for grade, count in self.teachers_per_grade.items()},
+            days=self.days * factor,
+            exams_per_slot=self.exams_per_slot,
+            unavailability=self.unavailability,
+            responsible_ratio=self.responsible_ratio,
+            seed=self.seed,
+        )
+
+
+def balanced_exams_per_slot(spec: InstanceSpec) -> int:
+    """Largest exams per slot whose minimum coverage (2 teachers per exam) fits the teachers' hours."""
+    slot_hours = TIME_SLOTS[1]['hours']
+    teacher_slots = sum(count * DEFAULT_GRADE_HOURS.get(grade, 9.0) / slot_hours
+                        for grade, count in spec.teachers_per_grade.items())
+    return max(1, math.floor(teacher_slots / (2 * 4 * spec.days)))
+
+
+def exam_dates(days: int):
+    """The first `days` dates from FIRST_DATE, Sundays skipped."""
+    dates = []
+    current = FIRST_DATE
+    while len(dates) < days:
+        if current.weekday() != 6:
+            dates.append(current)
+        current += timedelta(days=1)
+    return dates
+
+
+def generate_instance(directory: str, spec: InstanceSpec) -> Dict[str, int]:
+    """Write the three workbooks of the instance into directory.
+
+    Returns the instance size: participating teachers, time slots, exams
+    and exams per slot.
+    """
+    if sum(spec.teachers_per_grade.values()) <= 0:
+        raise ValueError("teachers_per_grade must contain at least one participating teacher")
+    rng = random.Random(spec.seed)
+    exams_per_slot = spec.exams_per_slot or balanced_exams_per_slot(spec)
+
+    # Teachers: participating ones first (codes 1..N), then the non-participating ones
+    grades = [grade for grade, count in spec.teachers_per_grade.items() for _ in range(count)]
+    rng.shuffle(grades)
+    participating = len(grades)
+    grades += [rng.choice(list(spec.teachers_per_grade)) for _ in range(math.ceil(participating * NON_PARTICIPATING_SHARE))]
+    teachers = pd.DataFrame({
+        'nom_ens': [f"Nom{code}" for code in range(1, len(grades) + 1)],
+        'prenom_ens': [f"Prenom{code}" for code in range(1, len(grades) + 1)],
+        'email_ens': [f"prenom{code}.nom{code}@isi.utm.tn" for code in range(1, len(grades) + 1)],
+        'grade_code_ens': grades,
+        'code_smartex_ens': [float(code) for code in range(1, len(grades) + 1)],
+        'participe_surveillance': [code <= participating for code in range(1, len(grades) + 1)],
+    })
+
+    # Wishes: one row per (teacher, day) with at least one slot to keep free, "P.NOM" names
+    wishes = []
+    for code in range(1, participating + 1):
+        for day_name in DAY_NAMES[:min(spec.days, len(DAY_NAMES))]:
+            seances = [TIME_SLOTS[slot]['name'] for slot in TIME_SLOTS if rng.random() < spec.unavailability]
+            if seances:
+                wishes.append({
+                    'Enseignant': f"P.NOM{code}",
+                    'Semestre': "Semestre 2",
+                    'Session': "Partiel",
+                    'Jour': day_name,
+                    'Séances': ",".join(seances),
+                })
+    wishes = pd.DataFrame(wishes, columns=['Enseignant', 'Semestre', 'Session', 'Jour', 'Séances'])
+
+    # Exams: every slot of every day, one room each, responsible teacher in or out of the pool
+    exams = []
+    for exam_date in exam_dates(spec.days):
+        for slot, slot_info in TIME_SLOTS.items():
+            for room in range(1, exams_per_slot + 1):
+                # Without non-participating teachers every responsible teacher is in the pool
+                if len(grades) == participating or rng.random() < spec.responsible_ratio:
+                    responsible = rng.randint(1, participating)
+                else:
+                    responsible = rng.randint(participating + 1, len(grades))
+                exams.append({
+                    'dateExam': exam_date.strftime('%d/%m/%Y'),
+                    'h_debut': f"30/12/1999 {slot_info['start']}:00",
+                    'h_fin': f"30/12/1999 {slot_info['end']}:00",
+                    'session': "P",
+                    'type ex': "E",
+                    'semestre': "SEMESTRE 2",
+                    'enseignant': responsible,
+                    'cod_salle': f"R{room:03d}",
+                })
+    exams = pd.DataFrame(exams)
+
+    os.makedirs(directory, exist_ok=True)
+    teachers.to_excel(os.path.join(directory, TEACHERS_FILE), index=False)
+    wishes.to_excel(os.path.join(directory, UNAVAILABILITY_FILE), index=False)
+    exams.to_excel(os.path.join(directory, EXAMS_FILE), index=False)
+
+    return {
+        'teachers': participating,
+        'time_slots': spec.days * len(TIME_SLOTS),
+        'exams': len(exams),
+        'exams_per_slot': exams_per_slot,
+    }
+
+
+def parse_teachers_per_grade(values) -> Dict[str, int]:
+    """GRADE=COUNT arguments to a dict."""
+    counts = {}
+    for value in values:
+        grade, _, count = value.partition('=')
+        counts[grade.strip().upper()] = int(count)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic scheduling instance')
+    parser.add_argument('directory', help='Output directory of the three workbooks')
+    parser.add_argument('--teachers-per-grade', nargs='+', metavar='GRADE=COUNT',
+                        help='Participating teachers per grade (default: the bundled mix)')
+    parser.add_argument('--days', type=int, default=6, help='Exam days')
+    parser.add_argument('--exams-per-slot', type=int, help='Exams per slot (default: fitted to the teachers\' hours)')
+    parser.add_argument('--unavailability', type=float, default=0.05,
+                        help='Probability that a teacher is unavailable on a slot (first 7 days)')
+    parser.add_argument('--responsible-ratio', type=float, default=0.6,
+                        help='Share of exams whose responsible teacher is in the pool')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    spec = InstanceSpec(days=args.days, exams_per_slot=args.exams_per_slot,
+                        unavailability=args.unavailability, responsible_ratio=args.responsible_ratio,
+                        seed=args.seed)
+    if args.teachers_per_grade:
+        spec.teachers_per_grade = parse_teachers_per_grade(args.teachers_per_grade)
+
+    try:
+        size = generate_instance(args.directory, spec)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"✓ Instance written to {args.directory}: {size['teachers']} teachers, "
+          f"{size['time_slots']} time slots, {size['exams']} exams ({size['exams_per_slot']} per slot)")
+
+
+if __name__ == "__main__":
+    main()
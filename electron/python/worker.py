@@ -0,0 +1,282 @@
+"""
+Persistent Python worker
+========================
+
+Long-lived process serving the Electron app over a JSON-RPC style protocol
+on stdin/stdout (one JSON object per line), so the interpreter, pandas,
+OR-Tools and the parsed Excel files (DataImporter cache) stay warm between
+calls instead of paying the start-up cost for every IPC request.
+
+Request:       {"id": 1, "method": "run_scheduler", "params": {"args": [...]}}
+Response:      {"id": 1, "result": {...}}  or  {"id": 1, "error": {"message": "..."}}
+Notifications: {"method": "ready", "params": {...}}
+               {"method": "log", "params": {"id": 1, "text": "..."}}
+               {"method": "solution", "params": {"id": 1, "event": {...}}}
+
+Methods:
+  ping                        -> état du worker (pid, uptime, modules chargés)
+  run_scheduler               {"args": [...]} mêmes arguments que main.py -> {"exit_code"}
+  cancel                      arrête la recherche en cours (la solution est gardée)
+  analyze_surveillance        {"enseignants_file", "planning_file", "ecart_1_2", "ecart_2_3", "ecart_3_4",
+                               "grille"} grille: "min:max:pas" ou liste de triplets
+  generate_global_documents   {"excel_file"}
+  generate_teacher_document   {"excel_file", "teacher_id"}
+  shutdown
+
+Jobs (scheduler, analysis, documents) run one at a time on a background
+thread; ping, cancel and shutdown are answered immediately. Anything printed
+to stdout during a job is forwarded as "log" notifications (streamed
+solutions as "solution" notifications); stray output outside a job goes to
+stderr so the protocol stream stays clean.
+
+Usage: python worker.py
+"""
+
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stdout
+
+# Modules gardés en mémoire entre les requêtes. Les scripts importent pandas,
+# OR-Tools et docx à la demande : le worker les charge dès le démarrage.
+PRELOADED_MODULES = ("main", "analyze_surveillance", "generate_docs",
+                     "pandas", "ortools.sat.python.cp_model", "docx", "docx2pdf")
+
+_protocol = None
+_protocol_lock = threading.Lock()
+
+
+def send(message):
+    """Write one protocol message (a JSON line) on the original stdout."""
+    with _protocol_lock:
+        _protocol.write(json.dumps(message, ensure_ascii=False, default=str) + "\n")
+        _protocol.flush()
+
+
+def take_over_stdout():
+    """
+    Keep a private handle on the original stdout for the protocol and point
+    file descriptor 1 at stderr, so prints and native (OR-Tools) output
+    outside a job can never corrupt the protocol stream.
+    """
+    sys.stdout.flush()
+    protocol_fd = os.dup(1)
+    os.dup2(2, 1)
+    return os.fdopen(protocol_fd, "w", encoding="utf-8", newline="\n")
+
+
+class NotificationWriter(io.TextIOBase):
+    """stdout of a job: each line becomes a "log" notification, stream events a "solution" one."""
+
+    def __init__(self, request_id):
+        self.request_id = request_id
+        self._buffer = ""
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            self._emit(line)
+        return len(text)
+
+    def close_job(self):
+        if self._buffer:
+            self._emit(self._buffer)
+            self._buffer = ""
+
+    def _emit(self, line):
+        if line.startswith('{"type"'):
+            try:
+                send({"method": "solution", "params": {"id": self.request_id, "event": json.loads(line)}})
+                return
+            except ValueError:
+                pass
+        send({"method": "log", "params": {"id": self.request_id, "text": line}})
+
+
+class Worker:
+    """Dispatches the requests read on stdin; runs the jobs on a single background thread."""
+
+    def __init__(self):
+        self.modules = {}
+        self.import_errors = {}
+        self.started_at = time.time()
+        self.requests_served = 0
+        self.jobs = queue.Queue()
+        self.canceller = None
+        self.running = True
+
+    # ------------------------------------------------------------------
+    # Modules
+    # ------------------------------------------------------------------
+
+    def preload(self):
+        for name in PRELOADED_MODULES:
+            try:
+                self.modules[name] = importlib.import_module(name)
+            except Exception as e:
+                # ex. docx2pdf absent : seules les méthodes de ce module échouent
+                self.import_errors[name] = f"{type(e).__name__}: {e}"
+                print(f"⚠️  Module {name} non chargé: {self.import_errors[name]}", file=sys.stderr)
+
+    def module(self, name):
+        if name not in self.modules:
+            raise RuntimeError(f"Module {name} indisponible ({self.import_errors.get(name, 'non chargé')})")
+        return self.modules[name]
+
+    # ------------------------------------------------------------------
+    # Immediate methods (answered on the reader thread)
+    # ------------------------------------------------------------------
+
+    def ping(self, params):
+        return {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started_at, 1),
+            'requests_served': self.requests_served,
+            'modules': sorted(self.modules),
+            'import_errors': self.import_errors,
+            'busy': self.canceller is not None,
+        }
+
+    def cancel(self, params):
+        canceller = self.canceller
+        if canceller is None:
+            return {'cancelled': False}
+        canceller.cancel()
+        return {'cancelled': True}
+
+    def shutdown(self, params):
+        self.running = False
+        self.cancel(params)
+        return {'shutdown': True}
+
+    # ------------------------------------------------------------------
+    # Jobs (run on the job thread)
+    # ------------------------------------------------------------------
+
+    def run_scheduler(self, params):
+        main = self.module("main")
+        self.canceller = main.SearchCanceller()
+        try:
+            try:
+                exit_code = main.main([str(arg) for arg in params.get('args', [])], canceller=self.canceller)
+            except SystemExit as e:
+                # argparse (--help, arguments invalides)
+                exit_code = e.code if isinstance(e.code, int) else 1
+        finally:
+            self.canceller = None
+        return {'exit_code': exit_code}
+
+    def analyze_surveillance(self, params):
+        return self.module("analyze_surveillance").analyze_surveillance_data(
+            params['enseignants_file'],
+            params['planning_file'],
+            params.get('ecart_1_2'),
+            params.get('ecart_2_3'),
+            params.get('ecart_3_4'),
+            grille=params.get('grille'),
+        )
+
+    def generate_global_documents(self, params):
+        return self.module("generate_docs").run_command('global', params['excel_file'])
+
+    def generate_teacher_document(self, params):
+        return self.module("generate_docs").run_command('teacher', params['excel_file'],
+                                                        str(params['teacher_id']))
+
+    IMMEDIATE_METHODS = ("ping", "cancel", "shutdown")
+    JOB_METHODS = ("run_scheduler", "analyze_surveillance",
+                   "generate_global_documents", "generate_teacher_document")
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+
+    def handle_line(self, line):
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            method = request['method']
+            params = request.get('params') or {}
+        except (ValueError, KeyError, AttributeError) as e:
+            send({'id': None, 'error': {'message': f"Requête invalide: {e}"}})
+            return
+
+        if method in self.IMMEDIATE_METHODS:
+            self.reply(request_id, getattr(self, method), params)
+        elif method in self.JOB_METHODS:
+            self.jobs.put((request_id, method, params))
+        else:
+            send({'id': request_id, 'error': {'message': f"Méthode inconnue: {method}"}})
+
+    def reply(self, request_id, handler, params, writer=None):
+        try:
+            if writer is None:
+                result = handler(params)
+            else:
+                with redirect_stdout(writer):
+                    result = handler(params)
+            message = {'id': request_id, 'result': result}
+        except SystemExit as e:
+            # load_enseignants_mapping et co. quittent avec sys.exit
+            message = {'id': request_id, 'error': {'message': f"Arrêt du traitement (code {e.code})"}}
+        except Exception as e:
+            message = {'id': request_id, 'error': {'message': str(e), 'traceback': traceback.format_exc()}}
+        finally:
+            if writer is not None:
+                writer.close_job()
+        self.requests_served += 1
+        send(message)
+
+    def job_loop(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            request_id, method, params = job
+            self.reply(request_id, getattr(self, method), params, writer=NotificationWriter(request_id))
+
+    def serve(self, stdin):
+        job_thread = threading.Thread(target=self.job_loop, daemon=True)
+        job_thread.start()
+        send({'method': 'ready', 'params': self.ping({})})
+
+        for line in stdin:
+            line = line.strip()
+            if line:
+                self.handle_line(line)
+            if not self.running:
+                break
+
+        # Fin de stdin (Electron fermé) ou shutdown : on termine le job en cours
+        self.running = False
+        self.cancel({})
+        self.jobs.put(None)
+        job_thread.join()
+
+
+def main():
+    global _protocol
+    if hasattr(sys.stdin, 'reconfigure'):
+        sys.stdin.reconfigure(encoding='utf-8')
+    _protocol = take_over_stdout()
+
+    worker = Worker()
+    worker.preload()
+    worker.serve(sys.stdin)
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
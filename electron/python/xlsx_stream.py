@@ -0,0 +1,91 @@
+"""
+Streaming workbook reader
+=========================
+
+Reads the first sheet of an .xlsx file row by row with openpyxl in
+read_only mode and keeps only the requested columns, so a large export
+(multi-session, multi-department repartition) is never held in memory as a
+whole DataFrame. Consumers aggregate the rows as they come.
+
+Rows are numbered and blank rows handled like pd.read_excel: the header is
+the first row, blank rows between data rows are kept (all values None),
+trailing blank rows are dropped. With dedupe=True, repeated rows are skipped
+like DataFrame.drop_duplicates(), comparing every column of the raw cell
+values. The set of seen rows keeps a 128-bit BLAKE2 digest per row rather
+than the row itself, so it stays small next to the cells it stands for.
+"""
+
+import hashlib
+from typing import TYPE_CHECKING, Iterator, Sequence, Tuple
+
+from startup import LazyModule
+
+if TYPE_CHECKING:  # real import, also seen by PyInstaller's analysis
+    import openpyxl
+else:
+    openpyxl = LazyModule("openpyxl")
+
+
+def _trim(row: tuple) -> tuple:
+    """Row without its trailing empty cells (read_only rows may be padded)."""
+    end = len(row)
+    while end and row[end - 1] is None:
+        end -= 1
+    return row[:end]
+
+
+def _digest(row: tuple) -> bytes:
+    """Fixed-size key of a row for the duplicate set."""
+    return hashlib.blake2b(repr(row).encode(), digest_size=16).digest()
+
+
+def iter_rows(filepath: str, columns: Sequence[str], dedupe: bool = False,
+              optional: Sequence[str] = ()) -> Iterator[Tuple[int, tuple]]:
+    """Yield (position, values) for the data rows of the first sheet.
+
+    values holds the cells of `columns`, in that order. position is the row
+    number pd.read_excel would give (0 for the first data row, duplicates
+    included). Raises KeyError for a column missing from the header, unless
+    it is listed in `optional` (its values are then None).
+    """
+    workbook = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, ())
+        index = {}
+        for i, name in enumerate(header):
+            index.setdefault(name, i)
+        missing = [column for column in columns if column not in index and column not in optional]
+        if missing:
+            raise KeyError(missing[0])
+        # An optional column missing from the header points past every cell (None)
+        picks = [index.get(column, len(header)) for column in columns]
+
+        seen = set()
+        blank = _digest(())
+        position = 0
+        pending_blank = 0  # blank rows only count once a data row follows them
+        for row in rows:
+            key = _trim(row)
+            if not key:
+                pending_blank += 1
+                continue
+
+            for _ in range(pending_blank):
+                if not (dedupe and blank in seen):
+                    yield position, (None,) * len(picks)
+                if dedupe:
+                    seen.add(blank)
+                position += 1
+            pending_blank = 0
+
+            if dedupe:
+                digest = _digest(key)
+                if digest in seen:
+                    position += 1
+                    continue
+                seen.add(digest)
+            yield position, tuple(key[i] if i < len(key) else None for i in picks)
+            position += 1
+    finally:
+        workbook.close()
@@ -1,7 +1,9 @@
 import { useEffect, useState } from 'react';
-import { Loader2, CheckCircle, XCircle, Terminal } from 'lucide-react';
+import { Loader2, CheckCircle, XCircle, Terminal, Square } from 'lucide-react';
+import { Button } from '@/components/ui/button';
 import { Card } from '@/components/ui/card';
 import { ScrollArea } from '@/components/ui/scroll-area';
+import type { PythonSolutionEvent } from '@/types/electron';
 
 interface ProcessingStatusProps {
   isProcessing: boolean;
@@ -14,6 +16,7 @@ interface ProcessingStatusProps {
 
 export function ProcessingStatus({ isProcessing, result }: ProcessingStatusProps) {
   const [logs, setLogs] = useState<string[]>([]);
+  const [bestSolution, setBestSolution] = useState<PythonSolutionEvent | null>(null);
 
   useEffect(() => {
     if (typeof window !== 'undefined' && (window as any).electronAPI) {
@@ -25,6 +28,13 @@ export function ProcessingStatus({ isProcessing, result }: ProcessingStatusProps
       (window as any).electronAPI.onPythonError((error: string) => {
         setLogs(prev => [...prev, `❌ ERROR: ${error}`]);
       });
+
+      // Meilleure solution trouvée jusqu'ici (streaming du solveur)
+      (window as any).electronAPI.onPythonSolution?.((event: PythonSolutionEvent) => {
+        if (event.type === 'solution') {
+          setBestSolution(event);
+        }
+      });
     }
   }, []);
 
@@ -34,6 +44,7 @@ export function ProcessingStatus({ isProcessing, result }: ProcessingStatusProps
       const timer = setTimeout(() => {
         if (result?.success) {
           setLogs([]);
+          setBestSolution(null);
         }
       }, 5000);
       return () => clearTimeout(timer);
@@ -84,6 +95,25 @@ export function ProcessingStatus({ isProcessing, result }: ProcessingStatusProps
           )}
         </div>
 
+        {/* Meilleure solution en cours */}
+        {isProcessing && bestSolution && (
+          <div className="flex items-center justify-between gap-3">
+            <p className="text-sm text-muted-foreground">
+              Meilleure solution : pénalité {bestSolution.objective} (borne {bestSolution.bound}),{' '}
+              {(bestSolution.index ?? 0) + 1} solution(s) en {bestSolution.elapsed.toFixed(1)}s
+              {bestSolution.stage ? ` — étape ${bestSolution.stage}` : ''}
+            </p>
+            <Button
+              variant="outline"
+              size="sm"
+              onClick={() => (window as any).electronAPI.stopPythonAlgorithm()}
+            >
+              <Square className="mr-2 h-4 w-4" />
+              Arrêter et garder cette solution
+            </Button>
+          </div>
+        )}
+
         {/* Logs Python */}
         {logs.length > 0 && (
           <div className="space-y-2">
@@ -1,12 +1,27 @@
+export interface PythonSolutionEvent {
+  type: 'solution' | 'done'
+  index?: number
+  objective?: number
+  bound?: number
+  elapsed: number
+  added?: [string, number, number][]
+  removed?: [string, number, number][]
+  stage?: string
+  status?: string
+  solutions?: number
+}
+
 export interface ElectronAPI {
   selectFile: (fileType: string) => Promise<string | null>
   saveUploadedFile: (data: { fileName: string; filePath: string }) => Promise<{ success: boolean; path?: string; error?: string }>
   runPythonAlgorithm: (files: any) => Promise<any>
+  stopPythonAlgorithm: () => Promise<{ success: boolean; error?: string }>
   readExcelResults: (filePath: string) => Promise<{ success: boolean; data?: any; error?: string }>
   saveResultsFile: () => Promise<{ success: boolean; path?: string; error?: string }>
-  analyzeSurveillanceData: (data: { professorsFile: string; planningFile: string; ecart_1_2?: number; ecart_2_3?: number; ecart_3_4?: number }) => Promise<any>
+  analyzeSurveillanceData: (data: { professorsFile: string; planningFile: string; ecart_1_2?: number; ecart_2_3?: number; ecart_3_4?: number; grille?: string | [number | null, number | null, number | null][] }) => Promise<any>
   onPythonLog: (callback: (data: string) => void) => void
   onPythonError: (callback: (data: string) => void) => void
+  onPythonSolution: (callback: (event: PythonSolutionEvent) => void) => void
   generateGlobalDocuments: () => Promise<any>
   generateTeacherDocument: (teacherId: string) => Promise<any>
   openFile: (filePath: string) => Promise<any>